@@ -5,10 +5,8 @@ Migración completa del proyecto Django original
 
 import streamlit as st
 import sympy as sp
-from sympy import latex, parse_expr, simplify, factor, solve, factorint, gcd, lcm
-import random
+from sympy import latex, factor, solve, factorint, gcd, lcm
 import json
-from fractions import Fraction
 import time
 from datetime import datetime, timedelta
 
@@ -83,19 +81,16 @@ st.markdown("""
 from utils.arithmetic_content import get_arithmetic_content, get_arithmetic_section
 from utils.algebra_content import get_algebra_content, get_algebra_section
 from utils.exercise_generators import ArithmeticExerciseGenerator, AlgebraExerciseGenerator
-from utils.solver_engine import MathSolver
+from utils.exercise_pool import get_shared_pool
+from utils.exam_blueprint import ExamBlueprint
+from utils.solver_engine import get_shared_solver
+from utils.equivalence import check_exercise_answer
+from utils.exam_grader import iter_grade_exam
+from utils.solution_steps import solution_steps
 
 def main():
     """Función principal de la aplicación"""
     
-    # Inicializar generadores y solver
-    if 'arithmetic_generator' not in st.session_state:
-        st.session_state.arithmetic_generator = ArithmeticExerciseGenerator()
-    if 'algebra_generator' not in st.session_state:
-        st.session_state.algebra_generator = AlgebraExerciseGenerator()
-    if 'solver' not in st.session_state:
-        st.session_state.solver = MathSolver()
-    
     # Sidebar para navegación
     st.sidebar.markdown("# 🧮 MathEngine")
     st.sidebar.markdown("---")
@@ -276,7 +271,7 @@ def show_solver_page():
     # Procesar expresión
     if solve_button and expression:
         try:
-            result = st.session_state.solver.solve_expression(expression)
+            result = get_shared_solver().solve_expression(expression)
             
             if result['success']:
                 st.markdown("## ✅ Solución")
@@ -491,7 +486,7 @@ def show_arithmetic_practice():
     
     with col3:
         if st.button("🎲 Nuevo Ejercicio", type="primary"):
-            exercise = st.session_state.arithmetic_generator.generate_random_exercise(topic, difficulty)
+            exercise = get_shared_pool('arithmetic', ArithmeticExerciseGenerator).get(topic, difficulty)
             st.session_state.current_exercise = exercise
             st.session_state.user_answer = ""
             st.session_state.show_solution = False
@@ -528,7 +523,7 @@ def show_arithmetic_practice():
         
         # Verificar respuesta
         if check_button and user_answer:
-            is_correct = check_answer(user_answer, exercise['answer'])
+            is_correct = check_answer(user_answer, exercise)
             
             # Actualizar estadísticas
             st.session_state.arithmetic_stats['total'] += 1
@@ -562,9 +557,11 @@ def show_arithmetic_practice():
             st.markdown("## 💡 Solución")
             st.markdown(f"**Respuesta correcta:** {exercise['answer']}")
             
-            if 'solution_steps' in exercise and exercise['solution_steps']:
+            # Los pasos se arman recién ahora, cuando se muestra la solución
+            steps = solution_steps(exercise)
+            if steps:
                 st.markdown("**Pasos de solución:**")
-                for i, step in enumerate(exercise['solution_steps'], 1):
+                for i, step in enumerate(steps, 1):
                     st.markdown(f"{i}. {step}")
     
     else:
@@ -605,7 +602,7 @@ def show_algebra_practice():
     
     with col3:
         if st.button("🎲 Nuevo Ejercicio", type="primary"):
-            exercise = st.session_state.algebra_generator.generate_random_exercise(topic, difficulty)
+            exercise = get_shared_pool('algebra', AlgebraExerciseGenerator).get(topic, difficulty)
             st.session_state.current_algebra_exercise = exercise
             st.session_state.algebra_user_answer = ""
             st.session_state.show_algebra_solution = False
@@ -642,7 +639,7 @@ def show_algebra_practice():
         
         # Verificar respuesta
         if check_button and user_answer:
-            is_correct = check_answer(user_answer, exercise['answer'])
+            is_correct = check_answer(user_answer, exercise)
             
             # Actualizar estadísticas
             st.session_state.algebra_stats['total'] += 1
@@ -676,9 +673,11 @@ def show_algebra_practice():
             st.markdown("## 💡 Solución")
             st.markdown(f"**Respuesta correcta:** {exercise['answer']}")
             
-            if 'solution_steps' in exercise and exercise['solution_steps']:
+            # Los pasos se arman recién ahora, cuando se muestra la solución
+            steps = solution_steps(exercise)
+            if steps:
                 st.markdown("**Pasos de solución:**")
-                for i, step in enumerate(exercise['solution_steps'], 1):
+                for i, step in enumerate(steps, 1):
                     st.markdown(f"{i}. {step}")
     
     else:
@@ -739,15 +738,12 @@ def show_exam_setup():
     """)
     
     if st.button("🚀 Comenzar Examen", type="primary", disabled=not topics):
-        # Generar preguntas del examen
-        questions = generate_exam_questions(topics, num_questions, difficulty)
+        # Solo se guarda el identificador; las preguntas se regeneran al mostrarlas
+        blueprint = ExamBlueprint.new(topics, difficulty, num_questions)
         
         st.session_state.exam_config = {
-            'topics': topics,
-            'num_questions': num_questions,
+            'exam_id': blueprint.exam_id,
             'time_limit': time_limit,
-            'difficulty': difficulty,
-            'questions': questions,
             'current_question': 0,
             'answers': {},
             'start_time': datetime.now()
@@ -761,7 +757,7 @@ def show_exam_active():
     
     config = st.session_state.exam_config
     current_q = config['current_question']
-    questions = config['questions']
+    blueprint = ExamBlueprint.from_id(config['exam_id'])
     
     # Calcular tiempo restante
     elapsed = datetime.now() - config['start_time']
@@ -776,18 +772,18 @@ def show_exam_active():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Pregunta", f"{current_q + 1}/{len(questions)}")
+        st.metric("Pregunta", f"{current_q + 1}/{blueprint.count}")
     with col2:
         st.metric("Tiempo Restante", f"{int(remaining.total_seconds() // 60)}:{int(remaining.total_seconds() % 60):02d}")
     with col3:
-        progress = (current_q + 1) / len(questions)
+        progress = (current_q + 1) / blueprint.count
         st.metric("Progreso", f"{progress:.0%}")
     
     st.progress(progress)
     
     # Pregunta actual
-    if current_q < len(questions):
-        question = questions[current_q]
+    if current_q < blueprint.count:
+        question = blueprint.question(current_q)
         
         st.markdown(f"## Pregunta {current_q + 1}")
         st.markdown(question['problem'])
@@ -813,7 +809,7 @@ def show_exam_active():
                 st.success("Respuesta guardada")
         
         with col3:
-            if current_q < len(questions) - 1:
+            if current_q < blueprint.count - 1:
                 if st.button("Siguiente ➡️"):
                     if user_answer:
                         config['answers'][current_q] = user_answer
@@ -835,9 +831,19 @@ def show_exam_results():
     """Resultados del examen"""
     
     config = st.session_state.exam_config
-    questions = config['questions']
+    questions = ExamBlueprint.from_id(config['exam_id']).questions()
     answers = config['answers']
     
+    # Corregir una sola vez: los reruns de esta página reutilizan los veredictos
+    if 'grades' not in config:
+        grading = st.progress(0.0, text="Corrigiendo examen...")
+        grades = [None] * len(questions)
+        for finished, (i, verdict) in enumerate(iter_grade_exam(questions, answers), start=1):
+            grades[i] = verdict
+            grading.progress(finished / len(questions), text=f"Corrigiendo examen... {finished}/{len(questions)}")
+        grading.empty()
+        config['grades'] = grades
+    
     # Calcular resultados
     correct = 0
     total = len(questions)
@@ -845,7 +851,7 @@ def show_exam_results():
     results = []
     for i, question in enumerate(questions):
         user_answer = answers.get(i, "")
-        is_correct = check_answer(user_answer, question['answer'])
+        is_correct = config['grades'][i]['equivalent']
         if is_correct:
             correct += 1
         
@@ -890,9 +896,10 @@ def show_exam_results():
             st.markdown(f"**Tu respuesta:** {result['user_answer'] or 'Sin respuesta'}")
             st.markdown(f"**Respuesta correcta:** {result['correct_answer']}")
             
-            if 'solution_steps' in result['question']:
+            steps = solution_steps(result['question'])
+            if steps:
                 st.markdown("**Explicación:**")
-                for step in result['question']['solution_steps']:
+                for step in steps:
                     st.markdown(f"- {step}")
     
     # Botones de acción
@@ -910,65 +917,12 @@ def show_exam_results():
             st.session_state.page = "🏠 Inicio"
             st.rerun()
 
-def generate_exam_questions(topics, num_questions, difficulty):
-    """Genera preguntas para el examen"""
-    questions = []
-    
-    questions_per_topic = num_questions // len(topics)
-    remaining = num_questions % len(topics)
-    
-    for i, topic in enumerate(topics):
-        topic_questions = questions_per_topic
-        if i < remaining:
-            topic_questions += 1
-        
-        if topic == 'arithmetic':
-            generator = st.session_state.arithmetic_generator
-            subtopics = ['fraction_operations', 'combined_operations', 'mcm_mcd', 'factorization']
-        else:  # algebra
-            generator = st.session_state.algebra_generator
-            subtopics = ['monomios', 'polinomios', 'productos_notables', 'factorizacion']
-        
-        for _ in range(topic_questions):
-            subtopic = random.choice(subtopics)
-            question = generator.generate_random_exercise(subtopic, difficulty)
-            questions.append(question)
-    
-    random.shuffle(questions)
-    return questions
-
-def check_answer(user_answer, correct_answer):
+def check_answer(user_answer, exercise):
     """Verifica si la respuesta del usuario es correcta"""
     try:
-        # Normalizar respuestas
-        user_clean = str(user_answer).strip().replace(' ', '')
-        correct_clean = str(correct_answer).strip().replace(' ', '')
-        
-        # Comparación directa
-        if user_clean.lower() == correct_clean.lower():
-            return True
-        
-        # Intentar evaluación matemática
-        try:
-            user_expr = parse_expr(user_answer)
-            correct_expr = parse_expr(correct_answer)
-            
-            # Verificar si son equivalentes
-            diff = simplify(user_expr - correct_expr)
-            return diff == 0
-        except:
-            pass
-        
-        # Comparación de fracciones
-        try:
-            user_frac = Fraction(user_answer)
-            correct_frac = Fraction(correct_answer)
-            return user_frac == correct_frac
-        except:
-            pass
-        
-        return False
-        
+        # La respuesta correcta sale de answer_form o de la caché de respuestas
+        # ya parseadas: solo se parsea la entrada del usuario
+        return check_exercise_answer(user_answer, exercise)['equivalent']
     except:
         return False
 
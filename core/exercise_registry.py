@@ -0,0 +1,79 @@
+"""
+Registro de ejercicios servidos en la práctica
+Cada ejercicio se identifica con un id corto (prefijo de su clave de contenido)
+y se guarda en el servidor: el cliente solo recibe el enunciado y devuelve el
+id al responder o al pedir la solución. Cada ejercicio se escribe en la base
+de datos al registrarlo; la LRU en memoria solo evita releer los recientes.
+"""
+
+import re
+
+from django.db import DatabaseError
+
+from utils.cache import LRUCache
+
+from .exercise_store import exercise_key, find_exercise, store_exercises
+
+# Ejercicios recientes que se mantienen en memoria
+REGISTRY_SIZE = 2048
+# Caracteres hexadecimales de la clave de contenido que forman el id (48 bits)
+SHORT_ID_LENGTH = 12
+# Campos del ejercicio que se envían al cliente junto con el id
+PUBLIC_FIELDS = ('type', 'problem')
+
+_SHORT_ID_RE = re.compile(rf'[0-9a-f]{{{SHORT_ID_LENGTH}}}')
+
+
+class ExerciseRegistry:
+    """Ejercicios por id corto guardados en StoredExercise, con una LRU de lectura"""
+
+    def __init__(self, maxsize=REGISTRY_SIZE):
+        self._cache = LRUCache(maxsize=maxsize)
+        self.stored = 0
+        self.loaded = 0
+
+    def register(self, topic, difficulty, exercise):
+        """Guarda el ejercicio (si no estaba ya) y devuelve su id corto"""
+        exercise_id = exercise_key(exercise)[:SHORT_ID_LENGTH]
+        if self._cache.get(exercise_id) is None:
+            # Escritura inmediata: el id sigue siendo válido en otro proceso o tras reiniciar
+            try:
+                store_exercises(topic, difficulty, [exercise])
+                self.stored += 1
+            except DatabaseError:
+                # Sin base de datos el ejercicio solo se puede corregir mientras siga en memoria
+                pass
+            self._cache.set(exercise_id, exercise)
+        return exercise_id
+
+    def get(self, exercise_id):
+        """Ejercicio completo registrado con ese id, o None"""
+        if not _SHORT_ID_RE.fullmatch(str(exercise_id)):
+            return None
+
+        exercise = self._cache.get(exercise_id)
+        if exercise is not None:
+            return exercise
+
+        try:
+            exercise = find_exercise(exercise_id)
+        except DatabaseError:
+            return None
+        if exercise is not None:
+            self.loaded += 1
+            self._cache.set(exercise_id, exercise)
+        return exercise
+
+    def stats(self):
+        """Contadores de la LRU y de los ejercicios guardados o leídos de la base"""
+        return dict(self._cache.stats(), stored=self.stored, loaded=self.loaded)
+
+
+def public_exercise(exercise_id, exercise):
+    """Lo que ve el cliente: el id y el enunciado, sin respuesta ni solución"""
+    data = {field: exercise[field] for field in PUBLIC_FIELDS}
+    data['exercise_id'] = exercise_id
+    return data
+
+
+exercise_registry = ExerciseRegistry()
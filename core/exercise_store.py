@@ -0,0 +1,118 @@
+"""
+Almacén de ejercicios direccionado por contenido
+Cada ejercicio se guarda una vez bajo el hash de (tipo, parámetros) y los exámenes
+sacan ejercicios distintos de la base de datos en lugar de regenerarlos
+"""
+
+import hashlib
+import json
+import random
+from collections import Counter
+
+from utils.exam_blueprint import EXAM_TOPICS
+
+from .models import StoredExercise
+
+# Ejercicios que se quieren disponibles por (tema, subtema, dificultad),
+# como múltiplo de los que pide el examen
+STOCK_FACTOR = 4
+# Ejercicios generados en cada reposición
+FILL_BATCH_SIZE = 50
+# Reposiciones antes de aceptar que el subtema tiene pocos ejercicios posibles
+MAX_FILL_ROUNDS = 3
+
+
+def exercise_key(exercise):
+    """
+    Hash canónico del ejercicio. El enunciado es la forma canónica de sus
+    parámetros (los generadores lo arman a partir de ellos), así que
+    (tipo, enunciado sin espacios repetidos) identifica al ejercicio.
+    """
+    canonical = json.dumps([exercise['type'], ' '.join(exercise['problem'].split())], ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def store_exercises(topic, difficulty, exercises):
+    """Guarda los ejercicios; los que ya están en el almacén se ignoran"""
+    rows = {}
+    for exercise in exercises:
+        key = exercise_key(exercise)
+        if key not in rows:
+            rows[key] = StoredExercise(
+                key=key,
+                topic=topic,
+                exercise_type=exercise['type'],
+                difficulty=difficulty,
+                payload=exercise
+            )
+    StoredExercise.objects.bulk_create(rows.values(), ignore_conflicts=True)
+
+
+def ensure_stock(topic, exercise_type, difficulty, needed):
+    """
+    Repone el almacén hasta tener STOCK_FACTOR veces `needed` ejercicios
+    distintos del subtema, o hasta que generar más ya no agregue nuevos.
+    Devuelve cuántos hay disponibles.
+    """
+    queryset = StoredExercise.objects.filter(topic=topic, difficulty=difficulty, exercise_type=exercise_type)
+    available = queryset.count()
+    generator = EXAM_TOPICS[topic][0]()
+    for _ in range(MAX_FILL_ROUNDS):
+        if available >= needed * STOCK_FACTOR:
+            break
+        store_exercises(topic, difficulty, generator.generate_batch(exercise_type, difficulty, FILL_BATCH_SIZE))
+        stocked = queryset.count()
+        if stocked == available:
+            # Ninguno nuevo: el espacio de ejercicios del subtema está cubierto
+            break
+        available = stocked
+    return available
+
+
+def draw_exam(blueprint):
+    """
+    Elige del almacén ejercicios distintos para cada posición del plan del
+    examen y devuelve sus ids en orden. El sorteo usa la semilla del examen.
+    Si un subtema no alcanza, se completa con otros subtemas del mismo tema;
+    si tampoco alcanza se lanza ValueError.
+    """
+    rng = random.Random(blueprint.seed)
+    plan = blueprint.plan()
+    used = set()
+    chosen = {}
+
+    for (topic, exercise_type), count in Counter(plan).items():
+        ensure_stock(topic, exercise_type, blueprint.difficulty, count)
+        same_topic = StoredExercise.objects.filter(topic=topic, difficulty=blueprint.difficulty).exclude(pk__in=used)
+
+        candidates = list(same_topic.filter(exercise_type=exercise_type).order_by('pk').values_list('pk', flat=True))
+        picked = rng.sample(candidates, min(count, len(candidates)))
+        if len(picked) < count:
+            others = list(same_topic.exclude(pk__in=picked).order_by('pk').values_list('pk', flat=True))
+            picked += rng.sample(others, min(count - len(picked), len(others)))
+        if len(picked) < count:
+            raise ValueError(f"No hay suficientes ejercicios distintos de {topic} ({blueprint.difficulty})")
+
+        used.update(picked)
+        chosen[(topic, exercise_type)] = picked
+
+    return [chosen[item].pop() for item in plan]
+
+
+def get_stored_exercise(exercise_id):
+    """Ejercicio guardado con ese id, o None"""
+    return StoredExercise.objects.filter(pk=exercise_id).values_list('payload', flat=True).first()
+
+
+def find_exercise(key_prefix):
+    """
+    Ejercicio guardado cuya clave empieza con `key_prefix`, o None. Las claves
+    son hexadecimales, así que el rango [prefijo, prefijo + 'g') usa el índice
+    único de `key` en lugar de un LIKE.
+    """
+    return (
+        StoredExercise.objects
+        .filter(key__gte=key_prefix, key__lt=key_prefix + 'g')
+        .values_list('payload', flat=True)
+        .first()
+    )
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class StoredExercise(models.Model):
+    """
+    Ejercicio generado y guardado una sola vez. `key` es el hash canónico de
+    (tipo, parámetros), así que el mismo ejercicio generado dos veces ocupa
+    una sola fila y un examen puede pedir ejercicios distintos con consultas
+    por tema y dificultad.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    topic = models.CharField(max_length=32)
+    exercise_type = models.CharField(max_length=32)
+    difficulty = models.CharField(max_length=16)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['topic', 'difficulty', 'exercise_type'], name='exercise_topic_difficulty_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.topic}/{self.exercise_type}/{self.difficulty}: {self.payload.get('problem', '')}"
@@ -0,0 +1,754 @@
+import json
+import time
+from concurrent.futures import Future
+from unittest import mock
+
+import sympy as sp
+from django.test import Client, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from utils.answer_forms import polynomial_form
+from utils.cache import LRUCache
+from utils.equivalence import check_exercise_answer
+from utils.exam_blueprint import ExamBlueprint
+from utils.exam_grader import grade_answer_async, grade_exam
+from utils.exercise_generators import AlgebraExerciseGenerator, ArithmeticExerciseGenerator
+from utils.exercise_pool import ExercisePool
+from utils.expression_parser import ExpressionSyntaxError, normalize_expression, parse_expression
+from utils.int_math import SIEVE_LIMIT, division_steps, prime_factors, smallest_prime_factor
+from utils.solution_steps import get_steps_cache_stats, render_steps, solution_steps, step_recipe
+from utils.solver_budget import SolverBudget, partial_result, run_solution_events
+from utils.solver_engine import MathSolver, clear_cache, get_cache_stats, get_simplify_stats
+from utils.solver_pool import PoolSaturated, SolverPool
+
+from .exercise_registry import ExerciseRegistry
+from .exercise_store import draw_exam, exercise_key, get_stored_exercise, store_exercises
+from .models import StoredExercise
+
+x, y = sp.symbols('x y')
+
+
+class LRUCacheTests(SimpleTestCase):
+    """Desalojo por tamaño y expiración por TTL"""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_entries_expire_after_ttl(self):
+        cache = LRUCache(maxsize=4, ttl=10)
+        with mock.patch('utils.cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1)
+        with mock.patch('utils.cache.time.monotonic', return_value=109.0):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('utils.cache.time.monotonic', return_value=110.0):
+            self.assertIsNone(cache.get('a'))
+
+        stats = cache.stats()
+        self.assertEqual(stats['expirations'], 1)
+        self.assertEqual(stats['size'], 0)
+
+
+class SolverResultCacheTests(SimpleTestCase):
+    """La caché de resultados se indexa por la forma canónica de la entrada"""
+
+    def setUp(self):
+        clear_cache()
+
+    def test_equivalent_spellings_share_an_entry(self):
+        solver = MathSolver()
+        first = solver.solve_expression('2x + 3x')
+        second = solver.solve_expression('2*x+3*x')
+
+        self.assertEqual(first, second)
+        stats = get_cache_stats()
+        self.assertEqual((stats['hits'], stats['size']), (1, 1))
+
+    def test_cached_result_is_a_copy(self):
+        solver = MathSolver()
+        solver.solve_expression('x^2 - 1')['steps'].clear()
+        self.assertTrue(solver.solve_expression('x^2 - 1')['steps'])
+
+    def test_cache_can_be_disabled(self):
+        MathSolver(use_cache=False).solve_expression('x + x')
+        self.assertEqual(get_cache_stats()['size'], 0)
+
+
+class SolverBudgetTests(SimpleTestCase):
+    """Un paso que excede su presupuesto devuelve lo calculado hasta entonces"""
+
+    def setUp(self):
+        clear_cache()
+
+    def test_slow_step_is_cut_short(self):
+        solver = MathSolver(budget=SolverBudget(step_seconds=0.2, memory_mb=0, grace_seconds=0.1))
+        started = time.perf_counter()
+        result = solver.solve_expression('x*(x + y + z + w + 1)^40')
+
+        self.assertLess(time.perf_counter() - started, 10)
+        self.assertTrue(result['budget_exceeded'])
+        self.assertEqual(result['budget_reason'], 'time')
+        self.assertEqual(result['original'], 'x \\left(w + x + y + z + 1\\right)^{40}')
+        # Un resultado parcial no se guarda en la caché
+        self.assertEqual(get_cache_stats()['size'], 0)
+
+    def test_results_within_budget_match_local(self):
+        solver = MathSolver(use_cache=False, budget=SolverBudget(step_seconds=5, memory_mb=256))
+        for expression in ('x^2 + 2x + 1', '2x + 3 = 7', '1/2 + 1/3'):
+            with self.subTest(expression=expression):
+                self.assertEqual(solver.solve_expression(expression), MathSolver(use_cache=False).solve_expression(expression))
+
+    def test_memory_error_reports_memory(self):
+        sent = []
+        conn = mock.Mock(send=sent.append)
+
+        def exhausting(self, cleaned_expr, checkpoint=None):
+            yield 'original', 'x'
+            raise MemoryError
+
+        with mock.patch.object(MathSolver, '_iter_solution', exhausting):
+            run_solution_events(conn, 'x', mock.Mock(is_set=lambda: False), memory_mb=0)
+
+        self.assertEqual(sent, [('original', 'x'), ('budget', 'memory')])
+        result = partial_result('x', [], 'memory')
+        self.assertEqual((result['result'], result['budget_reason']), ('x', 'memory'))
+
+
+class ConstantFastPathTests(SimpleTestCase):
+    """Las expresiones sin variables se evalúan sin la tubería simbólica"""
+
+    def solve(self, expression):
+        return MathSolver(use_cache=False).solve_expression(expression)
+
+    def test_rationals_stay_exact(self):
+        result = self.solve('1/2 + 1/3')
+        self.assertEqual(result['result'], '\\frac{5}{6}')
+        self.assertEqual(result['steps'][0]['expression'], '\\frac{5}{6} \\approx 0.833333333333333')
+        self.assertEqual(self.solve('2^10 - 24')['result'], '1000')
+
+    def test_decimals_recover_the_fraction(self):
+        self.assertEqual(self.solve('0.25 + 0.5')['result'], '\\frac{3}{4}')
+
+    def test_irrationals_are_evaluated(self):
+        result = self.solve('sqrt(2) + 1')
+        self.assertEqual(result['steps'][0]['description'], 'Evaluar numéricamente')
+        self.assertTrue(result['result'].startswith('2.4142135623'))
+
+    def test_skips_the_symbolic_pipeline(self):
+        with mock.patch('utils.solver_engine.factor') as factor, \
+                mock.patch('utils.solver_engine.simplify') as simplify:
+            result = self.solve('(3 + 4) * 2 / 7')
+        self.assertEqual((result['result'], result['simplify_tier']), ('2', 'constant'))
+        factor.assert_not_called()
+        simplify.assert_not_called()
+
+
+class TieredSimplifyTests(SimpleTestCase):
+    """simplify() solo corre cuando ninguna forma canónica barata aplica"""
+
+    tiers = {
+        '1/2 + 1/3': 'constant',
+        'x^2 + 2x + 1': 'polynomial',
+        '(x^2 - 1)/(x - 1)': 'rational',
+        'sin(x)^2 + cos(x)^2': 'simplify'
+    }
+
+    def test_each_expression_closes_at_its_tier(self):
+        for expression, tier in self.tiers.items():
+            with self.subTest(expression=expression):
+                result = MathSolver(use_cache=False).solve_expression(expression)
+                self.assertEqual(result['simplify_tier'], tier)
+
+    def test_cheap_tiers_skip_simplify(self):
+        with mock.patch('utils.solver_engine.simplify', wraps=sp.simplify) as simplify:
+            result = MathSolver(use_cache=False).solve_expression('(x^2 - 1)/(x - 1)')
+            self.assertEqual(result['result'], 'x + 1')
+            simplify.assert_not_called()
+
+            result = MathSolver(use_cache=False).solve_expression('sin(x)^2 + cos(x)^2')
+            self.assertEqual(result['result'], '1')
+            simplify.assert_called()
+
+    def test_counters_track_each_solve(self):
+        before = get_simplify_stats()
+        for expression in self.tiers:
+            MathSolver(use_cache=False).solve_expression(expression)
+        after = get_simplify_stats()
+
+        for tier in after:
+            with self.subTest(tier=tier):
+                expected = list(self.tiers.values()).count(tier)
+                self.assertEqual(after[tier] - before[tier], expected)
+
+
+class SolverPoolTests(SimpleTestCase):
+    """Pool de trabajadores: mismos resultados que en el proceso y reemplazo de trabajadores"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pool = SolverPool(workers=1, max_pending=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+        super().tearDownClass()
+
+    def test_results_match_local_solver(self):
+        local = MathSolver(use_cache=False)
+        for expression in ['x^2 - 5x + 6', '2x + 3 = 7', '(2/3) + (1/4)']:
+            with self.subTest(expression=expression):
+                self.assertEqual(self.pool.solve(local._clean_expression(expression)), local.solve_expression(expression))
+
+    def test_restart_after_dispatch_error(self):
+        def failing_callback(event):
+            raise RuntimeError('callback')
+
+        restarts = self.pool.stats()['restarts']
+        future = self.pool.submit('x**2 + 1', block=True, on_event=failing_callback)
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=60)
+
+        self.assertEqual(self.pool.stats()['restarts'], restarts + 1)
+        self.assertEqual(self.pool.solve('x*x')['result'], 'x^{2}')
+
+
+class PoolFailureTests(SimpleTestCase):
+    """Un fallo del pool se informa pero no queda en la caché de resultados"""
+
+    def setUp(self):
+        clear_cache()
+
+    def test_solve_expression_does_not_cache_pool_failures(self):
+        pool = mock.Mock()
+        pool.solve.side_effect = EOFError('tubería cerrada')
+        solver = MathSolver(pool=pool)
+
+        self.assertFalse(solver.solve_expression('x + 1')['success'])
+        self.assertFalse(solver.solve_expression('x + 1')['success'])
+        self.assertEqual(pool.solve.call_count, 2)
+        self.assertEqual(get_cache_stats()['size'], 0)
+
+    def test_iter_solve_does_not_cache_pool_failures(self):
+        failed = Future()
+        failed.set_exception(EOFError('tubería cerrada'))
+        pool = mock.Mock()
+        pool.submit.return_value = failed
+        solver = MathSolver(pool=pool)
+
+        kind, result = list(solver.iter_solve('x + 1'))[-1]
+        self.assertEqual(kind, 'done')
+        self.assertFalse(result['success'])
+        self.assertEqual(get_cache_stats()['size'], 0)
+
+
+class ExamGraderTests(SimpleTestCase):
+    """Corrección en paralelo de un examen y de respuestas sueltas"""
+
+    questions = [
+        {'type': 'sum', 'problem': 'Calcular: $2 + 3$', 'answer': '5'},
+        {'type': 'poly', 'problem': 'Desarrollar: $(x + 1)^2$', 'answer': 'x^2 + 2x + 1'},
+        {'type': 'poly', 'problem': 'Desarrollar: $(x - 1)^2$', 'answer': 'x^2 - 2x + 1'}
+    ]
+
+    def failing_pool(self, exception):
+        pool = mock.Mock()
+
+        def submit_grading(*args, **kwargs):
+            future = Future()
+            future.set_exception(exception)
+            return future
+
+        pool.submit_grading.side_effect = submit_grading
+        return pool
+
+    def test_pool_verdicts_match_local_grading(self):
+        answers = {0: '5', 1: '(x + 1)^2', 2: 'x^2 + 1'}
+        pool = SolverPool(workers=2, max_pending=8)
+        try:
+            verdicts = grade_exam(self.questions, answers, pool=pool)
+        finally:
+            pool.shutdown()
+
+        expected = [check_exercise_answer(answers[i], question) for i, question in enumerate(self.questions)]
+        self.assertEqual(verdicts, expected)
+
+    def test_worker_failures_grade_as_errors(self):
+        answers = {0: '5', 1: '(x + 1)^2'}
+        verdicts = grade_exam(self.questions, answers, pool=self.failing_pool(RuntimeError('despacho')))
+        self.assertEqual(verdicts, [
+            {'equivalent': True, 'tier': 'identical'},
+            {'equivalent': False, 'tier': 'error'},
+            {'equivalent': False, 'tier': 'blank'}
+        ])
+
+    async def test_single_answer_failure_grades_as_error(self):
+        verdict = await grade_answer_async('(x + 1)^2', self.questions[1], pool=self.failing_pool(ValueError('pickle')))
+        self.assertEqual(verdict, {'equivalent': False, 'tier': 'error'})
+
+    async def test_saturated_pool_is_not_swallowed(self):
+        pool = mock.Mock()
+        pool.submit_grading.side_effect = PoolSaturated('lleno')
+        with self.assertRaises(PoolSaturated):
+            await grade_answer_async('(x + 1)^2', self.questions[1], pool=pool)
+
+
+class ExpressionNormalizerTests(SimpleTestCase):
+    """Forma canónica de una sola pasada, coherente con el parser"""
+
+    def test_canonical_form(self):
+        cases = {
+            '2x + 3': '2*x+3',
+            'x^2 - 5x': 'x**2-5*x',
+            '(x + 1)(x - 1)': '(x+1)*(x-1)',
+            'xsin(x)': 'x*sin(x)',
+            '2πr': '2*pi*r',
+            'x2y': 'x*2*y',
+            '(x + 1)2': '(x+1)*2',
+            '2 3': '2 3'
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(normalize_expression(text), expected)
+
+    def test_number_after_operand_is_a_product(self):
+        self.assertEqual(parse_expression('x2y'), 2 * x * y)
+        self.assertEqual(parse_expression('(x + 1)2'), 2 * (x + 1))
+        self.assertEqual(parse_expression('x 2'), 2 * x)
+        for text in ['2 3', 'x^2 3']:
+            with self.subTest(text=text):
+                with self.assertRaises(ExpressionSyntaxError):
+                    parse_expression(text)
+
+    def test_scientific_notation_is_rejected(self):
+        for text in ['1e-12', '2E5', '3.5e+2']:
+            with self.subTest(text=text):
+                with self.assertRaises(ExpressionSyntaxError):
+                    parse_expression(text)
+        # La constante e sigue disponible junto a un número
+        self.assertEqual(parse_expression('2e'), 2 * sp.E)
+
+    def test_normalized_form_parses_like_the_input(self):
+        for text in ['2x + 3', 'x(x + 1)', 'x 2', '(x + 1)2', '2 3', 'xsin(x)', 'x^2 3', '2e^x']:
+            with self.subTest(text=text):
+                try:
+                    expected = parse_expression(text)
+                except ExpressionSyntaxError:
+                    with self.assertRaises(ExpressionSyntaxError):
+                        parse_expression(normalize_expression(text))
+                else:
+                    self.assertEqual(parse_expression(normalize_expression(text)), expected)
+
+
+class StructuredAnswerTests(SimpleTestCase):
+    """Factorizar y desarrollar exigen la forma pedida además del valor"""
+
+    def assertVerdict(self, verdict, equivalent, tier):
+        self.assertEqual(verdict, {'equivalent': equivalent, 'tier': tier})
+
+    def test_factorization_requires_factored_form(self):
+        exercise = {
+            'type': 'factorizacion',
+            'problem': 'Factorizar: $4 x^{2} + 12 x + 9$',
+            'answer': '\\left(2 x + 3\\right)^{2}',
+            'answer_form': polynomial_form([9, 12, 4], structure='factored')
+        }
+        self.assertTrue(check_exercise_answer('\\left(2 x + 3\\right)^{2}', exercise)['equivalent'])
+        self.assertTrue(check_exercise_answer('(2x + 3)(2x + 3)', exercise)['equivalent'])
+        self.assertTrue(check_exercise_answer('(-2x - 3)^2', exercise)['equivalent'])
+        self.assertTrue(check_exercise_answer('(4x + 6)(x + 3/2)', exercise)['equivalent'])
+
+        # Reescribir el enunciado no es factorizar
+        self.assertVerdict(check_exercise_answer('4 x^{2} + 12 x + 9', exercise), False, 'structure')
+        self.assertVerdict(check_exercise_answer('x(4x + 12) + 9', exercise), False, 'structure')
+        self.assertVerdict(check_exercise_answer('(2x + 3)^2 + 1', exercise), False, 'structure')
+
+    def test_factorization_must_be_complete(self):
+        exercise = {
+            'type': 'difference_squares',
+            'problem': 'Factoriza: $16x^4 - 81$',
+            'answer': '(4*x**2 + 9)*(2*x + 3)*(2*x - 3)',
+            'answer_form': polynomial_form([-81, 0, 0, 0, 16], structure='factored')
+        }
+        self.assertTrue(check_exercise_answer('(2x - 3)(2x + 3)(4x^2 + 9)', exercise)['equivalent'])
+        self.assertVerdict(check_exercise_answer('(4x^2 + 9)(4x^2 - 9)', exercise), False, 'structure')
+
+    def test_notable_product_requires_expanded_form(self):
+        exercise = {
+            'type': 'productos_notables',
+            'problem': 'Desarrollar: $(2x - 2)^2$',
+            'answer': '4 x^{2} - 8 x + 4',
+            'answer_form': polynomial_form([4, -8, 4], structure='expanded')
+        }
+        self.assertTrue(check_exercise_answer('4x^2 - 8x + 4', exercise)['equivalent'])
+        self.assertVerdict(check_exercise_answer('(2x - 2)^2', exercise), False, 'structure')
+        self.assertVerdict(check_exercise_answer('4(x - 1)^2', exercise), False, 'structure')
+        self.assertFalse(check_exercise_answer('4x^2 + 8x + 4', exercise)['equivalent'])
+
+
+class ExerciseStoreTests(TestCase):
+    """Almacén direccionado por contenido y exámenes sorteados de él"""
+
+    def test_duplicates_are_stored_once(self):
+        exercise = {'type': 'fraction_operations', 'problem': 'Calcular:  $\\frac{1}{2} + \\frac{1}{3}$', 'answer': '5/6'}
+        respaced = dict(exercise, problem='Calcular: $\\frac{1}{2} + \\frac{1}{3}$')
+        self.assertEqual(exercise_key(exercise), exercise_key(respaced))
+
+        store_exercises('arithmetic', 'easy', [exercise, respaced])
+        store_exercises('arithmetic', 'easy', [exercise])
+        self.assertEqual(StoredExercise.objects.count(), 1)
+
+    def test_draw_is_distinct_and_reproducible(self):
+        blueprint = ExamBlueprint(0x5eed, ['arithmetic', 'algebra'], 'medium', 12)
+        drawn = draw_exam(blueprint)
+
+        self.assertEqual(len(drawn), 12)
+        self.assertEqual(len(set(drawn)), 12)
+        self.assertEqual(draw_exam(ExamBlueprint.from_id(blueprint.exam_id)), drawn)
+        for (topic, _), exercise_id in zip(blueprint.plan(), drawn):
+            self.assertEqual(StoredExercise.objects.get(pk=exercise_id).topic, topic)
+
+
+class ExamQuestionViewTests(TestCase):
+    """Las preguntas del examen son las sorteadas al empezar, o ninguna"""
+
+    def start_exam(self, client):
+        response = client.post(reverse('core:exam_start'), {
+            'topics': ['arithmetic', 'algebra'], 'num_questions': 6, 'time_limit': 10, 'difficulty': 'easy'
+        })
+        self.assertEqual(response.status_code, 200)
+        config = client.session['exam_config']
+        self.assertContains(response, reverse('core:exam_question', args=[config['exam_id'], 0]))
+        return config
+
+    def question(self, client, exam_id, index):
+        return client.get(reverse('core:exam_question', args=[exam_id, index]))
+
+    def test_serves_the_drawn_exercises(self):
+        config = self.start_exam(self.client)
+        self.assertEqual(len(config['exercise_ids']), 6)
+
+        for index, exercise_id in enumerate(config['exercise_ids']):
+            data = self.question(self.client, config['exam_id'], index).json()
+            self.assertEqual(data['problem'], get_stored_exercise(exercise_id)['problem'])
+            self.assertNotIn('answer', data)
+
+    def test_unknown_exam_is_gone(self):
+        config = self.start_exam(self.client)
+        # Sin la sesión no se sabe qué ejercicios se sortearon
+        self.assertEqual(self.question(Client(), config['exam_id'], 0).status_code, 410)
+
+    def test_invalid_ids_and_indexes(self):
+        config = self.start_exam(self.client)
+        self.assertEqual(self.question(self.client, config['exam_id'], 6).status_code, 404)
+        self.assertEqual(self.question(self.client, 'no-es-un-id', 0).status_code, 404)
+
+    def test_regenerates_when_nothing_was_drawn(self):
+        config = self.start_exam(self.client)
+        session = self.client.session
+        session['exam_config'] = dict(config, exercise_ids=[])
+        session.save()
+
+        blueprint = ExamBlueprint.from_id(config['exam_id'])
+        data = self.question(self.client, config['exam_id'], 2).json()
+        self.assertEqual(data['problem'], blueprint.question(2)['problem'])
+
+
+class ExerciseRegistryTests(TestCase):
+    """Los ejercicios registrados se guardan en la base al registrarlos"""
+
+    exercise = {
+        'type': 'factorizacion',
+        'problem': 'Factorizar: $6 x^{2} + 9 x$',
+        'answer': '3 x \\left(2 x + 3\\right)',
+        'answer_form': polynomial_form([0, 9, 6], structure='factored'),
+        'solution_recipe': {'kind': 'polynomial_factorization', 'args': ['common_factor', [3], '3 x \\left(2 x + 3\\right)']}
+    }
+
+    def test_round_trip_across_registries(self):
+        exercise_id = ExerciseRegistry().register('algebra', 'medium', self.exercise)
+
+        # Otro proceso (o el mismo tras reiniciar) no comparte la LRU
+        fresh = ExerciseRegistry()
+        self.assertEqual(fresh.get(exercise_id), self.exercise)
+        self.assertEqual(fresh.stats()['loaded'], 1)
+
+    def test_entries_survive_eviction(self):
+        registry = ExerciseRegistry(maxsize=1)
+        first = registry.register('algebra', 'medium', self.exercise)
+        registry.register('algebra', 'medium', dict(self.exercise, problem='Factorizar: $4 x^{2} - 9$'))
+        self.assertEqual(registry.get(first), self.exercise)
+
+    def test_registering_twice_writes_once(self):
+        registry = ExerciseRegistry()
+        first = registry.register('algebra', 'medium', self.exercise)
+        second = registry.register('algebra', 'medium', dict(self.exercise))
+        self.assertEqual(first, second)
+        self.assertEqual(registry.stats()['stored'], 1)
+        self.assertEqual(StoredExercise.objects.count(), 1)
+
+    def test_unknown_or_malformed_ids(self):
+        registry = ExerciseRegistry()
+        self.assertIsNone(registry.get('0123456789ab'))
+        self.assertIsNone(registry.get('../../etc'))
+        self.assertIsNone(registry.get(['x']))
+
+
+class BatchSolveTests(SimpleTestCase):
+    """Los lotes conservan el orden y resuelven cada expresión distinta una vez"""
+
+    def setUp(self):
+        clear_cache()
+
+    def test_duplicates_point_to_the_first_occurrence(self):
+        expressions = ['x^2 - 1', '2 + 3', 'x**2-1', '', 'x^2 - 1']
+        with mock.patch.object(MathSolver, 'solve_expression', wraps=MathSolver().solve_expression) as solve:
+            results = list(MathSolver().iter_solve_many(expressions))
+
+        self.assertEqual([item['index'] for item in results], [0, 1, 2, 3, 4])
+        self.assertEqual([item['expression'] for item in results], expressions)
+        self.assertEqual([item['duplicate_of'] for item in results], [None, None, 0, None, 0])
+        self.assertEqual(results[2]['result'], results[0]['result'])
+        self.assertEqual(results[4]['elapsed_ms'], 0.0)
+        self.assertEqual(solve.call_count, 3)
+
+    def test_duplicates_are_independent_copies(self):
+        first, second = MathSolver().iter_solve_many(['x + x', 'x + x'])
+        second['steps'].append('modificado')
+        self.assertNotIn('modificado', first['steps'])
+
+    async def test_streams_one_line_per_expression(self):
+        response = await self.async_client.post(
+            reverse('core:solve_batch'), json.dumps({'expressions': ['1 + 1', '2*3', '1+1']}),
+            content_type='application/json'
+        )
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) async for line in response.streaming_content]
+        self.assertEqual([item['index'] for item in lines], [0, 1, 2])
+        self.assertEqual([item['duplicate_of'] for item in lines], [None, None, 0])
+
+    async def test_invalid_payloads_are_rejected(self):
+        for body in ('no es json', '[1, 2]', '"x"', '{}', '{"expressions": []}', '{"expressions": "x"}'):
+            with self.subTest(body=body):
+                response = await self.async_client.post(
+                    reverse('core:solve_batch'), body, content_type='application/json'
+                )
+                self.assertEqual(response.status_code, 400)
+
+
+class ExamBlueprintTests(SimpleTestCase):
+    """Un examen se reconstruye entero desde su identificador"""
+
+    def test_same_id_same_questions(self):
+        blueprint = ExamBlueprint.new(['arithmetic', 'algebra'], 'hard', 9)
+        rebuilt = ExamBlueprint.from_id(blueprint.exam_id)
+
+        self.assertEqual(rebuilt.exam_id, blueprint.exam_id)
+        self.assertEqual(rebuilt.plan(), blueprint.plan())
+        self.assertEqual(rebuilt.questions(), blueprint.questions())
+
+    def test_question_does_not_depend_on_order(self):
+        blueprint = ExamBlueprint(0x5eed, ['arithmetic', 'algebra'], 'medium', 8)
+        last = ExamBlueprint.from_id(blueprint.exam_id).question(7)
+        self.assertEqual(blueprint.questions()[7], last)
+
+    def test_plan_splits_topics_evenly(self):
+        plan = ExamBlueprint(1, ['arithmetic', 'algebra'], 'easy', 7).plan()
+        topics = [topic for topic, _ in plan]
+        self.assertEqual((topics.count('arithmetic'), topics.count('algebra')), (4, 3))
+
+    def test_invalid_ids(self):
+        for exam_id in ('', 'no-es-un-id', 'zz.algebra.medium.5', '1.geometria.medium.5',
+                        '1.algebra.imposible.5', '1.algebra.medium.0', None):
+            with self.subTest(exam_id=exam_id):
+                with self.assertRaises(ValueError):
+                    ExamBlueprint.from_id(exam_id)
+        with self.assertRaises(IndexError):
+            ExamBlueprint(1, ['algebra']).question(10)
+
+
+class BatchGeneratorTests(SimpleTestCase):
+    """Los lotes vectorizados son reproducibles y sus respuestas se corrigen como correctas"""
+
+    generators = (ArithmeticExerciseGenerator(), AlgebraExerciseGenerator())
+
+    def test_same_seed_same_batch(self):
+        for generator in self.generators:
+            for topic in generator.topics:
+                with self.subTest(topic=topic):
+                    first = generator.generate_batch(topic, 'medium', n=20, seed=7)
+                    self.assertEqual(len(first), 20)
+                    self.assertEqual(generator.generate_batch(topic, 'medium', n=20, seed=7), first)
+
+    def test_batch_answers_grade_as_correct(self):
+        for generator in self.generators:
+            for topic in generator.topics:
+                for difficulty in generator.difficulty_levels:
+                    for exercise in generator.generate_batch(topic, difficulty, n=15, seed=3):
+                        with self.subTest(problem=exercise['problem']):
+                            self.assertTrue(check_exercise_answer(exercise['answer'], exercise)['equivalent'])
+
+
+class ExercisePoolTests(SimpleTestCase):
+    """El pool entrega ejercicios listos y se rellena en segundo plano"""
+
+    def setUp(self):
+        self.generated = []
+
+    def generate(self, topic, difficulty):
+        self.generated.append((topic, difficulty))
+        return {'problem': f'{topic}/{difficulty}/{len(self.generated)}'}
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail('El pool no se rellenó a tiempo')
+            time.sleep(0.01)
+
+    def test_first_request_generates_inline_then_refills(self):
+        pool = ExercisePool(self.generate, ['a', 'b'], capacity=4, low_water=2)
+        self.assertEqual(pool.get('a', 'easy'), {'problem': 'a/easy/1'})
+        self.wait_for(lambda: pool.stats()['available'] == {'a/easy': 4})
+
+        served = pool.get('a', 'easy')
+        self.assertEqual(served['problem'], 'a/easy/2')
+        stats = pool.stats()
+        self.assertEqual((stats['served'], stats['misses']), (1, 1))
+
+    def test_refills_below_low_water(self):
+        pool = ExercisePool(self.generate, ['a'], capacity=4, low_water=2)
+        pool.get('a', 'easy')
+        self.wait_for(lambda: pool.stats()['generated'] == 4)
+
+        # Con 3 y 2 disponibles no hace falta rellenar; con 1 sí
+        pool.get('a', 'easy')
+        pool.get('a', 'easy')
+        pool.get('a', 'easy')
+        self.wait_for(lambda: pool.stats()['available'] == {'a/easy': 4})
+        self.assertEqual(pool.stats()['generated'], 7)
+
+    def test_unknown_combinations_are_not_queued(self):
+        pool = ExercisePool(self.generate, ['a'], capacity=4, low_water=2)
+        self.assertEqual(pool.get('otro', 'easy'), {'problem': 'otro/easy/1'})
+        self.assertEqual(pool.get('a', 'imposible'), {'problem': 'a/imposible/2'})
+        self.assertEqual(pool.stats()['available'], {})
+        self.assertIsNone(pool._thread)
+
+    def test_generator_errors_wait_for_the_next_request(self):
+        failures = iter([False, True])
+
+        def flaky(topic, difficulty):
+            if next(failures, False):
+                raise ValueError('fallo')
+            return self.generate(topic, difficulty)
+
+        pool = ExercisePool(flaky, ['a'], capacity=2, low_water=1)
+        pool.get(None, 'easy')
+        self.wait_for(lambda: pool.stats()['errors'] == 1)
+
+        # Un generador que falla no se reintenta en bucle; el siguiente pedido lo despierta
+        pool.get(None, 'easy')
+        self.wait_for(lambda: pool.stats()['available'] == {'random/easy': 2})
+
+
+class PrimeTableTests(SimpleTestCase):
+    """La tabla de menores factores primos coincide con la factorización de SymPy"""
+
+    def test_factors_match_sympy(self):
+        for number in [*range(2, SIEVE_LIMIT + 1), SIEVE_LIMIT + 1, 997, 1001, 7919, 2 ** 10 * 3 ** 4]:
+            with self.subTest(number=number):
+                self.assertEqual(prime_factors(number), sp.factorint(number))
+                self.assertEqual(smallest_prime_factor(number), min(sp.factorint(number)))
+
+    def test_division_steps(self):
+        self.assertEqual(division_steps(12), [(12, 2, 6), (6, 2, 3)])
+        self.assertEqual(division_steps(97), [])
+        for number in (360, 50, 1001):
+            with self.subTest(number=number):
+                steps = division_steps(number)
+                self.assertEqual(steps[0][0], number)
+                for (_, divisor, quotient), (following, _, _) in zip(steps, steps[1:]):
+                    self.assertEqual(quotient, following)
+                self.assertTrue(all(dividend == divisor * quotient for dividend, divisor, quotient in steps))
+
+
+class SolutionRecipeTests(SimpleTestCase):
+    """Los pasos se arman desde la receta solo cuando se piden"""
+
+    def test_generated_exercises_carry_a_recipe(self):
+        for generator in (ArithmeticExerciseGenerator(), AlgebraExerciseGenerator()):
+            for topic in generator.topics:
+                for difficulty in generator.difficulty_levels:
+                    exercise = generator.generate_random_exercise(topic, difficulty)
+                    with self.subTest(problem=exercise['problem']):
+                        self.assertNotIn('solution_steps', exercise)
+                        # La receta sobrevive a la base de datos y a la sesión
+                        recipe = json.loads(json.dumps(exercise['solution_recipe']))
+                        self.assertEqual(render_steps(recipe), solution_steps(exercise))
+
+    def test_renders_the_steps(self):
+        steps = render_steps(step_recipe('fraction', (1, 2), (1, 3), '+'))
+        self.assertEqual(steps[0], 'Denominador común: MCM(2, 3) = 6')
+        self.assertEqual(len(steps), 3)
+
+    def test_rendered_steps_are_cached_copies(self):
+        recipe = step_recipe('mcm_mcd', [12, 18])
+        render_steps(recipe).append('modificado')
+        hits = get_steps_cache_stats()['hits']
+
+        self.assertNotIn('modificado', render_steps(recipe))
+        self.assertEqual(get_steps_cache_stats()['hits'], hits + 1)
+
+    def test_hand_written_steps_win(self):
+        exercise = {'solution_steps': ['Paso único'], 'solution_recipe': step_recipe('mcm_mcd', [4, 6])}
+        self.assertEqual(solution_steps(exercise), ['Paso único'])
+        self.assertEqual(solution_steps({}), [])
+
+
+class AdmissionControlTests(SimpleTestCase):
+    """Con la cola del pool o del ejecutor llena, las vistas responden 503"""
+
+    saturated = PoolSaturated('El solver está ocupado, intenta de nuevo')
+
+    def saturated_executor(self):
+        return mock.Mock(
+            run=mock.AsyncMock(side_effect=self.saturated),
+            stream=mock.Mock(side_effect=self.saturated)
+        )
+
+    async def test_solve_expression(self):
+        solver = mock.Mock(solve_expression_async=mock.AsyncMock(side_effect=self.saturated))
+        with mock.patch('core.views.get_shared_solver', return_value=solver):
+            response = await self.async_client.post(
+                reverse('core:solve_expression'), json.dumps({'expression': 'x + x'}),
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'error': str(self.saturated)})
+
+    async def test_stream_and_batch(self):
+        with mock.patch('core.views.get_shared_executor', return_value=self.saturated_executor()):
+            stream = await self.async_client.get(reverse('core:solve_expression_stream'), {'expression': 'x'})
+            batch = await self.async_client.post(
+                reverse('core:solve_batch'), json.dumps({'expressions': ['x']}),
+                content_type='application/json'
+            )
+        self.assertEqual(stream.status_code, 503)
+        self.assertEqual(batch.status_code, 503)
+
+    async def test_solves_when_there_is_room(self):
+        response = await self.async_client.post(
+            reverse('core:solve_expression'), json.dumps({'expression': '2x + 3x'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['result'], '5 x')
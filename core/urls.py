@@ -7,6 +7,9 @@ urlpatterns = [
     path('', views.index, name='index'),
     path('solver/', views.solver, name='solver'),
     path('solve/', views.solve_expression, name='solve_expression'),
+    path('solve/stream/', views.solve_expression_stream, name='solve_expression_stream'),
+    path('api/solve-batch/', views.solve_batch, name='solve_batch'),
     path('exam/setup/', views.exam_setup, name='exam_setup'),
     path('exam/start/', views.exam_start, name='exam_start'),
+    path('api/exam/<str:exam_id>/question/<int:index>/', views.exam_question, name='exam_question'),
 ]
@@ -1,10 +1,18 @@
+from django.db import DatabaseError
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 import json
-import sympy as sp
-from sympy.parsing.sympy_parser import parse_expr
-from sympy import latex
+
+from utils.exam_blueprint import ExamBlueprint
+
+from .exercise_store import draw_exam, get_stored_exercise
+from utils.compute_executor import get_shared_executor
+from utils.solver_engine import get_shared_solver
+from utils.solver_pool import PoolSaturated
+
+# Máximo de expresiones aceptadas en una sola petición por lotes
+MAX_BATCH_SIZE = 100
 
 
 def index(request):
@@ -18,9 +26,11 @@ def solver(request):
 
 
 @csrf_exempt
-def solve_expression(request):
+async def solve_expression(request):
     """
-    Procesa expresiones matemáticas y devuelve solución paso a paso
+    Procesa expresiones matemáticas y devuelve solución paso a paso.
+    El cálculo corre en el pool del solver (o en el ejecutor acotado) y la
+    vista solo lo espera; con la cola llena responde 503.
     """
     if request.method == 'POST':
         try:
@@ -30,80 +40,85 @@ def solve_expression(request):
             if not expression:
                 return JsonResponse({'error': 'No se proporcionó expresión'})
             
-            # Parsear la expresión usando SymPy
-            try:
-                expr = parse_expr(expression)
-            except:
-                return JsonResponse({'error': 'Expresión matemática inválida'})
-            
-            # Generar pasos de solución
-            steps = []
-            result = None
-            
-            # Determinar el tipo de operación y generar pasos apropiados
-            if expr.is_polynomial():
-                # Para polinomios, mostrar factorización si es posible
-                factored = sp.factor(expr)
-                if factored != expr:
-                    steps.append({
-                        'description': 'Factorizar la expresión',
-                        'expression': latex(factored),
-                        'explanation': 'Aplicamos factorización para simplificar'
-                    })
-                result = factored
-            elif expr.has(sp.Symbol):
-                # Para ecuaciones con variables, intentar resolver
-                variables = list(expr.free_symbols)
-                if len(variables) == 1:
-                    var = variables[0]
-                    try:
-                        solutions = sp.solve(expr, var)
-                        if solutions:
-                            steps.append({
-                                'description': f'Resolver para {var}',
-                                'expression': f'{var} = {latex(solutions[0])}' if len(solutions) == 1 else f'{var} ∈ {latex(solutions)}',
-                                'explanation': 'Aplicamos métodos algebraicos para encontrar la solución'
-                            })
-                            result = solutions[0] if len(solutions) == 1 else solutions
-                    except:
-                        pass
+            # El mismo motor (caché, presupuestos y pool) que usa Streamlit
+            result = await get_shared_solver().solve_expression_async(expression)
+            if not result['success']:
+                return JsonResponse({'error': result['error']})
             
-            # Simplificar la expresión
-            simplified = sp.simplify(expr)
-            if simplified != expr:
-                steps.append({
-                    'description': 'Simplificar la expresión',
-                    'expression': latex(simplified),
-                    'explanation': 'Aplicamos reglas de simplificación algebraica'
-                })
-                result = simplified
-            
-            # Si no hay pasos específicos, mostrar evaluación numérica si es posible
-            if not steps:
-                try:
-                    evaluated = expr.evalf()
-                    steps.append({
-                        'description': 'Evaluar numéricamente',
-                        'expression': latex(evaluated),
-                        'explanation': 'Calculamos el valor numérico de la expresión'
-                    })
-                    result = evaluated
-                except:
-                    result = expr
-            
-            return JsonResponse({
-                'success': True,
-                'original': latex(expr),
-                'steps': steps,
-                'result': latex(result) if result is not None else latex(expr)
-            })
+            return JsonResponse(result)
             
+        except PoolSaturated as e:
+            return JsonResponse({'error': str(e)}, status=503)
         except Exception as e:
             return JsonResponse({'error': f'Error procesando la expresión: {str(e)}'})
     
     return JsonResponse({'error': 'Método no permitido'})
 
 
+async def solve_expression_stream(request):
+    """
+    Versión en streaming de solve_expression (Server-Sent Events).
+    Recibe la expresión por GET (?expression=...) porque EventSource no
+    permite POST; envía un evento 'original', uno 'step' por paso en cuanto
+    se calcula y un 'done' final con el resultado completo. Los pasos se
+    calculan en el ejecutor acotado y el generador es asíncrono para que
+    ASGI envíe cada evento sin esperar al final; con la cola llena, 503.
+    """
+    expression = request.GET.get('expression', '')
+    
+    try:
+        events = get_shared_executor().stream(get_shared_solver().iter_solve, expression)
+    except PoolSaturated as e:
+        return JsonResponse({'error': str(e)}, status=503)
+    
+    async def stream():
+        async for kind, payload in events:
+            yield f"event: {kind}\ndata: {json.dumps(payload)}\n\n"
+    
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Evita que un proxy (nginx) acumule los eventos antes de enviarlos
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@csrf_exempt
+async def solve_batch(request):
+    """
+    Resuelve varias expresiones en una sola petición.
+    Devuelve una línea JSON por expresión (NDJSON), en el orden recibido,
+    a medida que cada resultado está disponible.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Método no permitido'})
+    
+    try:
+        data = json.loads(request.body)
+    except (ValueError, UnicodeDecodeError):
+        return JsonResponse({'error': 'JSON inválido'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'JSON inválido'}, status=400)
+    
+    expressions = data.get('expressions')
+    if not isinstance(expressions, list) or not expressions:
+        return JsonResponse({'error': 'No se proporcionaron expresiones'}, status=400)
+    if len(expressions) > MAX_BATCH_SIZE:
+        return JsonResponse({'error': f'Se admiten como máximo {MAX_BATCH_SIZE} expresiones por lote'}, status=400)
+    
+    expressions = [str(expression) if expression is not None else '' for expression in expressions]
+    
+    try:
+        results = get_shared_executor().stream(get_shared_solver().iter_solve_many, expressions)
+    except PoolSaturated as e:
+        return JsonResponse({'error': str(e)}, status=503)
+    
+    async def stream():
+        async for item in results:
+            yield json.dumps(item) + '\n'
+    
+    return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+
+
 def exam_setup(request):
     """Vista para configurar exámenes"""
     topics = [
@@ -120,10 +135,24 @@ def exam_start(request):
         selected_topics = request.POST.getlist('topics')
         num_questions = int(request.POST.get('num_questions', 10))
         time_limit = int(request.POST.get('time_limit', 30))
+        difficulty = request.POST.get('difficulty', 'medium')
+        
+        try:
+            blueprint = ExamBlueprint.new(selected_topics, difficulty, num_questions)
+        except ValueError:
+            return exam_setup(request)
         
-        # Guardar configuración en sesión
+        # Ejercicios distintos del almacén; sin base de datos las preguntas
+        # se regeneran desde el identificador
+        try:
+            exercise_ids = draw_exam(blueprint)
+        except (DatabaseError, ValueError):
+            exercise_ids = []
+        
+        # La sesión guarda solo identificadores; las preguntas se piden a exam_question
         request.session['exam_config'] = {
-            'topics': selected_topics,
+            'exam_id': blueprint.exam_id,
+            'exercise_ids': exercise_ids,
             'num_questions': num_questions,
             'time_limit': time_limit,
             'current_question': 0,
@@ -136,3 +165,39 @@ def exam_start(request):
         })
     
     return render(request, 'core/exam_setup.html')
+
+
+def exam_question(request, exam_id, index):
+    """
+    Devuelve la pregunta `index` del examen `exam_id`. Si al empezar se
+    sortearon ejercicios del almacén, la pregunta es la sorteada; si el
+    almacén no estaba disponible, se regenera desde el identificador. Sin el
+    examen en la sesión no se sabe cuál de las dos se sirvió, así que se
+    responde 410 en lugar de mostrar otra pregunta. La respuesta no se envía
+    al navegador.
+    """
+    try:
+        blueprint = ExamBlueprint.from_id(exam_id)
+        if not 0 <= index < blueprint.count:
+            raise IndexError(f"El examen tiene {blueprint.count} preguntas")
+    except (ValueError, IndexError) as e:
+        return JsonResponse({'error': str(e)}, status=404)
+    
+    config = request.session.get('exam_config') or {}
+    if config.get('exam_id') != blueprint.exam_id:
+        return JsonResponse({'error': 'El examen ya no está disponible'}, status=410)
+    
+    exercise_ids = config.get('exercise_ids') or []
+    if exercise_ids:
+        exercise = get_stored_exercise(exercise_ids[index]) if index < len(exercise_ids) else None
+        if exercise is None:
+            return JsonResponse({'error': 'El ejercicio sorteado ya no está disponible'}, status=410)
+    else:
+        exercise = blueprint.question(index)
+    
+    return JsonResponse({
+        'exam_id': blueprint.exam_id,
+        'index': index,
+        'type': exercise['type'],
+        'problem': exercise['problem']
+    })
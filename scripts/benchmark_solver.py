@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+"""
+Mide el rendimiento del solver de MathEngine
+Uso: python scripts/benchmark_solver.py [repeticiones]
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy import expand, factor, simplify
+from sympy.core.cache import clear_cache as clear_sympy_cache
+from sympy.parsing.sympy_parser import parse_expr
+
+from utils.equivalence import check_equivalence
+from utils.expression_parser import normalize_expression, parse_expression
+from utils.solver_engine import MathSolver
+
+# Expresiones sin variables tomadas de los ejemplos del solver y de los ejercicios
+CONSTANT_CORPUS = [
+    '(2/3) + (1/4)',
+    'sqrt(16) + 3^2',
+    '3 + 4 * 5',
+    '(5 + 3) * 2^2 - 4 * 3',
+    '7/12 - 1/6',
+    '(3/4) * (8/9)',
+    '(5/6) / (10/3)',
+    'sqrt(8) + sqrt(2)',
+    '0.25 + 1/3',
+    '2^10 - 1000'
+]
+
+# Entradas típicas del solver y de las respuestas de los estudiantes
+SOLVER_CORPUS = [
+    '2*x + 3 = 7',
+    'x^2 - 5*x + 6',
+    '2*x^2 - 8',
+    '(x+1)^2',
+    '(x^2 - 1)/(x - 1)',
+    '1/x + 1/(x+1)',
+    'sin(x)^2 + cos(x)^2',
+    '3*x + 2*x - 5',
+    '12*x**5',
+    '3*x*(2*x + 3)',
+    'x**3 - x**2 - 7*x + 3',
+    '(4*x**2 + 9)*(4*x**2 - 9)'
+]
+
+# Entradas escritas como las teclean los estudiantes: espacios, multiplicación
+# implícita, símbolos unicode y funciones pegadas a coeficientes
+RAW_INPUT_CORPUS = [
+    '2x + 3 = 7',
+    'x^2 - 5x + 6',
+    '3(x + 1) - 2x',
+    '(x + 1)(x - 1)',
+    '2sin(x) + xcos(x)',
+    'x2y + 3xy',
+    '(x+1)2',
+    '4x^2 ÷ 2x',
+    '3 × (2/3)',
+    '2pi + e^x',
+    'sqrt(16) + 3^2',
+    'log(2x) - ln(x)'
+]
+
+# (respuesta del estudiante, respuesta correcta) que no coinciden como texto
+ANSWER_PAIR_CORPUS = [
+    ('x^2 + 2x + 1', '(x + 1)^2'),
+    ('(x - 3)(x + 3)', 'x^2 - 9'),
+    ('(x + 2)(x + 4)', 'x^2 + 6x + 8'),
+    ('(x + 2)(x + 3)', 'x^2 + 6x + 8'),
+    ('0.75', '3/4'),
+    ('6/8', '3/4'),
+    ('-6x^5', '-6 x^5 + 0'),
+    ('2x(x + 3)', '2x^2 + 6x'),
+    ('1/(x - 1) - 1/(x + 1)', '2/(x^2 - 1)'),
+    ('sin(x)^2 + cos(x)^2', '1'),
+    ('tan(x)', 'sin(x)/cos(x)'),
+    ('exp(2x)', 'exp(x)^2 + 1'),
+    ('log(8)', '3log(2)'),
+    ('sqrt(2) + sqrt(3)', 'sqrt(5 + 2sqrt(6))')
+]
+
+
+def legacy_clean_expression(expr_str):
+    """Cadena de reemplazos que usaba MathSolver._clean_expression antes del tokenizador"""
+    expr_str = expr_str.replace('^', '**')
+    expr_str = expr_str.replace('÷', '/')
+    expr_str = expr_str.replace('×', '*')
+    expr_str = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', expr_str)
+    expr_str = re.sub(r'([a-zA-Z])(\d)', r'\1*\2', expr_str)
+    expr_str = re.sub(r'\)(\d)', r')*\1', expr_str)
+    expr_str = re.sub(r'(\d)\(', r'\1*(', expr_str)
+    return expr_str
+
+
+def time_solver(solver, corpus, repeats):
+    """Tiempo medio por expresión en milisegundos"""
+    elapsed = 0.0
+    for _ in range(repeats):
+        # Sin la caché interna de SymPy cada repetición se comporta como una entrada nueva
+        clear_sympy_cache()
+        start = time.perf_counter()
+        for expression in corpus:
+            solver.solve_expression(expression)
+        elapsed += time.perf_counter() - start
+    return elapsed / (repeats * len(corpus)) * 1000
+
+
+def time_stage(stage, parsed, repeats):
+    """Tiempo medio en milisegundos de una etapa aplicada a expresiones ya parseadas"""
+    elapsed = 0.0
+    for _ in range(repeats):
+        clear_sympy_cache()
+        start = time.perf_counter()
+        for expr in parsed:
+            stage(expr)
+        elapsed += time.perf_counter() - start
+    return elapsed / (repeats * len(parsed)) * 1000
+
+
+def symbolic_stage(expr):
+    """Las operaciones que el pipeline simbólico original aplicaba a toda entrada"""
+    if expr.is_polynomial():
+        factor(expr)
+        expand(expr)
+    simplify(expr)
+    expr.evalf()
+
+
+def benchmark_constant_fast_path(repeats):
+    """Compara la ruta numérica directa con el pipeline simbólico completo"""
+    fast = MathSolver(use_cache=False)
+    symbolic = MathSolver(use_cache=False)
+    symbolic.numeric_fast_path = False
+
+    # Una pasada previa para cargar los módulos perezosos de SymPy
+    time_solver(fast, CONSTANT_CORPUS, 1)
+    time_solver(symbolic, CONSTANT_CORPUS, 1)
+
+    fast_ms = time_solver(fast, CONSTANT_CORPUS, repeats)
+    symbolic_ms = time_solver(symbolic, CONSTANT_CORPUS, repeats)
+
+    print("🔢 Expresiones constantes (de punta a punta, incluye el parseo)")
+    print(f"   Pipeline simbólico: {symbolic_ms:8.3f} ms/expresión")
+    print(f"   Ruta numérica:      {fast_ms:8.3f} ms/expresión")
+    print(f"   Aceleración:        {symbolic_ms / fast_ms:8.1f}x")
+
+    # La etapa posterior al parseo por separado, que es lo que la ruta numérica evita
+    parsed = [parse_expression(expression) for expression in CONSTANT_CORPUS]
+    fast_stage_ms = time_stage(
+        lambda expr: list(fast._iter_constant(expr, '', lambda: None)), parsed, repeats
+    )
+    symbolic_stage_ms = time_stage(symbolic_stage, parsed, repeats)
+
+    print("\n🔢 Expresiones constantes (solo la etapa posterior al parseo)")
+    print(f"   factor/expand/simplify/evalf: {symbolic_stage_ms:8.3f} ms/expresión")
+    print(f"   Ruta numérica:                {fast_stage_ms:8.3f} ms/expresión")
+    print(f"   Aceleración:                  {symbolic_stage_ms / fast_stage_ms:8.1f}x")
+
+
+def benchmark_parser(repeats):
+    """Compara parse_expr de SymPy con el parser restringido"""
+    solver = MathSolver(use_cache=False)
+    corpus = []
+    for expression in SOLVER_CORPUS + CONSTANT_CORPUS:
+        corpus.extend(solver._clean_expression(expression).split('='))
+
+    for label, clear in (('caché de SymPy fría', True), ('caché de SymPy caliente', False)):
+        timings = {}
+        for name, parse in (('parse_expr', parse_expr), ('restringido', parse_expression)):
+            parse(corpus[0])
+            elapsed = 0.0
+            for _ in range(repeats):
+                if clear:
+                    clear_sympy_cache()
+                start = time.perf_counter()
+                for expression in corpus:
+                    parse(expression)
+                elapsed += time.perf_counter() - start
+            timings[name] = elapsed / (repeats * len(corpus)) * 1000
+
+        print(f"\n🔤 Parser ({label})")
+        print(f"   parse_expr:  {timings['parse_expr']:8.3f} ms/expresión")
+        print(f"   restringido: {timings['restringido']:8.3f} ms/expresión")
+        print(f"   Aceleración: {timings['parse_expr'] / timings['restringido']:8.1f}x")
+
+
+def benchmark_normalizer(repeats):
+    """Compara la cadena de expresiones regulares con el normalizador de una pasada"""
+    timings = {}
+    for name, normalize in (('regex', legacy_clean_expression), ('tokenizador', normalize_expression)):
+        elapsed = 0.0
+        for _ in range(repeats * 50):
+            start = time.perf_counter()
+            for expression in RAW_INPUT_CORPUS:
+                normalize(expression)
+            elapsed += time.perf_counter() - start
+        timings[name] = elapsed / (repeats * 50 * len(RAW_INPUT_CORPUS)) * 1000
+
+    print("\n🧹 Normalización de la entrada")
+    print(f"   Cadena de regex: {timings['regex']:8.4f} ms/expresión")
+    print(f"   Tokenizador:     {timings['tokenizador']:8.4f} ms/expresión")
+    print(f"   Relación:        {timings['regex'] / timings['tokenizador']:8.2f}x")
+
+    # Entradas en las que ambas normalizaciones producen un texto distinto
+    print("   Diferencias de resultado:")
+    for expression in RAW_INPUT_CORPUS:
+        legacy = legacy_clean_expression(expression)
+        normalized = normalize_expression(expression)
+        if legacy.replace(' ', '') != normalized:
+            print(f"     {expression!r:20} regex: {legacy!r:24} tokenizador: {normalized!r}")
+
+
+def legacy_equivalence(user_answer, correct_answer):
+    """Comparación anterior: simplify() de la diferencia para toda respuesta no idéntica"""
+    return simplify(parse_expression(user_answer) - parse_expression(correct_answer)) == 0
+
+
+def benchmark_equivalence(repeats):
+    """Compara simplify() de la diferencia con la comparación por niveles"""
+    timings = {}
+    for name, compare in (('simplify', legacy_equivalence),
+                          ('niveles', lambda user, correct: check_equivalence(user, correct)['equivalent'])):
+        elapsed = 0.0
+        for _ in range(repeats):
+            clear_sympy_cache()
+            start = time.perf_counter()
+            for user_answer, correct_answer in ANSWER_PAIR_CORPUS:
+                compare(user_answer, correct_answer)
+            elapsed += time.perf_counter() - start
+        timings[name] = elapsed / (repeats * len(ANSWER_PAIR_CORPUS)) * 1000
+
+    print("\n✅ Equivalencia de respuestas")
+    print(f"   simplify(a - b):  {timings['simplify']:8.3f} ms/comparación")
+    print(f"   Por niveles:      {timings['niveles']:8.3f} ms/comparación")
+    print(f"   Aceleración:      {timings['simplify'] / timings['niveles']:8.1f}x")
+
+    print("   Nivel que decidió cada par:")
+    for user_answer, correct_answer in ANSWER_PAIR_CORPUS:
+        verdict = check_equivalence(user_answer, correct_answer)
+        legacy = legacy_equivalence(user_answer, correct_answer)
+        mark = '' if verdict['equivalent'] == legacy else f"  (simplify: {legacy})"
+        print(f"     {user_answer!r:24} {correct_answer!r:24} {verdict['tier']:10} {verdict['equivalent']}{mark}")
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"⏱️  Benchmark del solver ({repeats} repeticiones)\n")
+    benchmark_constant_fast_path(repeats)
+    benchmark_parser(repeats)
+    benchmark_normalizer(repeats)
+    benchmark_equivalence(repeats)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,117 @@
-from django.test import TestCase
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from core.exercise_registry import ExerciseRegistry
+from utils.equivalence import check_exercise_answer
+from utils.expression_parser import parse_expression
+from utils.solver_pool import PoolSaturated
+
+from .exercise_generator import (
+    FACTORIZATION_EXERCISES, MONOMIAL_EXERCISES, NOTABLE_PRODUCTS_EXERCISES, POLYNOMIAL_EXERCISES,
+    generate_monomial_exercise
+)
+
+TABLES = (MONOMIAL_EXERCISES, POLYNOMIAL_EXERCISES, NOTABLE_PRODUCTS_EXERCISES, FACTORIZATION_EXERCISES)
+
+
+def table_exercises(*tables):
+    for table in tables:
+        for exercises in table.values():
+            yield from exercises
+
+
+class StaticExerciseTests(SimpleTestCase):
+    """Las tablas de ejercicios escritos a mano se corrigen en el servidor"""
+
+    def test_answers_match_expressions(self):
+        for exercise in table_exercises(*TABLES):
+            with self.subTest(problem=exercise['problem']):
+                difference = parse_expression(exercise['expression']) - parse_expression(exercise['answer'])
+                self.assertEqual(difference.simplify(), 0)
+
+    def test_stated_answers_are_correct(self):
+        for exercise in table_exercises(*TABLES):
+            with self.subTest(problem=exercise['problem']):
+                self.assertTrue(check_exercise_answer(exercise['answer'], exercise)['equivalent'])
+
+    def test_equivalent_answer_is_correct(self):
+        exercise = generate_monomial_exercise('hard')
+        self.assertTrue(check_exercise_answer('3x^2 / y', exercise)['equivalent'])
+        self.assertFalse(check_exercise_answer('1/(4x^2y^3)', exercise)['equivalent'])
+
+    def test_restated_problem_is_rejected(self):
+        for exercise in table_exercises(FACTORIZATION_EXERCISES, NOTABLE_PRODUCTS_EXERCISES):
+            with self.subTest(problem=exercise['problem']):
+                verdict = check_exercise_answer(exercise['expression'], exercise)
+                self.assertEqual(verdict, {'equivalent': False, 'tier': 'structure'})
+
+    def test_generators_return_independent_copies(self):
+        exercise = generate_monomial_exercise('hard')
+        exercise['solution_steps'].append('modificado')
+        exercise['answer'] = 'modificado'
+
+        self.assertNotIn('modificado', MONOMIAL_EXERCISES['hard'][0]['solution_steps'])
+        self.assertEqual(MONOMIAL_EXERCISES['hard'][0]['answer'], '3*x**2/y')
+
+
+class PracticeApiTests(TestCase):
+    """Flujo de práctica: ejercicio por id, corrección en el servidor y solución"""
+
+    def get_exercise(self, topic):
+        response = self.client.post(
+            reverse('algebra:get_exercise'), json.dumps({'topic': topic, 'difficulty': 'medium'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        exercise = response.json()['exercise']
+        # El cliente no recibe la respuesta
+        self.assertEqual(set(exercise), {'exercise_id', 'type', 'problem'})
+        return exercise
+
+    def check(self, exercise_id, answer):
+        return self.client.post(
+            reverse('algebra:check_answer'), json.dumps({'exercise_id': exercise_id, 'answer': answer}),
+            content_type='application/json'
+        ).json()
+
+    def test_factorization_round_trip(self):
+        exercise_id = self.get_exercise('factorizacion')['exercise_id']
+
+        self.assertTrue(self.check(exercise_id, '(x + 3)^2')['is_correct'])
+        verdict = self.check(exercise_id, 'x^2 + 6x + 9')
+        self.assertFalse(verdict['is_correct'])
+        self.assertEqual(verdict['tier'], 'structure')
+
+        solution = self.client.get(reverse('algebra:get_solution', args=[exercise_id])).json()
+        self.assertTrue(solution['success'])
+        self.assertTrue(solution['solution_steps'])
+
+    def test_unknown_exercise(self):
+        response = self.client.post(
+            reverse('algebra:check_answer'), json.dumps({'exercise_id': '0123456789ab', 'answer': 'x'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get(reverse('algebra:get_solution', args=['zzz'])).status_code, 404)
+
+    def test_saturated_pool(self):
+        saturated = mock.AsyncMock(side_effect=PoolSaturated('lleno'))
+        executor = mock.Mock(run=saturated)
+        with mock.patch('topics.algebra.views.get_shared_executor', return_value=executor):
+            response = self.client.post(
+                reverse('algebra:get_exercise'), json.dumps({'difficulty': 'easy'}),
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 503)
+
+        exercise_id = ExerciseRegistry().register('algebra', 'easy', {'type': 'suma', 'problem': '1 + 1', 'answer': '2'})
+        with mock.patch('topics.algebra.views.grade_answer_async', saturated):
+            response = self.client.post(
+                reverse('algebra:check_answer'), json.dumps({'exercise_id': exercise_id, 'answer': '2'}),
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'success': False, 'error': 'lleno'})
@@ -8,4 +8,5 @@ urlpatterns = [
     path('practice/', views.practice, name='practice'),
     path('api/get-exercise/', views.get_exercise, name='get_exercise'),
     path('api/check-answer/', views.check_answer, name='check_answer'),
+    path('api/solution/<str:exercise_id>/', views.get_solution, name='get_solution'),
 ]
@@ -1,3 +1,73 @@
-from django.test import TestCase
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from core.exercise_registry import ExerciseRegistry
+from utils.equivalence import check_exercise_answer
+from utils.solver_pool import PoolSaturated
+
+from .exercise_generator import generator
+
+
+class GeneratedAnswerTests(SimpleTestCase):
+    """La respuesta de cada ejercicio generado se corrige como correcta"""
+
+    def test_answers_grade_as_correct(self):
+        for topic in generator.topics:
+            for difficulty in generator.difficulty_levels:
+                for _ in range(10):
+                    exercise = generator.generate_random_exercise(topic, difficulty)
+                    with self.subTest(problem=exercise['problem']):
+                        self.assertTrue(check_exercise_answer(exercise['answer'], exercise)['equivalent'])
+                        self.assertFalse(check_exercise_answer('no es un número', exercise)['equivalent'])
+
+
+class PracticeApiTests(TestCase):
+    """Flujo de práctica: ejercicio por id, corrección en el servidor y solución"""
+
+    def check(self, exercise_id, answer):
+        return self.client.post(
+            reverse('arithmetic:check_answer'), json.dumps({'exercise_id': exercise_id, 'answer': answer}),
+            content_type='application/json'
+        )
+
+    def test_round_trip(self):
+        response = self.client.post(
+            reverse('arithmetic:get_exercise'), json.dumps({'topic': '', 'difficulty': 'easy'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        exercise_id = response.json()['exercise']['exercise_id']
+
+        solution = self.client.get(reverse('arithmetic:get_solution', args=[exercise_id])).json()
+        self.assertTrue(solution['success'])
+
+        # La respuesta vive en el servidor (y en la base, para otros procesos)
+        answer = ExerciseRegistry().get(exercise_id)['answer']
+        self.assertTrue(self.check(exercise_id, answer).json()['is_correct'])
+        self.assertFalse(self.check(exercise_id, 'no es un número').json()['is_correct'])
+
+    def test_unknown_exercise(self):
+        self.assertEqual(self.check(['x'], '1').status_code, 404)
+        self.assertEqual(self.client.get(reverse('arithmetic:get_solution', args=['0123456789ab'])).status_code, 404)
+
+    def test_saturated_pool(self):
+        saturated = mock.AsyncMock(side_effect=PoolSaturated('lleno'))
+        executor = mock.Mock(run=saturated)
+        with mock.patch('topics.arithmetic.views.get_shared_executor', return_value=executor):
+            response = self.client.post(
+                reverse('arithmetic:get_exercise'), json.dumps({'difficulty': 'easy'}),
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 503)
+
+        exercise_id = ExerciseRegistry().register('arithmetic', 'easy', {'type': 'suma', 'problem': '1 + 1', 'answer': '2'})
+        with mock.patch('topics.arithmetic.views.grade_answer_async', saturated):
+            response = self.client.post(
+                reverse('arithmetic:check_answer'), json.dumps({'exercise_id': exercise_id, 'answer': '2'}),
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'success': False, 'error': 'lleno'})
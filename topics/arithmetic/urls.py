@@ -8,5 +8,6 @@ urlpatterns = [
     path('practice/', views.practice, name='practice'),
     path('get-exercise/', views.get_exercise, name='get_exercise'),
     path('check-answer/', views.check_answer, name='check_answer'),
+    path('solution/<str:exercise_id>/', views.get_solution, name='get_solution'),
     path('exam-question/', views.exam_question, name='exam_question'),
 ]
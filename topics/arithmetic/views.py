@@ -1,9 +1,15 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 import json
 from .content import get_theory_content, get_explanation_for_error
-from .exercise_generator import get_random_exercise
+from .exercise_generator import exercise_pool
+from core.exercise_registry import exercise_registry, public_exercise
+from utils.compute_executor import get_shared_executor
+from utils.exam_grader import grade_answer_async
+from utils.solution_steps import solution_steps
+from utils.solver_pool import PoolSaturated
 
 
 def theory(request):
@@ -18,40 +24,49 @@ def practice(request):
 
 
 @csrf_exempt
-def get_exercise(request):
+async def get_exercise(request):
     """
     API endpoint para obtener un nuevo ejercicio
     """
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
-            topic = data.get('topic', None)
+            topic = data.get('topic') or None  # '' = todos los temas
             difficulty = data.get('difficulty', 'medium')
             
-            # Generar ejercicio usando el generador
-            exercise = get_random_exercise(topic, difficulty)
+            # Tomar un ejercicio ya generado del pool (si falta, se genera en el ejecutor)
+            exercise = await get_shared_executor().run(exercise_pool.get, topic, difficulty)
+            # El cliente recibe el enunciado y un id; respuesta y solución quedan en el servidor
+            exercise_id = await sync_to_async(exercise_registry.register)('arithmetic', difficulty, exercise)
             
             return JsonResponse({
                 'success': True,
-                'exercise': exercise
+                'exercise': public_exercise(exercise_id, exercise)
             })
             
+        except PoolSaturated as e:
+            # Control de admisión: el ejecutor no acepta más trabajos por ahora
+            return JsonResponse({'success': False, 'error': str(e)}, status=503)
         except Exception as e:
             return JsonResponse({
                 'success': False,
                 'error': f'Error generando ejercicio: {str(e)}'
             })
     
-    # GET request - generar ejercicio por defecto
-    exercise = get_random_exercise()
+    # GET request - ejercicio por defecto
+    try:
+        exercise = await get_shared_executor().run(exercise_pool.get)
+    except PoolSaturated as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=503)
+    exercise_id = await sync_to_async(exercise_registry.register)('arithmetic', 'medium', exercise)
     return JsonResponse({
         'success': True,
-        'exercise': exercise
+        'exercise': public_exercise(exercise_id, exercise)
     })
 
 
 @csrf_exempt
-def check_answer(request):
+async def check_answer(request):
     """
     API endpoint para verificar respuestas y dar feedback
     """
@@ -59,19 +74,24 @@ def check_answer(request):
         try:
             data = json.loads(request.body)
             user_answer = data.get('answer', '').strip()
-            correct_answer = data.get('correct_answer', '')
-            error_type = data.get('error_type', 'general')
             
-            # Normalizar respuestas para comparación
-            user_answer_normalized = user_answer.replace(' ', '').lower()
-            correct_answer_normalized = correct_answer.replace(' ', '').lower()
+            # La respuesta correcta se toma del ejercicio guardado, no del cliente
+            exercise = await sync_to_async(exercise_registry.get)(data.get('exercise_id', ''))
+            if exercise is None:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Ejercicio no encontrado'
+                }, status=404)
             
-            is_correct = user_answer_normalized == correct_answer_normalized
+            # Se corrige en el pool del solver (o en el ejecutor) sin ocupar el bucle
+            verdict = await grade_answer_async(user_answer, exercise)
+            is_correct = verdict['equivalent']
             
             response_data = {
                 'success': True,
                 'is_correct': is_correct,
-                'correct_answer': correct_answer
+                'correct_answer': exercise['answer'],
+                'tier': verdict['tier']
             }
             
             if is_correct:
@@ -80,10 +100,12 @@ def check_answer(request):
             else:
                 response_data['message'] = 'Respuesta incorrecta. Revisa la explicación.'
                 response_data['feedback_type'] = 'error'
-                response_data['explanation'] = get_explanation_for_error(error_type)
+                response_data['explanation'] = get_explanation_for_error(exercise.get('error_type', 'general'))
             
             return JsonResponse(response_data)
             
+        except PoolSaturated as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=503)
         except Exception as e:
             return JsonResponse({
                 'success': False,
@@ -93,7 +115,25 @@ def check_answer(request):
     return JsonResponse({'success': False, 'error': 'Método no permitido'})
 
 
+def get_solution(request, exercise_id):
+    """
+    API endpoint con los pasos de solución de un ejercicio, pedidos solo
+    cuando el estudiante quiere verlos
+    """
+    exercise = exercise_registry.get(exercise_id)
+    if exercise is None:
+        return JsonResponse({
+            'success': False,
+            'error': 'Ejercicio no encontrado'
+        }, status=404)
+    
+    return JsonResponse({
+        'success': True,
+        'solution_steps': solution_steps(exercise)
+    })
+
+
 def exam_question(request):
     """Vista para generar preguntas de examen"""
-    exercise = get_random_exercise()
+    exercise = exercise_pool.get()
     return render(request, 'arithmetic/exam_question.html', {'exercise': exercise})
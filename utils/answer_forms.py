@@ -0,0 +1,178 @@
+"""
+Forma de respuesta legible por máquina
+Los generadores guardan junto a cada ejercicio su respuesta como datos
+(fracción, coeficientes, MCD/MCM, factores primos) para que el corrector no
+tenga que volver a parsear el texto o el LaTeX de la respuesta
+"""
+
+import re
+
+import sympy as sp
+
+from .cache import LRUCache
+from .expression_parser import ExpressionSyntaxError, parse_expression
+from .polynomial import Polynomial
+
+# Respuestas correctas ya convertidas a SymPy, por texto de la respuesta
+ANSWER_CACHE_SIZE = 4096
+
+_answer_cache = LRUCache(maxsize=ANSWER_CACHE_SIZE)
+
+# Marca en la caché para respuestas que no son expresiones
+_NOT_AN_EXPRESSION = object()
+
+
+def rational_form(fraction):
+    """Fracción (p, q) ya reducida; los enteros llevan q = 1"""
+    numerator, denominator = fraction
+    return {'kind': 'rational', 'value': [numerator, denominator]}
+
+
+def polynomial_form(coefficients, denominator=1, variable='x', structure=None):
+    """
+    Polinomio (c0 + c1 x + ...) / denominator con coeficientes enteros.
+    `structure` exige además una forma a la respuesta: 'factored' (producto
+    de factores irreducibles) o 'expanded' (suma de monomios).
+    """
+    form = {
+        'kind': 'polynomial',
+        'variable': variable,
+        'coefficients': list(coefficients),
+        'denominator': denominator
+    }
+    if structure is not None:
+        form['structure'] = structure
+    return form
+
+
+def mcd_mcm_form(mcd_result, mcm_result):
+    return {'kind': 'mcd_mcm', 'values': [mcd_result, mcm_result]}
+
+
+def prime_factors_form(factors):
+    """Factores primos {p: e} como lista [[p, e], ...] en orden creciente"""
+    return {'kind': 'prime_factors', 'factors': [[p, e] for p, e in factors.items()]}
+
+
+def form_expression(form):
+    """
+    Expresión de SymPy de una forma 'rational' o 'polynomial', construida
+    directamente de los números; None para las demás formas
+    """
+    kind = form['kind']
+    if kind == 'rational':
+        return sp.Rational(*form['value'])
+    if kind == 'polynomial':
+        x = sp.Symbol(form['variable'])
+        terms = [sp.Integer(c) * x ** k for k, c in enumerate(form['coefficients']) if c]
+        return sp.Add(*terms) / form['denominator']
+    return None
+
+
+def answer_expression(exercise):
+    """
+    Respuesta correcta del ejercicio como expresión de SymPy, o None si no es
+    una expresión. Se calcula una vez por texto de respuesta: desde
+    `answer_form` cuando el ejercicio la trae, si no parseando `answer`.
+    """
+    answer = exercise['answer']
+    expr = _answer_cache.get(answer)
+    if expr is None:
+        form = exercise.get('answer_form')
+        expr = form_expression(form) if form else None
+        if expr is None and not form:
+            try:
+                expr = parse_expression(answer)
+            except ExpressionSyntaxError:
+                expr = None
+        _answer_cache.set(answer, _NOT_AN_EXPRESSION if expr is None else expr)
+    return None if expr is _NOT_AN_EXPRESSION else expr
+
+
+def get_answer_cache_stats():
+    """Contadores de la caché de respuestas parseadas"""
+    return _answer_cache.stats()
+
+
+_LABELED_RE = re.compile(r'(mcd|mcm)\s*[=:]?\s*(\d+)', re.IGNORECASE)
+_INTEGER_RE = re.compile(r'\d+')
+
+
+def _match_mcd_mcm(user_answer, form):
+    """'MCD = 4, MCM = 24', 'mcm=24 mcd=4' o simplemente '4, 24'"""
+    labeled = {label.lower(): int(value) for label, value in _LABELED_RE.findall(user_answer)}
+    if len(labeled) == 2:
+        return [labeled['mcd'], labeled['mcm']] == form['values']
+    return [int(value) for value in _INTEGER_RE.findall(user_answer)] == form['values']
+
+
+_PRIME_POWER = r'\d+(?:\s*\^\s*(?:\{\s*\d+\s*\}|\d+))?'
+_PRIME_PRODUCT_RE = re.compile(
+    rf'\s*(?:\d+\s*=\s*)?{_PRIME_POWER}(?:\s*(?:\*|×|·|x|\\times|\\cdot)\s*{_PRIME_POWER})*\s*'
+)
+_PRIME_POWER_RE = re.compile(r'(\d+)(?:\s*\^\s*\{?\s*(\d+))?')
+
+
+def _match_prime_factors(user_answer, form):
+    """'2^3 × 3', '2*2*2*3' o '2^{3} \\times 3' contra los factores primos"""
+    if not _PRIME_PRODUCT_RE.fullmatch(user_answer):
+        return False
+    # Sin el prefijo opcional 'n =' quedan solo las potencias
+    product = user_answer.split('=')[-1]
+    factors = {}
+    for base, exponent in _PRIME_POWER_RE.findall(product):
+        factors[int(base)] = factors.get(int(base), 0) + (int(exponent) if exponent else 1)
+    return factors == {p: e for p, e in form['factors']}
+
+
+STRUCTURED_MATCHERS = {
+    'mcd_mcm': _match_mcd_mcm,
+    'prime_factors': _match_prime_factors
+}
+
+
+def _is_factored(expr, form):
+    """
+    Un producto con tantos factores no constantes (contando multiplicidad)
+    como la factorización completa del polinomio; junto con la equivalencia
+    de valor implica que cada factor es irreducible
+    """
+    expected = Polynomial(form['coefficients']).factor()
+    needed = expected.power + sum(multiplicity for _, multiplicity in expected.factors)
+    if needed <= 1:
+        # Polinomio irreducible: la forma desarrollada ya es la factorizada
+        return True
+    if expr.is_Add:
+        return False
+
+    found = 0
+    for factor in sp.Mul.make_args(expr):
+        base, exponent = factor.as_base_exp()
+        if not base.free_symbols:
+            continue
+        if not (exponent.is_Integer and exponent > 0):
+            return False
+        found += int(exponent)
+    return found == needed
+
+
+def _is_expanded(expr):
+    """Suma de monomios: ninguna potencia ni producto de una suma"""
+    for node in sp.preorder_traversal(expr):
+        if node.is_Pow and node.base.is_Add:
+            return False
+        if node.is_Mul and any(arg.is_Add for arg in node.args):
+            return False
+    return True
+
+
+STRUCTURE_CHECKS = {
+    'factored': _is_factored,
+    'expanded': lambda expr, form: _is_expanded(expr)
+}
+
+
+def meets_structure(user_expr, form):
+    """La respuesta tiene la forma que pide el ejercicio (o no se pide ninguna)"""
+    structure = form.get('structure') if form else None
+    return structure is None or STRUCTURE_CHECKS[structure](user_expr, form)
@@ -0,0 +1,125 @@
+"""
+Ejecutor acotado para el trabajo de CPU de las vistas asíncronas
+Un número fijo de hilos hace los cálculos y la cola de trabajos pendientes
+tiene un límite: cuando se llena, el llamador recibe PoolSaturated y puede
+responder 503 en lugar de acumular conexiones esperando.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .solver_pool import PoolSaturated
+
+# Configuración del ejecutor compartido por las vistas asíncronas
+EXECUTOR_CONFIG = {
+    'workers': None,        # None: núcleos disponibles menos uno
+    'max_pending': 64
+}
+
+_shared_executor = None
+_shared_executor_lock = threading.Lock()
+
+
+class BoundedExecutor:
+    """
+    ThreadPoolExecutor con control de admisión: como mucho `workers`
+    trabajos en curso más `max_pending` en cola
+    """
+
+    def __init__(self, workers=None, max_pending=64):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='compute')
+        self._slots = threading.BoundedSemaphore(self.workers + max_pending)
+        self._stats_lock = threading.Lock()
+        self._stats = {'submitted': 0, 'rejected': 0, 'completed': 0}
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _release(self, future):
+        self._slots.release()
+        self._count('completed')
+
+    def submit(self, fn, *args):
+        """Encola fn(*args) y devuelve un Future; lanza PoolSaturated si no hay lugar"""
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise PoolSaturated('Demasiados cálculos pendientes, intenta de nuevo en unos segundos')
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._count('submitted')
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn, *args):
+        """Versión asíncrona de `submit`: espera el resultado sin bloquear el bucle"""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stream(self, fn, *args):
+        """
+        Recorre el generador fn(*args) en un hilo del ejecutor y devuelve un
+        generador asíncrono con sus elementos a medida que se producen. El
+        trabajo se encola ya, así que PoolSaturated se lanza aquí y no al
+        empezar a iterar. Si quien consume deja de iterar, el hilo se detiene
+        en el siguiente elemento.
+        """
+        loop = asyncio.get_running_loop()
+        items = asyncio.Queue()
+        stopped = threading.Event()
+
+        def produce():
+            try:
+                for item in fn(*args):
+                    if stopped.is_set():
+                        break
+                    loop.call_soon_threadsafe(items.put_nowait, (False, item))
+            finally:
+                loop.call_soon_threadsafe(items.put_nowait, (True, None))
+
+        future = self.submit(produce)
+
+        async def consume():
+            try:
+                while True:
+                    finished, item = await items.get()
+                    if finished:
+                        break
+                    yield item
+                # Propaga la excepción del generador, si la hubo
+                await asyncio.wrap_future(future)
+            finally:
+                stopped.set()
+
+        return consume()
+
+    def stats(self):
+        """Contadores del ejecutor"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['workers'] = self.workers
+        stats['max_pending'] = self.max_pending
+        stats['in_flight'] = stats['submitted'] - stats['completed']
+        return stats
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+def get_shared_executor():
+    """Devuelve el ejecutor compartido por el proceso, creado en el primer uso"""
+    global _shared_executor
+    if _shared_executor is None:
+        with _shared_executor_lock:
+            if _shared_executor is None:
+                _shared_executor = BoundedExecutor(
+                    workers=EXECUTOR_CONFIG['workers'],
+                    max_pending=EXECUTOR_CONFIG['max_pending']
+                )
+    return _shared_executor
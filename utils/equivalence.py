@@ -0,0 +1,173 @@
+"""
+Comparación de respuestas por niveles
+De la comparación más barata a la más cara: texto idéntico, forma canónica de
+polinomios y funciones racionales, evaluación numérica en puntos de prueba y,
+solo si nada de lo anterior decide, simplify(). Cada resultado informa el nivel
+que lo decidió.
+"""
+
+import threading
+
+import numpy as np
+import sympy as sp
+from sympy import expand, fraction, lambdify, simplify, together
+
+from .answer_forms import STRUCTURED_MATCHERS, answer_expression, meets_structure
+from .expression_parser import ExpressionSyntaxError, parse_expression
+
+EQUIVALENCE_TIERS = ('identical', 'syntax', 'structure', 'structured', 'polynomial', 'numeric', 'simplify')
+
+# Puntos de prueba: los mismos en cada llamada para que la corrección sea reproducible
+PROBE_POINTS = 12
+PROBE_SEED = 20240601
+PROBE_RANGE = (-2.5, 2.5)
+# Puntos donde ambos lados deben ser finitos para aceptar el veredicto numérico
+MIN_FINITE_PROBES = 4
+PROBE_RTOL = 1e-8
+PROBE_ATOL = 1e-10
+
+_probe_cache = {}
+_tier_counts = dict.fromkeys(EQUIVALENCE_TIERS, 0)
+_tier_lock = threading.Lock()
+
+
+def get_equivalence_stats():
+    """Devuelve cuántas comparaciones decidió cada nivel"""
+    with _tier_lock:
+        return dict(_tier_counts)
+
+
+def _verdict(equivalent, tier):
+    with _tier_lock:
+        _tier_counts[tier] += 1
+    return {'equivalent': equivalent, 'tier': tier}
+
+
+def _normalize_text(answer):
+    return ''.join(str(answer).split()).lower()
+
+
+def _is_rational_over_q(expr):
+    """Polinomio o cociente de polinomios con coeficientes racionales"""
+    if expr.has(sp.Float, sp.Function, sp.NumberSymbol):
+        return False
+    if any(not power.exp.is_Integer for power in expr.atoms(sp.Pow)):
+        return False
+    return expr.is_rational_function()
+
+
+def _probe_points(count):
+    """
+    Matriz (count, PROBE_POINTS) de puntos de prueba, complejos para que
+    raíces y logaritmos de negativos den valores finitos (rama principal)
+    """
+    points = _probe_cache.get(count)
+    if points is None:
+        rng = np.random.default_rng(PROBE_SEED)
+        points = rng.uniform(*PROBE_RANGE, size=(count, PROBE_POINTS))
+        # Lejos de los enteros se evitan polos y raíces típicas de los ejercicios
+        points = np.where(np.abs(points - np.round(points)) < 0.05, points + 0.1, points).astype(complex)
+        points.setflags(write=False)
+        points = _probe_cache.setdefault(count, points)
+    return points
+
+
+def _numeric_probe(user_expr, correct_expr):
+    """
+    Evalúa ambos lados en los puntos de prueba de una vez con NumPy.
+    Devuelve True/False, o None si no hay suficientes puntos donde los dos
+    lados sean finitos (o la expresión no se puede evaluar numéricamente).
+    """
+    symbols = sorted(user_expr.free_symbols | correct_expr.free_symbols, key=lambda s: s.name)
+    points = _probe_points(len(symbols))
+    try:
+        evaluate = lambdify(symbols, [user_expr, correct_expr], modules='numpy')
+        with np.errstate(all='ignore'):
+            user_values, correct_values = (
+                np.broadcast_to(np.asarray(values, dtype=complex), (PROBE_POINTS,))
+                for values in evaluate(*points)
+            )
+    except (TypeError, ValueError, KeyError, ZeroDivisionError, NameError, AttributeError, NotImplementedError):
+        # Constantes sin equivalente numérico (zoo, nan) o funciones que NumPy no conoce
+        return None
+
+    finite = np.isfinite(user_values) & np.isfinite(correct_values)
+    if not finite.any():
+        return None
+    matches = np.isclose(user_values[finite], correct_values[finite], rtol=PROBE_RTOL, atol=PROBE_ATOL)
+    if not matches.all():
+        # Un punto donde difieren basta para descartar la equivalencia
+        return False
+    if finite.sum() < MIN_FINITE_PROBES:
+        return None
+    return True
+
+
+def expressions_equivalent(user_expr, correct_expr):
+    """Compara dos expresiones de SymPy; devuelve {'equivalent', 'tier'}"""
+    if user_expr == correct_expr:
+        return _verdict(True, 'identical')
+
+    difference = user_expr - correct_expr
+    if _is_rational_over_q(difference):
+        # Forma canónica exacta: la diferencia (o su numerador) se anula al expandir
+        if not difference.is_polynomial():
+            difference = fraction(together(difference))[0]
+        return _verdict(expand(difference) == 0, 'polynomial')
+
+    probe = _numeric_probe(user_expr, correct_expr)
+    if probe is not None:
+        return _verdict(probe, 'numeric')
+
+    return _verdict(simplify(difference) == 0, 'simplify')
+
+
+def check_equivalence(user_answer, correct_answer):
+    """
+    Decide si la respuesta del usuario equivale a la correcta.
+    Devuelve {'equivalent': bool, 'tier': nivel que decidió}; 'syntax'
+    indica que alguna de las dos no es una expresión y solo se comparó el texto.
+    """
+    if _normalize_text(user_answer) == _normalize_text(correct_answer):
+        return _verdict(True, 'identical')
+
+    try:
+        user_expr = parse_expression(str(user_answer))
+        correct_expr = parse_expression(str(correct_answer))
+    except ExpressionSyntaxError:
+        return _verdict(False, 'syntax')
+
+    return expressions_equivalent(user_expr, correct_expr)
+
+
+def check_exercise_answer(user_answer, exercise):
+    """
+    Como check_equivalence, pero contra un ejercicio generado: la respuesta
+    correcta sale de su `answer_form` (o de la caché de respuestas ya
+    parseadas), así que solo se parsea la entrada del usuario. MCD/MCM y
+    factorizaciones en primos se comparan como datos ('structured'). Si el
+    ejercicio pide factorizar o desarrollar, una respuesta con otra forma se
+    rechaza antes de comparar valores ('structure').
+    """
+    correct_answer = exercise['answer']
+    if _normalize_text(user_answer) == _normalize_text(correct_answer):
+        return _verdict(True, 'identical')
+
+    form = exercise.get('answer_form')
+    if form and form['kind'] in STRUCTURED_MATCHERS:
+        return _verdict(STRUCTURED_MATCHERS[form['kind']](str(user_answer), form), 'structured')
+
+    correct_expr = answer_expression(exercise)
+    if correct_expr is None:
+        return check_equivalence(user_answer, correct_answer)
+
+    try:
+        user_expr = parse_expression(str(user_answer))
+    except ExpressionSyntaxError:
+        return _verdict(False, 'syntax')
+
+    # Reescribir el enunciado tiene el mismo valor que la respuesta, pero no la forma pedida
+    if not meets_structure(user_expr, form):
+        return _verdict(False, 'structure')
+
+    return expressions_equivalent(user_expr, correct_expr)
@@ -0,0 +1,94 @@
+"""
+Exámenes reproducibles a partir de (semilla, temas, dificultad, cantidad)
+Las preguntas no se guardan: cualquier proceso las vuelve a generar desde el identificador
+"""
+
+import random
+import secrets
+
+from .exercise_generators import AlgebraExerciseGenerator, ArithmeticExerciseGenerator
+
+# Tema del examen -> (generador, subtemas que se sortean)
+EXAM_TOPICS = {
+    'arithmetic': (
+        ArithmeticExerciseGenerator,
+        ['fraction_operations', 'combined_operations', 'mcm_mcd', 'factorization']
+    ),
+    'algebra': (
+        AlgebraExerciseGenerator,
+        ['monomios', 'polinomios', 'productos_notables', 'factorizacion']
+    )
+}
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+MAX_QUESTIONS = 100
+
+
+class ExamBlueprint:
+    """
+    Descripción mínima de un examen. El plan (qué subtema va en cada
+    posición) sale de `seed`, y cada pregunta se genera con su propio
+    random.Random derivado de (seed, índice), así que una pregunta se puede
+    regenerar sola sin construir las anteriores.
+
+    El identificador tiene la forma '<seed hex>.<temas>.<dificultad>.<cantidad>',
+    p. ej. '1f3a9c.arithmetic+algebra.medium.10'.
+    """
+
+    def __init__(self, seed, topics, difficulty='medium', count=10):
+        topics = tuple(topics)
+        if not topics or any(topic not in EXAM_TOPICS for topic in topics):
+            raise ValueError(f"Temas de examen no válidos: {topics}")
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Dificultad no válida: {difficulty}")
+        if not 1 <= count <= MAX_QUESTIONS:
+            raise ValueError(f"Cantidad de preguntas fuera de rango: {count}")
+        self.seed = seed
+        self.topics = topics
+        self.difficulty = difficulty
+        self.count = count
+        self._plan = None
+
+    @classmethod
+    def new(cls, topics, difficulty='medium', count=10):
+        """Examen nuevo con una semilla aleatoria de 64 bits"""
+        return cls(secrets.randbits(64), topics, difficulty, count)
+
+    @classmethod
+    def from_id(cls, exam_id):
+        """Reconstruye el examen desde su identificador"""
+        try:
+            seed, topics, difficulty, count = exam_id.split('.')
+            return cls(int(seed, 16), topics.split('+'), difficulty, int(count))
+        except (AttributeError, ValueError) as e:
+            raise ValueError(f"Identificador de examen no válido: {exam_id!r}") from e
+
+    @property
+    def exam_id(self):
+        return f"{self.seed:x}.{'+'.join(self.topics)}.{self.difficulty}.{self.count}"
+
+    def plan(self):
+        """Lista de (tema, subtema) por posición, repartida entre los temas como antes"""
+        if self._plan is None:
+            rng = random.Random(self.seed)
+            per_topic, remaining = divmod(self.count, len(self.topics))
+            plan = []
+            for i, topic in enumerate(self.topics):
+                subtopics = EXAM_TOPICS[topic][1]
+                for _ in range(per_topic + (1 if i < remaining else 0)):
+                    plan.append((topic, rng.choice(subtopics)))
+            rng.shuffle(plan)
+            self._plan = plan
+        return self._plan
+
+    def question(self, index):
+        """Genera la pregunta `index`; siempre devuelve el mismo ejercicio"""
+        if not 0 <= index < self.count:
+            raise IndexError(f"El examen tiene {self.count} preguntas")
+        topic, subtopic = self.plan()[index]
+        generator = EXAM_TOPICS[topic][0](random.Random(f"{self.seed}:{index}"))
+        return generator.generate_random_exercise(subtopic, self.difficulty)
+
+    def questions(self):
+        """Todas las preguntas del examen en orden"""
+        return [self.question(index) for index in range(self.count)]
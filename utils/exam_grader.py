@@ -0,0 +1,97 @@
+"""
+Corrección de exámenes completos en el pool de trabajadores
+Cada respuesta se corrige en paralelo con su propio límite de tiempo y los
+veredictos se entregan a medida que terminan
+"""
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from .compute_executor import get_shared_executor
+from .equivalence import check_exercise_answer
+from .solver_budget import SolverBudget
+from .solver_engine import SOLVER_CONFIG, get_shared_solver
+
+# Tiempo máximo para corregir una sola respuesta (simplify puede no terminar)
+GRADE_SECONDS = 3.0
+
+GRADE_BUDGET = SolverBudget(step_seconds=GRADE_SECONDS, memory_mb=SOLVER_CONFIG['memory_mb'])
+
+
+def _local_verdict(user_answer, question):
+    """Veredicto sin salir del proceso para respuestas vacías o idénticas, o None"""
+    if not str(user_answer).strip():
+        return {'equivalent': False, 'tier': 'blank'}
+    if ''.join(str(user_answer).split()).lower() == ''.join(question['answer'].split()).lower():
+        return check_exercise_answer(user_answer, question)
+    return None
+
+
+def _pool_verdict(result):
+    """Traduce el resultado del trabajador a un veredicto"""
+    if result.get('budget_exceeded'):
+        return {'equivalent': False, 'tier': 'timeout'}
+    return result
+
+
+def iter_grade_exam(questions, answers, pool=None):
+    """
+    Corrige las respuestas de un examen y genera (índice, veredicto) en el
+    orden en que terminan. `answers` es un dict índice -> respuesta.
+    Sin pool (SOLVER_CONFIG['use_pool'] en False) se corrige en el proceso.
+    """
+    if pool is None:
+        pool = get_shared_solver().pool
+
+    pending = {}
+    for index, question in enumerate(questions):
+        user_answer = answers.get(index, '')
+        verdict = _local_verdict(user_answer, question)
+        if verdict is not None:
+            yield index, verdict
+        elif pool is None:
+            yield index, check_exercise_answer(user_answer, question)
+        else:
+            pending[pool.submit_grading(user_answer, question, budget=GRADE_BUDGET)] = index
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            try:
+                verdict = _pool_verdict(future.result())
+            except Exception:
+                # El pool entrega en el Future cualquier fallo del trabajador o del despacho
+                verdict = {'equivalent': False, 'tier': 'error'}
+            yield index, verdict
+
+
+def grade_exam(questions, answers, pool=None):
+    """Lista de veredictos en el orden de las preguntas"""
+    verdicts = [None] * len(questions)
+    for index, verdict in iter_grade_exam(questions, answers, pool):
+        verdicts[index] = verdict
+    return verdicts
+
+
+async def grade_answer_async(user_answer, exercise, pool=None):
+    """
+    Corrige una sola respuesta sin bloquear el bucle de eventos: en el pool
+    del solver (con GRADE_BUDGET) o, sin pool, en el ejecutor acotado.
+    Lanza PoolSaturated si no hay lugar en la cola.
+    """
+    verdict = _local_verdict(user_answer, exercise)
+    if verdict is not None:
+        return verdict
+
+    if pool is None:
+        pool = get_shared_solver().pool
+    if pool is None:
+        return await get_shared_executor().run(check_exercise_answer, user_answer, exercise)
+
+    # PoolSaturated sale de submit_grading, fuera del try: la vista responde 503
+    future = pool.submit_grading(user_answer, exercise, budget=GRADE_BUDGET, block=False)
+    try:
+        return _pool_verdict(await asyncio.wrap_future(future))
+    except Exception:
+        return {'equivalent': False, 'tier': 'error'}
@@ -4,30 +4,54 @@ Migrado y adaptado desde el proyecto Django original
 """
 
 import random
-import sympy as sp
-from sympy import gcd, lcm, factorint, latex, symbols, expand, factor
-from fractions import Fraction
+import numpy as np
+
+from .int_math import (
+    factorization_latex, fraction_latex, fraction_operation, fraction_str,
+    gcd_many, lcm_many, prime_factors, reduce_fraction
+)
+from .answer_forms import mcd_mcm_form, polynomial_form, prime_factors_form, rational_form
+from .polynomial import Polynomial, monomial_latex, rational_monomial_latex
+from .solution_steps import step_recipe
+
+
+def _convolve_rows(first, second):
+    """Producto de polinomios fila a fila: (n, k1) x (n, k2) -> (n, k1 + k2 - 1)"""
+    result = np.zeros((first.shape[0], first.shape[1] + second.shape[1] - 1), dtype=first.dtype)
+    for i in range(first.shape[1]):
+        result[:, i:i + second.shape[1]] += first[:, i:i + 1] * second
+    return result
+
+
+def _pad_columns(array, width):
+    """Completa con ceros los coeficientes de grado mayor hasta `width` columnas"""
+    return np.pad(array, ((0, 0), (0, width - array.shape[1])))
+
 
 class ArithmeticExerciseGenerator:
-    """Clase principal para generar ejercicios de aritmética"""
+    """
+    Clase principal para generar ejercicios de aritmética.
+    `rng` es la fuente de azar (un random.Random); con una semilla propia el
+    generador es reproducible. Por defecto se usa el módulo random global.
+    """
     
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
         self.difficulty_levels = ['easy', 'medium', 'hard']
-    
-    def generate_random_exercise(self, topic=None, difficulty='medium'):
-        """
-        Genera un ejercicio aleatorio del tema especificado
-        """
-        topics = [
+        self.topics = [
             'fraction_operations',
             'combined_operations', 
             'mcm_mcd',
             'factorization',
             'word_problems'
         ]
-        
+    
+    def generate_random_exercise(self, topic=None, difficulty='medium'):
+        """
+        Genera un ejercicio aleatorio del tema especificado
+        """
         if topic is None:
-            topic = random.choice(topics)
+            topic = self.rng.choice(self.topics)
         
         generators = {
             'fraction_operations': self.generate_fraction_exercise,
@@ -44,45 +68,42 @@ class ArithmeticExerciseGenerator:
         Genera ejercicios de operaciones con fracciones
         """
         operations = ['+', '-', '*', '/']
-        operation = random.choice(operations)
+        operation = self.rng.choice(operations)
+        
+        (num_low, num_high), (den_low, den_high) = self._fraction_ranges(difficulty)
+        num1, den1 = self.rng.randint(num_low, num_high), self.rng.randint(den_low, den_high)
+        num2, den2 = self.rng.randint(num_low, num_high), self.rng.randint(den_low, den_high)
         
+        # Fracciones exactas como pares de enteros (numerador, denominador)
+        frac1 = reduce_fraction(num1, den1)
+        frac2 = reduce_fraction(num2, den2)
+        result = fraction_operation(frac1, frac2, operation)
+        
+        return self._fraction_exercise(num1, den1, num2, den2, operation, frac1, frac2, result)
+    
+    def _fraction_ranges(self, difficulty):
+        """Rangos (numerador, denominador) de las fracciones según la dificultad"""
         if difficulty == 'easy':
             # Fracciones simples con denominadores pequeños
-            num1, den1 = random.randint(1, 5), random.randint(2, 6)
-            num2, den2 = random.randint(1, 5), random.randint(2, 6)
+            return (1, 5), (2, 6)
         elif difficulty == 'medium':
             # Fracciones con denominadores medianos
-            num1, den1 = random.randint(1, 10), random.randint(2, 12)
-            num2, den2 = random.randint(1, 10), random.randint(2, 12)
-        else:  # hard
-            # Fracciones más complejas
-            num1, den1 = random.randint(1, 20), random.randint(2, 20)
-            num2, den2 = random.randint(1, 20), random.randint(2, 20)
-        
-        # Crear fracciones usando SymPy para cálculos exactos
-        frac1 = sp.Rational(num1, den1)
-        frac2 = sp.Rational(num2, den2)
-        
-        # Calcular resultado según la operación
-        if operation == '+':
-            result = frac1 + frac2
-            problem_text = f"Calcular: $\\frac{{{num1}}}{{{den1}}} + \\frac{{{num2}}}{{{den2}}}$"
-        elif operation == '-':
-            result = frac1 - frac2
-            problem_text = f"Calcular: $\\frac{{{num1}}}{{{den1}}} - \\frac{{{num2}}}{{{den2}}}$"
-        elif operation == '*':
-            result = frac1 * frac2
-            problem_text = f"Calcular: $\\frac{{{num1}}}{{{den1}}} \\times \\frac{{{num2}}}{{{den2}}}$"
-        else:  # division
-            result = frac1 / frac2
-            problem_text = f"Calcular: $\\frac{{{num1}}}{{{den1}}} \\div \\frac{{{num2}}}{{{den2}}}$"
+            return (1, 10), (2, 12)
+        # Fracciones más complejas
+        return (1, 20), (2, 20)
+    
+    def _fraction_exercise(self, num1, den1, num2, den2, operation, frac1, frac2, result):
+        """Arma el ejercicio de fracciones a partir de los valores ya calculados"""
+        operation_latex = {'+': '+', '-': '-', '*': '\\times', '/': '\\div'}[operation]
+        problem_text = f"Calcular: $\\frac{{{num1}}}{{{den1}}} {operation_latex} \\frac{{{num2}}}{{{den2}}}$"
         
         return {
             'type': 'fraction_operations',
             'problem': problem_text,
-            'answer': str(result),
-            'answer_latex': latex(result),
-            'solution_steps': self._generate_fraction_steps(frac1, frac2, operation),
+            'answer': fraction_str(result),
+            'answer_latex': fraction_latex(result),
+            'answer_form': rational_form(result),
+            'solution_recipe': step_recipe('fraction', frac1, frac2, operation),
             'error_type': 'fraction_addition' if operation in ['+', '-'] else 'fraction_multiplication'
         }
     
@@ -92,29 +113,41 @@ class ArithmeticExerciseGenerator:
         """
         if difficulty == 'easy':
             # Operaciones simples con paréntesis
-            a, b, c = random.randint(1, 10), random.randint(1, 10), random.randint(1, 10)
-            expression = f"{a} + {b} * {c}"
-            problem_text = f"Resolver: ${a} + {b} \\times {c}$"
+            a, b, c = self.rng.randint(1, 10), self.rng.randint(1, 10), self.rng.randint(1, 10)
+            values = (a, b, c)
+            result = a + b * c
         elif difficulty == 'medium':
             # Incluir paréntesis y exponentes
-            a, b, c, d = random.randint(1, 8), random.randint(1, 5), random.randint(2, 4), random.randint(1, 6)
-            expression = f"{a} + {b} * ({c}**2 - {d})"
-            problem_text = f"Resolver: ${a} + {b} \\times ({c}^2 - {d})$"
+            a, b, c, d = self.rng.randint(1, 8), self.rng.randint(1, 5), self.rng.randint(2, 4), self.rng.randint(1, 6)
+            values = (a, b, c, d)
+            result = a + b * (c ** 2 - d)
         else:  # hard
             # Operaciones más complejas
-            a, b, c, d, e = random.randint(1, 6), random.randint(1, 4), random.randint(2, 3), random.randint(1, 5), random.randint(1, 4)
-            expression = f"({a} + {b}) * {c}**2 - {d} * {e}"
-            problem_text = f"Resolver: $({a} + {b}) \\times {c}^2 - {d} \\times {e}$"
+            a, b, c, d, e = self.rng.randint(1, 6), self.rng.randint(1, 4), self.rng.randint(2, 3), self.rng.randint(1, 5), self.rng.randint(1, 4)
+            values = (a, b, c, d, e)
+            result = (a + b) * c ** 2 - d * e
         
-        # Evaluar usando SymPy
-        result = sp.sympify(expression)
+        return self._combined_exercise(difficulty, values, result)
+    
+    def _combined_exercise(self, difficulty, values, result):
+        """Arma el ejercicio de operaciones combinadas con los valores sorteados"""
+        if difficulty == 'easy':
+            a, b, c = values
+            problem_text = f"Resolver: ${a} + {b} \\times {c}$"
+        elif difficulty == 'medium':
+            a, b, c, d = values
+            problem_text = f"Resolver: ${a} + {b} \\times ({c}^2 - {d})$"
+        else:
+            a, b, c, d, e = values
+            problem_text = f"Resolver: $({a} + {b}) \\times {c}^2 - {d} \\times {e}$"
         
         return {
             'type': 'combined_operations',
             'problem': problem_text,
             'answer': str(result),
-            'answer_latex': latex(result),
-            'solution_steps': self._generate_operation_steps(expression),
+            'answer_latex': str(result),
+            'answer_form': rational_form((result, 1)),
+            'solution_recipe': step_recipe('order_of_operations'),
             'error_type': 'order_operations'
         }
     
@@ -124,39 +157,31 @@ class ArithmeticExerciseGenerator:
         """
         if difficulty == 'easy':
             # Números pequeños
-            a, b = random.randint(6, 20), random.randint(6, 20)
+            numbers = [self.rng.randint(6, 20), self.rng.randint(6, 20)]
         elif difficulty == 'medium':
             # Números medianos
-            a, b = random.randint(12, 50), random.randint(12, 50)
+            numbers = [self.rng.randint(12, 50), self.rng.randint(12, 50)]
         else:  # hard
             # Números más grandes o tres números
-            if random.choice([True, False]):
-                a, b = random.randint(20, 100), random.randint(20, 100)
+            if self.rng.choice([True, False]):
+                numbers = [self.rng.randint(20, 100), self.rng.randint(20, 100)]
             else:
                 # Tres números para mayor dificultad
-                a, b, c = random.randint(12, 30), random.randint(12, 30), random.randint(12, 30)
-                mcd_result = gcd(gcd(a, b), c)
-                mcm_result = lcm(lcm(a, b), c)
-                
-                return {
-                    'type': 'mcm_mcd',
-                    'problem': f"Calcular MCD({a}, {b}, {c}) y MCM({a}, {b}, {c})",
-                    'answer': f"MCD = {mcd_result}, MCM = {mcm_result}",
-                    'answer_latex': f"MCD = {mcd_result}, MCM = {mcm_result}",
-                    'solution_steps': self._generate_mcm_mcd_steps([a, b, c]),
-                    'error_type': 'factorization'
-                }
-        
-        # Caso de dos números
-        mcd_result = gcd(a, b)
-        mcm_result = lcm(a, b)
+                numbers = [self.rng.randint(12, 30), self.rng.randint(12, 30), self.rng.randint(12, 30)]
+        
+        return self._mcm_mcd_exercise(numbers, gcd_many(numbers), lcm_many(numbers))
+    
+    def _mcm_mcd_exercise(self, numbers, mcd_result, mcm_result):
+        """Arma el ejercicio de MCM y MCD para dos o tres números"""
+        listed = ", ".join(str(number) for number in numbers)
         
         return {
             'type': 'mcm_mcd',
-            'problem': f"Calcular MCD({a}, {b}) y MCM({a}, {b})",
+            'problem': f"Calcular MCD({listed}) y MCM({listed})",
             'answer': f"MCD = {mcd_result}, MCM = {mcm_result}",
             'answer_latex': f"MCD = {mcd_result}, MCM = {mcm_result}",
-            'solution_steps': self._generate_mcm_mcd_steps([a, b]),
+            'answer_form': mcd_mcm_form(mcd_result, mcm_result),
+            'solution_recipe': step_recipe('mcm_mcd', numbers),
             'error_type': 'factorization'
         }
     
@@ -164,25 +189,29 @@ class ArithmeticExerciseGenerator:
         """
         Genera ejercicios de factorización en números primos
         """
+        low, high = self._factorization_range(difficulty)
+        return self._factorization_exercise(self.rng.randint(low, high))
+    
+    def _factorization_range(self, difficulty):
+        """Rango de los números a factorizar según la dificultad"""
         if difficulty == 'easy':
-            number = random.randint(12, 50)
+            return 12, 50
         elif difficulty == 'medium':
-            number = random.randint(50, 200)
-        else:  # hard
-            number = random.randint(200, 500)
-        
-        # Factorizar usando SymPy
-        factors = factorint(number)
-        
-        # Crear representación en LaTeX
-        factor_latex = " \\times ".join([f"{p}^{{{e}}}" if e > 1 else str(p) for p, e in factors.items()])
+            return 50, 200
+        return 200, 500
+    
+    def _factorization_exercise(self, number):
+        """Arma el ejercicio de factorización prima de `number`"""
+        factors = prime_factors(number)
+        factor_latex = factorization_latex(factors)
         
         return {
             'type': 'factorization',
             'problem': f"Factorizar en números primos: {number}",
             'answer': factor_latex,
             'answer_latex': f"{number} = {factor_latex}",
-            'solution_steps': self._generate_factorization_steps(number),
+            'answer_form': prime_factors_form(factors),
+            'solution_recipe': step_recipe('prime_division', number),
             'error_type': 'factorization'
         }
     
@@ -197,7 +226,7 @@ class ArithmeticExerciseGenerator:
             'time_problem'
         ]
         
-        problem_type = random.choice(problem_types)
+        problem_type = self.rng.choice(problem_types)
         
         if problem_type == 'farmer_problem':
             return self._generate_farmer_problem(difficulty)
@@ -210,30 +239,27 @@ class ArithmeticExerciseGenerator:
     
     def _generate_farmer_problem(self, difficulty):
         """Genera problema del granjero con fracciones"""
-        total_animals = random.randint(20, 100)
+        total_animals = self.rng.randint(20, 100)
         
         # Generar fracciones que sumen menos que 1
         denominators = [3, 4, 5, 6, 8]
-        den1, den2 = random.sample(denominators, 2)
+        den1, den2 = self.rng.sample(denominators, 2)
         
         # Asegurar que las fracciones sean válidas
-        num1 = random.randint(1, den1 - 1)
-        remaining = sp.Rational(1) - sp.Rational(num1, den1)
+        num1 = self.rng.randint(1, den1 - 1)
         
-        # Encontrar numerador válido para la segunda fracción
-        max_num2 = int(remaining * den2)
+        # Encontrar numerador válido para la segunda fracción: (1 - num1/den1) * den2
+        max_num2 = (den1 - num1) * den2 // den1
         if max_num2 < 1:
             num2 = 1
-            den2 = random.randint(den2, 10)
+            den2 = self.rng.randint(den2, 10)
         else:
-            num2 = random.randint(1, min(max_num2, den2 - 1))
+            num2 = self.rng.randint(1, min(max_num2, den2 - 1))
         
-        sold_fraction1 = sp.Rational(num1, den1)
-        sold_fraction2 = sp.Rational(num2, den2)
-        total_sold = sold_fraction1 + sold_fraction2
+        total_sold = fraction_operation((num1, den1), (num2, den2), '+')
         
         # Calcular animales vendidos y restantes
-        animals_sold = int(total_animals * total_sold)
+        animals_sold = total_animals * total_sold[0] // total_sold[1]
         animals_remaining = total_animals - animals_sold
         
         problem_text = f"""
@@ -247,31 +273,25 @@ class ArithmeticExerciseGenerator:
             'problem': problem_text,
             'answer': str(animals_remaining),
             'answer_latex': f"{animals_remaining} \\text{{ vacas}}",
-            'solution_steps': [
-                f"Total de vacas: {total_animals}",
-                f"Vendidas el lunes: $\\frac{{{num1}}}{{{den1}}} \\times {total_animals} = {int(total_animals * sold_fraction1)}$",
-                f"Vendidas el martes: $\\frac{{{num2}}}{{{den2}}} \\times {total_animals} = {int(total_animals * sold_fraction2)}$",
-                f"Total vendidas: {animals_sold}",
-                f"Vacas restantes: {total_animals} - {animals_sold} = {animals_remaining}"
-            ],
+            'answer_form': rational_form((animals_remaining, 1)),
+            'solution_recipe': step_recipe('farmer', total_animals, num1, den1, num2, den2),
             'error_type': 'fraction_addition'
         }
     
     def _generate_recipe_problem(self, difficulty):
         """Genera problema de receta con fracciones"""
         ingredients = ['harina', 'azúcar', 'mantequilla', 'huevos']
-        ingredient = random.choice(ingredients)
+        ingredient = self.rng.choice(ingredients)
         
-        original_servings = random.choice([4, 6, 8])
-        new_servings = random.choice([2, 3, 12, 16])
+        original_servings = self.rng.choice([4, 6, 8])
+        new_servings = self.rng.choice([2, 3, 12, 16])
         
         # Cantidad original como fracción
-        num, den = random.randint(1, 4), random.choice([2, 3, 4])
-        original_amount = sp.Rational(num, den)
+        num, den = self.rng.randint(1, 4), self.rng.choice([2, 3, 4])
         
         # Calcular nueva cantidad
-        ratio = sp.Rational(new_servings, original_servings)
-        new_amount = original_amount * ratio
+        ratio = reduce_fraction(new_servings, original_servings)
+        new_amount = fraction_operation((num, den), ratio, '*')
         
         problem_text = f"""
         Una receta para {original_servings} personas requiere $\\frac{{{num}}}{{{den}}}$ tazas de {ingredient}.
@@ -281,23 +301,19 @@ class ArithmeticExerciseGenerator:
         return {
             'type': 'word_problems',
             'problem': problem_text,
-            'answer': str(new_amount),
-            'answer_latex': f"{latex(new_amount)} \\text{{ tazas}}",
-            'solution_steps': [
-                f"Receta original: {original_servings} personas, $\\frac{{{num}}}{{{den}}}$ tazas",
-                f"Nueva receta: {new_servings} personas",
-                f"Proporción: $\\frac{{{new_servings}}}{{{original_servings}}} = {latex(ratio)}$",
-                f"Nueva cantidad: $\\frac{{{num}}}{{{den}}} \\times {latex(ratio)} = {latex(new_amount)}$"
-            ],
+            'answer': fraction_str(new_amount),
+            'answer_latex': f"{fraction_latex(new_amount)} \\text{{ tazas}}",
+            'answer_form': rational_form(new_amount),
+            'solution_recipe': step_recipe('recipe', original_servings, new_servings, num, den),
             'error_type': 'fraction_multiplication'
         }
     
     def _generate_money_problem(self, difficulty):
         """Genera problema de dinero con operaciones combinadas"""
-        initial_money = random.randint(50, 200)
-        spent1 = random.randint(10, initial_money // 3)
-        earned = random.randint(5, 30)
-        spent2 = random.randint(5, 25)
+        initial_money = self.rng.randint(50, 200)
+        spent1 = self.rng.randint(10, initial_money // 3)
+        earned = self.rng.randint(5, 30)
+        spent2 = self.rng.randint(5, 25)
         
         final_money = initial_money - spent1 + earned - spent2
         
@@ -312,26 +328,21 @@ class ArithmeticExerciseGenerator:
             'problem': problem_text,
             'answer': str(final_money),
             'answer_latex': f"\\${final_money}",
-            'solution_steps': [
-                f"Dinero inicial: $\\${initial_money}$",
-                f"Después del almuerzo: $\\${initial_money} - \\${spent1} = \\${initial_money - spent1}$",
-                f"Después del trabajo: $\\${initial_money - spent1} + \\${earned} = \\${initial_money - spent1 + earned}$",
-                f"Después del transporte: $\\${initial_money - spent1 + earned} - \\${spent2} = \\${final_money}$"
-            ],
+            'answer_form': rational_form((final_money, 1)),
+            'solution_recipe': step_recipe('money', initial_money, spent1, earned, spent2),
             'error_type': 'order_operations'
         }
     
     def _generate_time_problem(self, difficulty):
         """Genera problema de tiempo con fracciones"""
-        total_hours = random.choice([8, 12, 24])
+        total_hours = self.rng.choice([8, 12, 24])
         
         # Fracciones de tiempo
         activities = ['estudiando', 'trabajando', 'durmiendo', 'ejercitándose']
-        activity = random.choice(activities)
+        activity = self.rng.choice(activities)
         
-        num, den = random.randint(1, 3), random.choice([4, 6, 8])
-        time_fraction = sp.Rational(num, den)
-        time_spent = time_fraction * total_hours
+        num, den = self.rng.randint(1, 3), self.rng.choice([4, 6, 8])
+        time_spent = reduce_fraction(num * total_hours, den)
         
         problem_text = f"""
         En un día de {total_hours} horas, Pedro pasa $\\frac{{{num}}}{{{den}}}$ del tiempo {activity}.
@@ -341,109 +352,133 @@ class ArithmeticExerciseGenerator:
         return {
             'type': 'word_problems',
             'problem': problem_text,
-            'answer': str(time_spent),
-            'answer_latex': f"{latex(time_spent)} \\text{{ horas}}",
-            'solution_steps': [
-                f"Total de horas: {total_hours}",
-                f"Fracción del tiempo {activity}: $\\frac{{{num}}}{{{den}}}$",
-                f"Horas {activity}: $\\frac{{{num}}}{{{den}}} \\times {total_hours} = {latex(time_spent)}$"
-            ],
+            'answer': fraction_str(time_spent),
+            'answer_latex': f"{fraction_latex(time_spent)} \\text{{ horas}}",
+            'answer_form': rational_form(time_spent),
+            'solution_recipe': step_recipe('time', total_hours, activity, num, den),
             'error_type': 'fraction_multiplication'
         }
     
-    def _generate_fraction_steps(self, frac1, frac2, operation):
-        """Genera pasos detallados para operaciones con fracciones"""
-        steps = []
-        
-        if operation in ['+', '-']:
-            # Para suma y resta, mostrar proceso de denominador común
-            if frac1.q != frac2.q:  # Denominadores diferentes
-                common_den = lcm(frac1.q, frac2.q)
-                new_num1 = frac1.p * (common_den // frac1.q)
-                new_num2 = frac2.p * (common_den // frac2.q)
-                
-                steps.append(f"Denominador común: MCM({frac1.q}, {frac2.q}) = {common_den}")
-                steps.append(f"Convertir fracciones: $\\frac{{{new_num1}}}{{{common_den}}}$ y $\\frac{{{new_num2}}}{{{common_den}}}$")
-                
-                if operation == '+':
-                    steps.append(f"Sumar numeradores: $\\frac{{{new_num1} + {new_num2}}}{{{common_den}}} = \\frac{{{new_num1 + new_num2}}}{{{common_den}}}$")
-                else:
-                    steps.append(f"Restar numeradores: $\\frac{{{new_num1} - {new_num2}}}{{{common_den}}} = \\frac{{{new_num1 - new_num2}}}{{{common_den}}}$")
-        
-        elif operation == '*':
-            steps.append(f"Multiplicar numeradores y denominadores")
-            steps.append(f"$\\frac{{{frac1.p} \\times {frac2.p}}}{{{frac1.q} \\times {frac2.q}}} = \\frac{{{frac1.p * frac2.p}}}{{{frac1.q * frac2.q}}}$")
-        
-        else:  # division
-            steps.append(f"Multiplicar por el recíproco")
-            steps.append(f"$\\frac{{{frac1.p}}}{{{frac1.q}}} \\times \\frac{{{frac2.q}}}{{{frac2.p}}} = \\frac{{{frac1.p * frac2.q}}}{{{frac1.q * frac2.p}}}$")
-        
-        return steps
-    
-    def _generate_operation_steps(self, expression):
-        """Genera pasos para operaciones combinadas"""
-        # Esta es una implementación simplificada
-        # En una versión completa, se analizaría la expresión paso a paso
+    def generate_batch(self, topic, difficulty='medium', n=100, seed=None):
+        """
+        Genera `n` ejercicios de un tema de una sola vez (hojas de trabajo,
+        bancos de examen). Los parámetros se sortean como arreglos de NumPy,
+        las respuestas se calculan vectorizadas y el texto y el LaTeX se arman
+        al final. La misma `seed` produce el mismo lote; `seed` también puede
+        ser un np.random.Generator.
+        Los temas sin versión vectorizada se generan uno por uno.
+        """
+        rng = np.random.default_rng(seed)
+        batch_generators = {
+            'fraction_operations': self._batch_fraction_operations,
+            'combined_operations': self._batch_combined_operations,
+            'mcm_mcd': self._batch_mcm_mcd,
+            'factorization': self._batch_factorization
+        }
+        
+        if topic not in batch_generators:
+            # Un generador escalar sembrado desde `rng` mantiene el lote reproducible
+            scalar = type(self)(random.Random(int(rng.integers(2 ** 63))))
+            return [scalar.generate_random_exercise(topic, difficulty) for _ in range(n)]
+        return batch_generators[topic](rng, difficulty, n)
+    
+    def _batch_fraction_operations(self, rng, difficulty, n):
+        """Lote de fracciones: numeradores y denominadores como arreglos de enteros"""
+        operations = ['+', '-', '*', '/']
+        (num_low, num_high), (den_low, den_high) = self._fraction_ranges(difficulty)
+        
+        ops = rng.integers(0, 4, n)
+        num1, num2 = rng.integers(num_low, num_high + 1, (2, n))
+        den1, den2 = rng.integers(den_low, den_high + 1, (2, n))
+        
+        # Fracciones reducidas
+        gcd1, gcd2 = np.gcd(num1, den1), np.gcd(num2, den2)
+        p1, q1, p2, q2 = num1 // gcd1, den1 // gcd1, num2 // gcd2, den2 // gcd2
+        
+        # Resultado de cada operación (los denominadores son siempre positivos)
+        numerator = np.select(
+            [ops == 0, ops == 1, ops == 2],
+            [p1 * q2 + p2 * q1, p1 * q2 - p2 * q1, p1 * p2],
+            p1 * q2
+        )
+        denominator = np.where(ops == 3, q1 * p2, q1 * q2)
+        divisor = np.gcd(numerator, denominator)
+        numerator, denominator = numerator // divisor, denominator // divisor
+        
+        columns = [a.tolist() for a in (ops, num1, den1, num2, den2, p1, q1, p2, q2, numerator, denominator)]
         return [
-            "Aplicar jerarquía de operaciones (PEMDAS)",
-            "Resolver paréntesis primero",
-            "Calcular exponentes",
-            "Realizar multiplicaciones y divisiones",
-            "Realizar sumas y restas"
+            self._fraction_exercise(n1, d1, n2, d2, operations[op], (a, b), (c, d), (num, den))
+            for op, n1, d1, n2, d2, a, b, c, d, num, den in zip(*columns)
         ]
     
-    def _generate_mcm_mcd_steps(self, numbers):
-        """Genera pasos para calcular MCM y MCD"""
-        steps = []
-        
-        # Factorización de cada número
-        for num in numbers:
-            factors = factorint(num)
-            factor_str = " × ".join([f"{p}^{e}" if e > 1 else str(p) for p, e in factors.items()])
-            steps.append(f"{num} = {factor_str}")
-        
-        steps.append("MCD: tomar factores comunes con menor exponente")
-        steps.append("MCM: tomar todos los factores con mayor exponente")
+    def _batch_combined_operations(self, rng, difficulty, n):
+        """Lote de operaciones combinadas evaluadas sobre arreglos"""
+        if difficulty == 'easy':
+            a, b, c = rng.integers(1, 11, (3, n))
+            values, result = (a, b, c), a + b * c
+        elif difficulty == 'medium':
+            a, b, c, d = rng.integers(1, 9, n), rng.integers(1, 6, n), rng.integers(2, 5, n), rng.integers(1, 7, n)
+            values, result = (a, b, c, d), a + b * (c ** 2 - d)
+        else:
+            a, b, c = rng.integers(1, 7, n), rng.integers(1, 5, n), rng.integers(2, 4, n)
+            d, e = rng.integers(1, 6, n), rng.integers(1, 5, n)
+            values, result = (a, b, c, d, e), (a + b) * c ** 2 - d * e
         
-        return steps
+        rows = zip(*(column.tolist() for column in values))
+        return [self._combined_exercise(difficulty, row, total) for row, total in zip(rows, result.tolist())]
     
-    def _generate_factorization_steps(self, number):
-        """Genera pasos para factorización prima"""
-        steps = []
-        temp = number
-        factors = []
-        
-        # Proceso de factorización
-        divisor = 2
-        while divisor * divisor <= temp:
-            while temp % divisor == 0:
-                factors.append(divisor)
-                temp //= divisor
-                steps.append(f"{temp * divisor} ÷ {divisor} = {temp}")
-            divisor += 1
-        
-        if temp > 1:
-            factors.append(temp)
+    def _batch_mcm_mcd(self, rng, difficulty, n):
+        """Lote de MCM y MCD con np.gcd y np.lcm"""
+        if difficulty == 'easy':
+            pairs = rng.integers(6, 21, (n, 2))
+        elif difficulty == 'medium':
+            pairs = rng.integers(12, 51, (n, 2))
+        else:
+            pairs = rng.integers(20, 101, (n, 2))
+        mcd_results = np.gcd.reduce(pairs, axis=1)
+        mcm_results = np.lcm.reduce(pairs, axis=1)
+        numbers = pairs.tolist()
+        
+        if difficulty not in ('easy', 'medium'):
+            # La mitad de los ejercicios difíciles usa tres números
+            triples = rng.integers(12, 31, (n, 3))
+            use_triple = rng.integers(0, 2, n).astype(bool)
+            mcd_results = np.where(use_triple, np.gcd.reduce(triples, axis=1), mcd_results)
+            mcm_results = np.where(use_triple, np.lcm.reduce(triples, axis=1), mcm_results)
+            numbers = [
+                triple if flag else pair
+                for flag, pair, triple in zip(use_triple.tolist(), numbers, triples.tolist())
+            ]
         
-        return steps
+        return [
+            self._mcm_mcd_exercise(row, mcd_result, mcm_result)
+            for row, mcd_result, mcm_result in zip(numbers, mcd_results.tolist(), mcm_results.tolist())
+        ]
+    
+    def _batch_factorization(self, rng, difficulty, n):
+        """Lote de factorizaciones: la tabla de primos hace el trabajo al armar cada ejercicio"""
+        low, high = self._factorization_range(difficulty)
+        return [self._factorization_exercise(number) for number in rng.integers(low, high + 1, n).tolist()]
 
 
 class AlgebraExerciseGenerator:
-    """Clase principal para generar ejercicios de álgebra"""
+    """
+    Clase principal para generar ejercicios de álgebra.
+    `rng` es la fuente de azar (un random.Random); con una semilla propia el
+    generador es reproducible. Por defecto se usa el módulo random global.
+    """
     
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
         self.difficulty_levels = ['easy', 'medium', 'hard']
-        self.x = symbols('x')
-        self.y = symbols('y')
+        self.topics = ['monomios', 'polinomios', 'productos_notables', 'factorizacion']
     
     def generate_random_exercise(self, topic=None, difficulty='medium'):
         """
         Genera un ejercicio aleatorio del tema especificado
         """
-        topics = ['monomios', 'polinomios', 'productos_notables', 'factorizacion']
-        
         if topic is None:
-            topic = random.choice(topics)
+            topic = self.rng.choice(self.topics)
         
         generators = {
             'monomios': self.generate_monomial_exercise,
@@ -458,37 +493,34 @@ class AlgebraExerciseGenerator:
         """Genera ejercicios de operaciones con monomios"""
         
         operations = ['multiply', 'divide', 'add_subtract']
-        operation = random.choice(operations)
+        operation = self.rng.choice(operations)
         
         if difficulty == 'easy':
             # Monomios simples
-            coef1, exp1 = random.randint(1, 5), random.randint(1, 3)
-            coef2, exp2 = random.randint(1, 5), random.randint(1, 3)
+            coef1, exp1 = self.rng.randint(1, 5), self.rng.randint(1, 3)
+            coef2, exp2 = self.rng.randint(1, 5), self.rng.randint(1, 3)
         elif difficulty == 'medium':
             # Monomios con coeficientes negativos
-            coef1, exp1 = random.randint(-8, 8), random.randint(1, 4)
-            coef2, exp2 = random.randint(-8, 8), random.randint(1, 4)
+            coef1, exp1 = self.rng.randint(-8, 8), self.rng.randint(1, 4)
+            coef2, exp2 = self.rng.randint(-8, 8), self.rng.randint(1, 4)
             if coef1 == 0: coef1 = 1
             if coef2 == 0: coef2 = 1
         else:  # hard
             # Monomios con múltiples variables
-            coef1, exp1 = random.randint(-10, 10), random.randint(1, 5)
-            coef2, exp2 = random.randint(-10, 10), random.randint(1, 5)
+            coef1, exp1 = self.rng.randint(-10, 10), self.rng.randint(1, 5)
+            coef2, exp2 = self.rng.randint(-10, 10), self.rng.randint(1, 5)
             if coef1 == 0: coef1 = 1
             if coef2 == 0: coef2 = 1
         
+        add = self.rng.choice([True, False]) if operation == 'add_subtract' else True
+        return self._monomial_exercise(operation, coef1, exp1, coef2, exp2, add)
+    
+    def _monomial_exercise(self, operation, coef1, exp1, coef2, exp2, add=True):
+        """Arma el ejercicio de monomios; `add` elige entre suma y resta"""
         if operation == 'multiply':
-            mono1 = coef1 * self.x**exp1
-            mono2 = coef2 * self.x**exp2
-            result = mono1 * mono2
-            
-            problem_text = f"Multiplicar: $({latex(mono1)}) \\cdot ({latex(mono2)})$"
-            
-            solution_steps = [
-                f"Multiplicar coeficientes: ${coef1} \\times {coef2} = {coef1 * coef2}$",
-                f"Sumar exponentes: $x^{{{exp1}}} \\times x^{{{exp2}}} = x^{{{exp1 + exp2}}}$",
-                f"Resultado: ${latex(result)}$"
-            ]
+            result = monomial_latex(coef1 * coef2, exp1 + exp2)
+            answer_form = polynomial_form([0] * (exp1 + exp2) + [coef1 * coef2])
+            problem_text = f"Multiplicar: $({monomial_latex(coef1, exp1)}) \\cdot ({monomial_latex(coef2, exp2)})$"
             
         elif operation == 'divide':
             # Asegurar que la división sea exacta
@@ -496,44 +528,32 @@ class AlgebraExerciseGenerator:
                 exp1, exp2 = exp2, exp1
                 coef1, coef2 = coef2, coef1
             
-            mono1 = coef1 * self.x**exp1
-            mono2 = coef2 * self.x**exp2
-            result = mono1 / mono2
-            
-            problem_text = f"Dividir: $\\frac{{{latex(mono1)}}}{{{latex(mono2)}}}$"
-            
-            solution_steps = [
-                f"Dividir coeficientes: $\\frac{{{coef1}}}{{{coef2}}} = {sp.Rational(coef1, coef2)}$",
-                f"Restar exponentes: $\\frac{{x^{{{exp1}}}}}{{x^{{{exp2}}}}} = x^{{{exp1 - exp2}}}$",
-                f"Resultado: ${latex(result)}$"
-            ]
+            quotient = reduce_fraction(coef1, coef2)
+            result = rational_monomial_latex(quotient, exp1 - exp2)
+            answer_form = polynomial_form([0] * (exp1 - exp2) + [quotient[0]], quotient[1])
+            problem_text = f"Dividir: $\\frac{{{monomial_latex(coef1, exp1)}}}{{{monomial_latex(coef2, exp2)}}}$"
             
         else:  # add_subtract
             # Solo monomios semejantes se pueden sumar
-            mono1 = coef1 * self.x**exp1
-            mono2 = coef2 * self.x**exp1  # Mismo exponente
+            mono1 = monomial_latex(coef1, exp1)
+            mono2 = monomial_latex(coef2, exp1)  # Mismo exponente
             
-            if random.choice([True, False]):
-                result = mono1 + mono2
-                problem_text = f"Sumar: $({latex(mono1)}) + ({latex(mono2)})$"
-                operation_text = "Sumar"
+            if add:
+                total = coef1 + coef2
+                problem_text = f"Sumar: $({mono1}) + ({mono2})$"
             else:
-                result = mono1 - mono2
-                problem_text = f"Restar: $({latex(mono1)}) - ({latex(mono2)})$"
-                operation_text = "Restar"
-            
-            solution_steps = [
-                f"Los monomios son semejantes (misma parte literal: $x^{{{exp1}}}$)",
-                f"{operation_text} coeficientes: ${coef1} {'+' if operation_text == 'Sumar' else '-'} {coef2} = {coef1 + coef2 if operation_text == 'Sumar' else coef1 - coef2}$",
-                f"Resultado: ${latex(result)}$"
-            ]
+                total = coef1 - coef2
+                problem_text = f"Restar: $({mono1}) - ({mono2})$"
+            result = monomial_latex(total, exp1)
+            answer_form = polynomial_form([0] * exp1 + [total])
         
         return {
             'type': 'monomios',
             'problem': problem_text,
-            'answer': latex(result),
-            'answer_latex': latex(result),
-            'solution_steps': solution_steps,
+            'answer': result,
+            'answer_latex': result,
+            'answer_form': answer_form,
+            'solution_recipe': step_recipe('monomial', operation, coef1, exp1, coef2, exp2, add),
             'error_type': 'monomial_operations'
         }
     
@@ -541,57 +561,53 @@ class AlgebraExerciseGenerator:
         """Genera ejercicios de operaciones con polinomios"""
         
         operations = ['add', 'subtract', 'multiply']
-        operation = random.choice(operations)
+        operation = self.rng.choice(operations)
+        
+        # Coeficientes sorteados del término de mayor grado al independiente
+        ranges1, ranges2 = self._polynomial_ranges(difficulty)
+        poly1 = Polynomial([self.rng.randint(low, high) for low, high in ranges1][::-1])
+        poly2 = Polynomial([self.rng.randint(low, high) for low, high in ranges2][::-1])
         
+        if operation == 'add':
+            result = poly1 + poly2
+        elif operation == 'subtract':
+            result = poly1 - poly2
+        else:
+            result = poly1 * poly2
+        
+        return self._polynomial_exercise(operation, poly1, poly2, result)
+    
+    def _polynomial_ranges(self, difficulty):
+        """Rangos de los coeficientes de cada polinomio, de mayor a menor grado"""
         if difficulty == 'easy':
             # Polinomios simples
-            poly1 = random.randint(1, 5) * self.x + random.randint(1, 10)
-            poly2 = random.randint(1, 5) * self.x + random.randint(1, 10)
+            return [(1, 5), (1, 10)], [(1, 5), (1, 10)]
         elif difficulty == 'medium':
             # Polinomios cuadráticos
-            poly1 = random.randint(1, 3) * self.x**2 + random.randint(-5, 5) * self.x + random.randint(-10, 10)
-            poly2 = random.randint(1, 3) * self.x + random.randint(-5, 5)
-        else:  # hard
-            # Polinomios más complejos
-            poly1 = random.randint(1, 2) * self.x**3 + random.randint(-3, 3) * self.x**2 + random.randint(-5, 5) * self.x + random.randint(-10, 10)
-            poly2 = random.randint(1, 2) * self.x**2 + random.randint(-3, 3) * self.x + random.randint(-5, 5)
+            return [(1, 3), (-5, 5), (-10, 10)], [(1, 3), (-5, 5)]
+        # Polinomios más complejos
+        return [(1, 2), (-3, 3), (-5, 5), (-10, 10)], [(1, 2), (-3, 3), (-5, 5)]
+    
+    def _polynomial_exercise(self, operation, poly1, poly2, result):
+        """Arma el ejercicio de polinomios a partir de los polinomios ya calculados"""
+        poly1_latex, poly2_latex, result_latex = poly1.latex(), poly2.latex(), result.latex()
         
         if operation == 'add':
-            result = poly1 + poly2
-            problem_text = f"Sumar: $({latex(poly1)}) + ({latex(poly2)})$"
-            
-            solution_steps = [
-                "Agrupar términos semejantes",
-                f"Resultado: ${latex(result)}$"
-            ]
+            problem_text = f"Sumar: $({poly1_latex}) + ({poly2_latex})$"
             
         elif operation == 'subtract':
-            result = poly1 - poly2
-            problem_text = f"Restar: $({latex(poly1)}) - ({latex(poly2)})$"
-            
-            solution_steps = [
-                "Cambiar signos del segundo polinomio",
-                "Agrupar términos semejantes",
-                f"Resultado: ${latex(result)}$"
-            ]
+            problem_text = f"Restar: $({poly1_latex}) - ({poly2_latex})$"
             
         else:  # multiply
-            result = expand(poly1 * poly2)
-            problem_text = f"Multiplicar: $({latex(poly1)}) \\cdot ({latex(poly2)})$"
-            
-            solution_steps = [
-                "Aplicar propiedad distributiva",
-                "Multiplicar cada término del primer polinomio por cada término del segundo",
-                "Agrupar términos semejantes",
-                f"Resultado: ${latex(result)}$"
-            ]
+            problem_text = f"Multiplicar: $({poly1_latex}) \\cdot ({poly2_latex})$"
         
         return {
             'type': 'polinomios',
             'problem': problem_text,
-            'answer': latex(result),
-            'answer_latex': latex(result),
-            'solution_steps': solution_steps,
+            'answer': result_latex,
+            'answer_latex': result_latex,
+            'answer_form': polynomial_form(result.coefficients, structure='expanded'),
+            'solution_recipe': step_recipe('polynomial', operation, result_latex),
             'error_type': 'polynomial_operations'
         }
     
@@ -599,62 +615,56 @@ class AlgebraExerciseGenerator:
         """Genera ejercicios de productos notables"""
         
         products = ['square_sum', 'square_diff', 'diff_squares', 'cube_sum', 'cube_diff']
-        product_type = random.choice(products)
+        product_type = self.rng.choice(products)
         
         if difficulty == 'easy':
-            a, b = random.randint(1, 5), random.randint(1, 5)
+            a, b = self.rng.randint(1, 5), self.rng.randint(1, 5)
         elif difficulty == 'medium':
-            a, b = random.randint(1, 8), random.randint(1, 8)
+            a, b = self.rng.randint(1, 8), self.rng.randint(1, 8)
         else:  # hard
-            a, b = random.randint(1, 10), random.randint(1, 10)
+            a, b = self.rng.randint(1, 10), self.rng.randint(1, 10)
+        
+        # (a x + b) y (a x - b) como coeficientes en orden creciente de grado
+        plus, minus = Polynomial([b, a]), Polynomial([-b, a])
+        if product_type == 'diff_squares':
+            result = plus * minus
+        else:
+            base = plus if product_type.endswith('_sum') else minus
+            result = base ** (2 if product_type.startswith('square') else 3)
         
+        return self._notable_product_exercise(product_type, a, b, result)
+    
+    def _notable_product_exercise(self, product_type, a, b, result):
+        """Arma el ejercicio de productos notables con el desarrollo ya calculado"""
         if product_type == 'square_sum':
             # (a + b)²
-            expr = (a * self.x + b)**2
-            result = expand(expr)
             problem_text = f"Desarrollar: $({a}x + {b})^2$"
-            formula = "(a + b)^2 = a^2 + 2ab + b^2"
             
         elif product_type == 'square_diff':
             # (a - b)²
-            expr = (a * self.x - b)**2
-            result = expand(expr)
             problem_text = f"Desarrollar: $({a}x - {b})^2$"
-            formula = "(a - b)^2 = a^2 - 2ab + b^2"
             
         elif product_type == 'diff_squares':
             # (a + b)(a - b)
-            expr = (a * self.x + b) * (a * self.x - b)
-            result = expand(expr)
             problem_text = f"Desarrollar: $({a}x + {b})({a}x - {b})$"
-            formula = "(a + b)(a - b) = a^2 - b^2"
             
         elif product_type == 'cube_sum':
             # (a + b)³
-            expr = (a * self.x + b)**3
-            result = expand(expr)
             problem_text = f"Desarrollar: $({a}x + {b})^3$"
-            formula = "(a + b)^3 = a^3 + 3a^2b + 3ab^2 + b^3"
             
         else:  # cube_diff
             # (a - b)³
-            expr = (a * self.x - b)**3
-            result = expand(expr)
             problem_text = f"Desarrollar: $({a}x - {b})^3$"
-            formula = "(a - b)^3 = a^3 - 3a^2b + 3ab^2 - b^3"
         
-        solution_steps = [
-            f"Aplicar la fórmula: ${formula}$",
-            f"Sustituir valores: $a = {a}x$, $b = {b}$",
-            f"Resultado: ${latex(result)}$"
-        ]
+        result_latex = result.latex()
         
         return {
             'type': 'productos_notables',
             'problem': problem_text,
-            'answer': latex(result),
-            'answer_latex': latex(result),
-            'solution_steps': solution_steps,
+            'answer': result_latex,
+            'answer_latex': result_latex,
+            'answer_form': polynomial_form(result.coefficients, structure='expanded'),
+            'solution_recipe': step_recipe('notable_product', product_type, a, b, result_latex),
             'error_type': 'notable_products'
         }
     
@@ -662,7 +672,7 @@ class AlgebraExerciseGenerator:
         """Genera ejercicios de factorización"""
         
         factorization_types = ['common_factor', 'perfect_square', 'diff_squares', 'trinomial']
-        fact_type = random.choice(factorization_types)
+        fact_type = self.rng.choice(factorization_types)
         
         if difficulty == 'easy':
             coeffs = [1, 2, 3, 4, 5]
@@ -673,81 +683,156 @@ class AlgebraExerciseGenerator:
         
         if fact_type == 'common_factor':
             # Factor común
-            common = random.choice([2, 3, 4, 5])
-            a, b = random.choice(coeffs), random.choice(coeffs)
-            
-            poly = common * a * self.x**2 + common * b * self.x
-            factored = factor(poly)
+            common = self.rng.choice([2, 3, 4, 5])
+            a, b = self.rng.choice(coeffs), self.rng.choice(coeffs)
             
-            problem_text = f"Factorizar: ${latex(poly)}$"
+            poly = Polynomial([0, common * b, common * a])
+            factored = poly.factor().latex()
+            values = (common,)
             
-            solution_steps = [
-                f"Identificar factor común: ${common}x$",
-                f"Extraer factor común: ${latex(factored)}$"
-            ]
+            problem_text = f"Factorizar: ${poly.latex()}$"
             
         elif fact_type == 'perfect_square':
             # Trinomio cuadrado perfecto
-            a = random.choice([1, 2, 3, 4])
-            b = random.choice([1, 2, 3, 4, 5])
+            a = self.rng.choice([1, 2, 3, 4])
+            b = self.rng.choice([1, 2, 3, 4, 5])
             
-            poly = a**2 * self.x**2 + 2*a*b * self.x + b**2
-            factored = factor(poly)
+            poly = Polynomial([b**2, 2*a*b, a**2])
+            factored = poly.factor().latex()
+            values = (a, b)
             
-            problem_text = f"Factorizar: ${latex(poly)}$"
-            
-            solution_steps = [
-                "Reconocer trinomio cuadrado perfecto: $a^2 + 2ab + b^2 = (a + b)^2$",
-                f"Identificar: $a = {a}x$, $b = {b}$",
-                f"Factorizar: ${latex(factored)}$"
-            ]
+            problem_text = f"Factorizar: ${poly.latex()}$"
             
         elif fact_type == 'diff_squares':
             # Diferencia de cuadrados
-            a = random.choice([1, 2, 3, 4])
-            b = random.choice([1, 2, 3, 4, 5])
+            a = self.rng.choice([1, 2, 3, 4])
+            b = self.rng.choice([1, 2, 3, 4, 5])
             
-            poly = a**2 * self.x**2 - b**2
-            factored = factor(poly)
+            poly = Polynomial([-b**2, 0, a**2])
+            factored = poly.factor().latex()
+            values = (a, b)
             
-            problem_text = f"Factorizar: ${latex(poly)}$"
-            
-            solution_steps = [
-                "Reconocer diferencia de cuadrados: $a^2 - b^2 = (a + b)(a - b)$",
-                f"Identificar: $a = {a}x$, $b = {b}$",
-                f"Factorizar: ${latex(factored)}$"
-            ]
+            problem_text = f"Factorizar: ${poly.latex()}$"
             
         else:  # trinomial
             # Trinomio de la forma x² + bx + c
             # Buscar dos números que sumados den b y multiplicados den c
             factors_c = [(1, 6), (2, 3), (1, 8), (2, 4), (1, 12), (3, 4)]
-            p, q = random.choice(factors_c)
+            p, q = self.rng.choice(factors_c)
             
-            if random.choice([True, False]):
+            if self.rng.choice([True, False]):
                 p = -p
-            if random.choice([True, False]):
+            if self.rng.choice([True, False]):
                 q = -q
             
             b = p + q
             c = p * q
             
-            poly = self.x**2 + b * self.x + c
-            factored = factor(poly)
+            poly = Polynomial([c, b, 1])
+            factored = poly.factor().latex()
+            values = (b, c, p, q)
             
-            problem_text = f"Factorizar: ${latex(poly)}$"
-            
-            solution_steps = [
-                f"Buscar dos números que sumados den ${b}$ y multiplicados den ${c}$",
-                f"Los números son ${p}$ y ${q}$",
-                f"Factorizar: ${latex(factored)}$"
-            ]
+            problem_text = f"Factorizar: ${poly.latex()}$"
         
         return {
             'type': 'factorizacion',
             'problem': problem_text,
-            'answer': latex(factored),
-            'answer_latex': latex(factored),
-            'solution_steps': solution_steps,
+            'answer': factored,
+            'answer_latex': factored,
+            'answer_form': polynomial_form(poly.coefficients, structure='factored'),
+            'solution_recipe': step_recipe('polynomial_factorization', fact_type, values, factored),
             'error_type': 'factorization'
         }
+    
+    def generate_batch(self, topic, difficulty='medium', n=100, seed=None):
+        """
+        Genera `n` ejercicios de un tema de una sola vez. Los coeficientes se
+        sortean como arreglos de NumPy, los productos de polinomios se calculan
+        con convoluciones sobre todo el lote y el LaTeX se arma al final.
+        La misma `seed` (o np.random.Generator) produce el mismo lote.
+        Los temas sin versión vectorizada se generan uno por uno.
+        """
+        rng = np.random.default_rng(seed)
+        batch_generators = {
+            'monomios': self._batch_monomials,
+            'polinomios': self._batch_polynomials,
+            'productos_notables': self._batch_notable_products
+        }
+        
+        if topic not in batch_generators:
+            # Un generador escalar sembrado desde `rng` mantiene el lote reproducible
+            scalar = type(self)(random.Random(int(rng.integers(2 ** 63))))
+            return [scalar.generate_random_exercise(topic, difficulty) for _ in range(n)]
+        return batch_generators[topic](rng, difficulty, n)
+    
+    def _batch_monomials(self, rng, difficulty, n):
+        """Lote de monomios: coeficientes y exponentes como arreglos"""
+        operations = ['multiply', 'divide', 'add_subtract']
+        if difficulty == 'easy':
+            (coef_low, coef_high), exp_high = (1, 5), 3
+        elif difficulty == 'medium':
+            (coef_low, coef_high), exp_high = (-8, 8), 4
+        else:
+            (coef_low, coef_high), exp_high = (-10, 10), 5
+        
+        ops = rng.integers(0, 3, n)
+        coefs = rng.integers(coef_low, coef_high + 1, (2, n))
+        coefs[coefs == 0] = 1
+        exps = rng.integers(1, exp_high + 1, (2, n))
+        add = rng.integers(0, 2, n).astype(bool)
+        
+        columns = [a.tolist() for a in (ops, coefs[0], exps[0], coefs[1], exps[1], add)]
+        return [
+            self._monomial_exercise(operations[op], coef1, exp1, coef2, exp2, flag)
+            for op, coef1, exp1, coef2, exp2, flag in zip(*columns)
+        ]
+    
+    def _batch_polynomials(self, rng, difficulty, n):
+        """Lote de polinomios: suma, resta y producto por convolución de coeficientes"""
+        operations = ['add', 'subtract', 'multiply']
+        ranges1, ranges2 = self._polynomial_ranges(difficulty)
+        
+        # Columnas en orden creciente de grado
+        ops = rng.integers(0, 3, n)
+        poly1 = np.stack([rng.integers(low, high + 1, n) for low, high in reversed(ranges1)], axis=1)
+        poly2 = np.stack([rng.integers(low, high + 1, n) for low, high in reversed(ranges2)], axis=1)
+        
+        product = _convolve_rows(poly1, poly2)
+        width = product.shape[1]
+        poly1_padded, poly2_padded = _pad_columns(poly1, width), _pad_columns(poly2, width)
+        results = np.select(
+            [ops[:, None] == 0, ops[:, None] == 1],
+            [poly1_padded + poly2_padded, poly1_padded - poly2_padded],
+            product
+        )
+        
+        return [
+            self._polynomial_exercise(operations[op], Polynomial(first), Polynomial(second), Polynomial(result))
+            for op, first, second, result in zip(ops.tolist(), poly1.tolist(), poly2.tolist(), results.tolist())
+        ]
+    
+    def _batch_notable_products(self, rng, difficulty, n):
+        """Lote de productos notables: potencias de binomios por convolución"""
+        products = ['square_sum', 'square_diff', 'diff_squares', 'cube_sum', 'cube_diff']
+        high = {'easy': 5, 'medium': 8}.get(difficulty, 10)
+        
+        kinds = rng.integers(0, len(products), n)
+        a, b = rng.integers(1, high + 1, (2, n))
+        plus = np.stack([b, a], axis=1)
+        minus = np.stack([-b, a], axis=1)
+        
+        square_sum = _convolve_rows(plus, plus)
+        square_diff = _convolve_rows(minus, minus)
+        candidates = [
+            _pad_columns(square_sum, 4),
+            _pad_columns(square_diff, 4),
+            _pad_columns(_convolve_rows(plus, minus), 4),
+            _convolve_rows(square_sum, plus),
+            _convolve_rows(square_diff, minus)
+        ]
+        results = np.select([kinds[:, None] == i for i in range(len(products) - 1)], candidates[:-1], candidates[-1])
+        
+        return [
+            self._notable_product_exercise(products[kind], first, second, Polynomial(result))
+            for kind, first, second, result in zip(kinds.tolist(), a.tolist(), b.tolist(), results.tolist())
+        ]
@@ -0,0 +1,131 @@
+"""
+Pool de ejercicios pre-generados por (tema, dificultad)
+Un hilo en segundo plano lo rellena para que las vistas solo tomen un ejercicio listo
+"""
+
+import threading
+from collections import deque
+
+POOL_CAPACITY = 8
+POOL_LOW_WATER = 3
+
+_shared_pools = {}
+_shared_pools_lock = threading.Lock()
+
+
+class ExercisePool:
+    """
+    Cola de ejercicios listos para cada combinación (tema, dificultad).
+    `get` entrega un ejercicio en O(1) y, cuando la cola baja de `low_water`,
+    despierta al hilo de relleno para volver a llenarla hasta `capacity`.
+    Si la cola está vacía el ejercicio se genera en el momento.
+    """
+
+    def __init__(self, generate, topics, difficulties=('easy', 'medium', 'hard'),
+                 capacity=POOL_CAPACITY, low_water=POOL_LOW_WATER):
+        self.generate = generate
+        self.topics = frozenset(topics)
+        self.difficulties = frozenset(difficulties)
+        self.capacity = capacity
+        self.low_water = low_water
+        self._queues = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stats = {'served': 0, 'misses': 0, 'generated': 0, 'errors': 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _queue_for(self, key):
+        queue = self._queues.get(key)
+        if queue is None:
+            with self._lock:
+                queue = self._queues.setdefault(key, deque())
+        return queue
+
+    def _ensure_refill_thread(self):
+        # El hilo se inicia con el primer pedido para no crearlo al importar
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._refill_loop,
+                        name='exercise-pool-refill',
+                        daemon=True
+                    )
+                    self._thread.start()
+
+    def get(self, topic=None, difficulty='medium'):
+        """Devuelve un ejercicio del tema y dificultad pedidos"""
+        if (topic is not None and topic not in self.topics) or difficulty not in self.difficulties:
+            # Combinaciones desconocidas no se guardan para no crear colas arbitrarias
+            return self.generate(topic, difficulty)
+
+        queue = self._queue_for((topic, difficulty))
+        try:
+            exercise = queue.popleft()
+            self._count('served')
+        except IndexError:
+            exercise = None
+            self._count('misses')
+
+        if len(queue) < self.low_water:
+            self._ensure_refill_thread()
+            self._wakeup.set()
+
+        if exercise is None:
+            exercise = self.generate(topic, difficulty)
+        return exercise
+
+    def _refill_loop(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+
+            # Se agrega un ejercicio por cola en cada vuelta para que ninguna
+            # combinación espere a que las demás estén llenas
+            pending = True
+            while pending:
+                pending = False
+                for (topic, difficulty), queue in list(self._queues.items()):
+                    if len(queue) >= self.capacity:
+                        continue
+                    try:
+                        queue.append(self.generate(topic, difficulty))
+                    except Exception:
+                        self._count('errors')
+                        continue
+                    self._count('generated')
+                    pending = pending or len(queue) < self.capacity
+
+    def stats(self):
+        """Contadores del pool y ejercicios disponibles por (tema, dificultad)"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['available'] = {
+            f'{topic or "random"}/{difficulty}': len(queue)
+            for (topic, difficulty), queue in list(self._queues.items())
+        }
+        return stats
+
+
+def get_shared_pool(name, generator_class):
+    """
+    Devuelve el pool compartido por todo el proceso para `generator_class`.
+    Streamlit vuelve a ejecutar app.py en cada interacción, por eso el pool
+    vive en este módulo y no en el script.
+    """
+    pool = _shared_pools.get(name)
+    if pool is None:
+        with _shared_pools_lock:
+            pool = _shared_pools.get(name)
+            if pool is None:
+                generator = generator_class()
+                pool = _shared_pools[name] = ExercisePool(
+                    generator.generate_random_exercise,
+                    generator.topics,
+                    generator.difficulty_levels
+                )
+    return pool
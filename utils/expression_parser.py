@@ -0,0 +1,354 @@
+"""
+Parser restringido de expresiones matemáticas
+Convierte la entrada del usuario en árboles de SymPy sin pasar por eval()
+
+Gramática admitida:
+    expresión := término (('+' | '-') término)*
+    término   := unario (('*' | '/') unario | unario)*     # el último caso es la multiplicación implícita
+    unario    := ('+' | '-') unario | potencia
+    potencia  := primario (('^' | '**') unario)?
+    primario  := número | variable | constante | función '(' expresión ')' | '(' expresión ')'
+
+Variables de una letra, constantes pi y e, y las funciones sqrt, sin, cos,
+tan, log, ln, exp y abs. Cualquier otro identificador se rechaza.
+
+También se acepta el subconjunto de LaTeX que escriben los generadores y
+sympy.latex: llaves como paréntesis, \\frac{a}{b}, \\left( \\right),
+\\times, \\cdot, \\div, \\sqrt{...}, \\pi y las funciones con barra
+(\\sin, \\log, ...). El tokenizador los traduce a los tokens de siempre.
+"""
+
+import re
+
+import sympy as sp
+
+
+class ExpressionSyntaxError(ValueError):
+    """La entrada no pertenece a la gramática admitida"""
+
+
+FUNCTIONS = {
+    'sqrt': sp.sqrt,
+    'sin': sp.sin,
+    'cos': sp.cos,
+    'tan': sp.tan,
+    'log': sp.log,
+    'ln': sp.log,
+    'exp': sp.exp,
+    'abs': sp.Abs
+}
+
+CONSTANTS = {
+    'pi': sp.pi,
+    'π': sp.pi,
+    'e': sp.E
+}
+
+# Límites de las potencias numéricas: más allá, calcularlas de forma exacta
+# no termina en un tiempo razonable (9^9^9)
+MAX_EXPONENT = 1000
+MAX_POWER_BITS = 100000
+
+# Nombres conocidos, de mayor a menor longitud para que 'exp' gane sobre 'e'
+_KNOWN_NAMES = sorted(list(FUNCTIONS) + list(CONSTANTS), key=len, reverse=True)
+
+_TOKEN_RE = re.compile(r'\s*(?:(\d+\.?\d*|\.\d+)|([A-Za-zπ]+)|(\*\*|[-+*/^()=×÷−{}])|\\([A-Za-z]+|[,;:! ]))')
+
+_OPEN_PAREN_RE = re.compile(r'\s*\(')
+
+# Exponente pegado a un número ('1e-12', '2E5'): se leería como el número e
+_SCIENTIFIC_RE = re.compile(r'[eE][+-]?\d')
+
+_OPERATOR_ALIASES = {'**': '^', '×': '*', '÷': '/', '−': '-'}
+
+# Comandos LaTeX que equivalen a un token; None = se ignora (espacios, \left, \right)
+_LATEX_COMMANDS = {
+    'times': ('op', '*'),
+    'cdot': ('op', '*'),
+    'div': ('op', '/'),
+    'pi': ('const', 'pi'),
+    'left': None,
+    'right': None,
+    ',': None, ';': None, ':': None, '!': None, ' ': None
+}
+_LATEX_COMMANDS.update((name, ('func', name)) for name in FUNCTIONS)
+_LATEX_FRACTIONS = frozenset(['frac', 'dfrac', 'tfrac'])
+
+_symbols = {}
+
+
+def _symbol(name):
+    """Símbolo de SymPy reutilizado para cada letra"""
+    symbol = _symbols.get(name)
+    if symbol is None:
+        symbol = _symbols[name] = sp.Symbol(name)
+    return symbol
+
+
+def _split_name(word, followed_by_paren):
+    """
+    Separa una secuencia de letras en nombres conocidos y variables de una
+    letra, p. ej. 'xy' -> x, y y '2pix' -> pi, x. Devuelve tokens.
+    """
+    if len(word) == 1 and word not in CONSTANTS:
+        # Caso más común: una variable suelta
+        if followed_by_paren and word in FUNCTIONS:
+            return [('func', word)]
+        return [('var', word)]
+
+    tokens = []
+    position = 0
+    while position < len(word):
+        for name in _KNOWN_NAMES:
+            if word.startswith(name, position):
+                break
+        else:
+            name = word[position]
+
+        position += len(name)
+        is_last = position == len(word)
+
+        if name in FUNCTIONS:
+            if not (is_last and followed_by_paren):
+                raise ExpressionSyntaxError(f"La función '{name}' requiere paréntesis")
+            tokens.append(('func', name))
+        elif name in CONSTANTS:
+            tokens.append(('const', name))
+        else:
+            tokens.append(('var', name))
+
+    # Una palabra larga seguida de paréntesis que no termina en función conocida
+    if followed_by_paren and len(word) > 1 and tokens[-1][0] != 'func':
+        raise ExpressionSyntaxError(f"Función no soportada: '{word}'")
+    return tokens
+
+
+def iter_tokens(text):
+    """
+    Genera los tokens (tipo, valor) de la entrada en una sola pasada.
+    Las llaves de LaTeX se emiten como paréntesis y \\frac{a}{b} como
+    ((a)/(b)), así que el parser no distingue LaTeX de texto plano.
+    """
+    position = 0
+    length = len(text)
+    # Por cada llave abierta: 'num'/'den' si es un grupo de \frac, None si no
+    braces = []
+    # Grupo de \frac que debe abrirse a continuación, o None
+    awaiting = None
+    while position < length:
+        match = _TOKEN_RE.match(text, position)
+        if match is None:
+            if text[position:].strip() == '':
+                break
+            raise ExpressionSyntaxError(f"Carácter no permitido: '{text[position:].strip()[0]}'")
+
+        number, word, operator, command = match.groups()
+        position = match.end()
+
+        if awaiting is not None and operator != '{':
+            raise ExpressionSyntaxError("\\frac requiere {numerador}{denominador}")
+
+        if number is not None:
+            if _SCIENTIFIC_RE.match(text, position):
+                raise ExpressionSyntaxError(
+                    f"Notación científica no soportada: escribe {number}*10^(...) en lugar de '{number}e...'"
+                )
+            yield 'num', number
+        elif word is not None:
+            followed_by_paren = _OPEN_PAREN_RE.match(text, position) is not None
+            yield from _split_name(word, followed_by_paren)
+        elif command is not None:
+            if command in _LATEX_FRACTIONS:
+                yield 'op', '('
+                awaiting = 'num'
+            elif command in _LATEX_COMMANDS:
+                token = _LATEX_COMMANDS[command]
+                if token is not None:
+                    yield token
+            else:
+                raise ExpressionSyntaxError(f"Comando LaTeX no soportado: '\\{command}'")
+        elif operator == '{':
+            braces.append(awaiting)
+            awaiting = None
+            yield 'op', '('
+        elif operator == '}':
+            if not braces:
+                raise ExpressionSyntaxError("Llave '}' sin abrir")
+            group = braces.pop()
+            yield 'op', ')'
+            if group == 'num':
+                yield 'op', '/'
+                awaiting = 'den'
+            elif group == 'den':
+                yield 'op', ')'
+        else:
+            yield 'op', _OPERATOR_ALIASES.get(operator, operator)
+
+    if awaiting is not None:
+        raise ExpressionSyntaxError("\\frac requiere {numerador}{denominador}")
+
+
+def tokenize(text):
+    """Divide la entrada en una lista de tokens (tipo, valor)"""
+    return list(iter_tokens(text))
+
+
+_ENDS_OPERAND = frozenset(['num', 'var', 'const', ')'])
+_STARTS_OPERAND = frozenset(['num', 'var', 'const', 'func', '('])
+_CANONICAL_TEXT = {'^': '**', 'π': 'pi'}
+
+
+def normalize_expression(text):
+    """
+    Forma canónica de la entrada: multiplicación implícita explícita
+    ('2x' -> '2*x', 'xsin(x)' -> 'x*sin(x)', '(x+1)(x-1)' -> '(x+1)*(x-1)'),
+    potencias con '**', símbolos unicode reemplazados y sin espacios.
+    """
+    parts = []
+    previous = None
+    for kind, value in iter_tokens(text):
+        # Los paréntesis se clasifican por su valor, el resto de operadores no
+        # participan en la multiplicación implícita
+        role = value if kind == 'op' else kind
+        if previous in _ENDS_OPERAND and role in _STARTS_OPERAND:
+            # Dos números seguidos ('2 3') no son un producto: se conserva
+            # el espacio para que el parser informe el error
+            parts.append(' ' if previous == role == 'num' else '*')
+        parts.append(_CANONICAL_TEXT.get(value, value))
+        previous = role
+    return ''.join(parts)
+
+
+def _check_power(base, exponent):
+    """Rechaza las potencias con exponente numérico que no se podrían calcular"""
+    if not exponent.is_Number:
+        return
+    if abs(exponent) > MAX_EXPONENT:
+        raise ExpressionSyntaxError(f'Exponente demasiado grande (máximo {MAX_EXPONENT})')
+    if base.is_Rational and exponent.is_Integer:
+        bits = max(int(base.p).bit_length(), int(base.q).bit_length())
+        if bits * abs(int(exponent)) > MAX_POWER_BITS:
+            raise ExpressionSyntaxError('El resultado de la potencia es demasiado grande')
+
+
+class _Parser:
+    """Parser descendente recursivo sobre la lista de tokens"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise ExpressionSyntaxError('La expresión está incompleta')
+        self.position += 1
+        return token
+
+    def accept(self, operator):
+        token = self.peek()
+        if token is not None and token == ('op', operator):
+            self.position += 1
+            return True
+        return False
+
+    def parse(self):
+        if not self.tokens:
+            raise ExpressionSyntaxError('La expresión está vacía')
+        result = self.expression()
+        token = self.peek()
+        if token is not None:
+            raise ExpressionSyntaxError(f"Símbolo inesperado: '{token[1]}'")
+        return result
+
+    def expression(self):
+        # Los sumandos se acumulan y se construye un único Add al final
+        terms = [self.term()]
+        while True:
+            if self.accept('+'):
+                terms.append(self.term())
+            elif self.accept('-'):
+                terms.append(-self.term())
+            else:
+                return terms[0] if len(terms) == 1 else sp.Add(*terms)
+
+    def starts_primary(self, token):
+        if token is None or (token[0] == 'op' and token[1] != '('):
+            return False
+        # Un número justo después de otro ('2 3', 'x^2 3') no se multiplica
+        # implícitamente; tras una variable o un paréntesis sí: 'x2y', '(x + 1)2'
+        return token[0] != 'num' or self.tokens[self.position - 1][0] != 'num'
+
+    def term(self):
+        # Igual que en las sumas: un único Mul con todos los factores
+        factors = [self.unary()]
+        while True:
+            if self.accept('*'):
+                factors.append(self.unary())
+            elif self.accept('/'):
+                factors.append(sp.Pow(self.unary(), -1))
+            elif self.starts_primary(self.peek()):
+                # Multiplicación implícita: 2x, 3(x + 1), (x + 1)(x - 1)
+                factors.append(self.power())
+            else:
+                return factors[0] if len(factors) == 1 else sp.Mul(*factors)
+
+    def unary(self):
+        if self.accept('-'):
+            return -self.unary()
+        if self.accept('+'):
+            return self.unary()
+        return self.power()
+
+    def power(self):
+        base = self.primary()
+        if self.accept('^'):
+            exponent = self.unary()
+            _check_power(base, exponent)
+            return base ** exponent
+        return base
+
+    def primary(self):
+        kind, value = self.next()
+
+        if kind == 'num':
+            if '.' in value:
+                return sp.Float(value)
+            return sp.Integer(int(value))
+        if kind == 'var':
+            return _symbol(value)
+        if kind == 'const':
+            return CONSTANTS[value]
+        if kind == 'func':
+            if not self.accept('('):
+                raise ExpressionSyntaxError(f"La función '{value}' requiere paréntesis")
+            argument = self.expression()
+            if not self.accept(')'):
+                raise ExpressionSyntaxError('Falta cerrar un paréntesis')
+            return FUNCTIONS[value](argument)
+        if value == '(':
+            inner = self.expression()
+            if not self.accept(')'):
+                raise ExpressionSyntaxError('Falta cerrar un paréntesis')
+            return inner
+        raise ExpressionSyntaxError(f"Símbolo inesperado: '{value}'")
+
+
+def parse_expression(text):
+    """Convierte una expresión (sin '=') en un árbol de SymPy"""
+    if '=' in text:
+        raise ExpressionSyntaxError("Se esperaba una expresión, no una ecuación")
+    return _Parser(tokenize(text)).parse()
+
+
+def parse_equation(text):
+    """Convierte 'izquierda = derecha' en el par de árboles de SymPy"""
+    parts = text.split('=')
+    if len(parts) != 2:
+        raise ExpressionSyntaxError("Una ecuación debe tener exactamente un signo '='")
+    return parse_expression(parts[0]), parse_expression(parts[1])
@@ -4,18 +4,20 @@ Funciones auxiliares para la aplicación MathEngine
 
 import streamlit as st
 import sympy as sp
-from sympy import latex, parse_expr, simplify
-from fractions import Fraction
+from sympy import latex
 import re
 import random
 
+from .equivalence import check_equivalence
+from .expression_parser import parse_expression
+
 def format_latex(expression):
     """Formatea una expresión para mostrar en LaTeX"""
     try:
         if isinstance(expression, str):
             # Intentar parsear como expresión SymPy
             try:
-                expr = parse_expr(expression)
+                expr = parse_expression(expression)
                 return latex(expr)
             except:
                 return expression
@@ -56,34 +58,8 @@ def check_mathematical_equivalence(user_answer, correct_answer):
         if user_clean == correct_clean:
             return True
         
-        # Intentar evaluación matemática con SymPy
-        try:
-            user_expr = parse_expr(user_answer)
-            correct_expr = parse_expr(correct_answer)
-            
-            # Verificar si son equivalentes
-            diff = simplify(user_expr - correct_expr)
-            return diff == 0
-        except:
-            pass
-        
-        # Comparación de fracciones
-        try:
-            user_frac = Fraction(user_answer)
-            correct_frac = Fraction(correct_answer)
-            return user_frac == correct_frac
-        except:
-            pass
-        
-        # Comparación numérica con tolerancia
-        try:
-            user_val = float(user_answer)
-            correct_val = float(correct_answer)
-            return abs(user_val - correct_val) < 1e-10
-        except:
-            pass
-        
-        return False
+        # Forma canónica, puntos de prueba y, solo si hace falta, simplify()
+        return check_equivalence(user_answer, correct_answer)['equivalent']
         
     except:
         return False
@@ -0,0 +1,136 @@
+"""
+Aritmética exacta con enteros de Python para los generadores de ejercicios
+Fracciones como pares (numerador, denominador), MCD/MCM, factorización
+y su formato en texto y LaTeX sin pasar por SymPy
+"""
+
+from math import gcd
+
+
+def lcm(a, b):
+    """Mínimo común múltiplo de dos enteros"""
+    return a * b // gcd(a, b)
+
+
+def gcd_many(numbers):
+    """MCD de una lista de enteros"""
+    result = 0
+    for number in numbers:
+        result = gcd(result, number)
+    return result
+
+
+def lcm_many(numbers):
+    """MCM de una lista de enteros"""
+    result = 1
+    for number in numbers:
+        result = lcm(result, number)
+    return result
+
+
+def reduce_fraction(numerator, denominator):
+    """Fracción irreducible con el signo en el numerador"""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    divisor = gcd(numerator, denominator)
+    return numerator // divisor, denominator // divisor
+
+
+def fraction_operation(frac1, frac2, operation):
+    """Aplica '+', '-', '*' o '/' a dos fracciones (p, q) y devuelve el resultado reducido"""
+    p1, q1 = frac1
+    p2, q2 = frac2
+    if operation == '+':
+        return reduce_fraction(p1 * q2 + p2 * q1, q1 * q2)
+    if operation == '-':
+        return reduce_fraction(p1 * q2 - p2 * q1, q1 * q2)
+    if operation == '*':
+        return reduce_fraction(p1 * p2, q1 * q2)
+    return reduce_fraction(p1 * q2, q1 * p2)
+
+
+def fraction_str(fraction):
+    """Texto de la fracción como lo escribe str(sympy.Rational): '7/12', '-1/6', '3'"""
+    numerator, denominator = fraction
+    if denominator == 1:
+        return str(numerator)
+    return f"{numerator}/{denominator}"
+
+
+def fraction_latex(fraction):
+    """LaTeX de la fracción como lo escribe sympy.latex: '\\frac{7}{12}', '- \\frac{1}{6}'"""
+    numerator, denominator = fraction
+    if denominator == 1:
+        return str(numerator)
+    if numerator < 0:
+        return f"- \\frac{{{-numerator}}}{{{denominator}}}"
+    return f"\\frac{{{numerator}}}{{{denominator}}}"
+
+
+# Mayor número que factorizan los generadores (factorización "hard": 200-500;
+# MCD/MCM llega a 100). Los números mayores usan división por tentativa.
+SIEVE_LIMIT = 500
+
+
+def _build_smallest_prime_factors(limit):
+    """Criba: para cada n <= limit, su menor factor primo"""
+    table = list(range(limit + 1))
+    for p in range(2, int(limit ** 0.5) + 1):
+        if table[p] == p:
+            for multiple in range(p * p, limit + 1, p):
+                if table[multiple] == multiple:
+                    table[multiple] = p
+    return table
+
+
+# Tabla compartida por la factorización, el MCD/MCM y los pasos de solución
+SMALLEST_PRIME_FACTOR = _build_smallest_prime_factors(SIEVE_LIMIT)
+
+
+def smallest_prime_factor(number):
+    """Menor factor primo de `number` (> 1), leído de la tabla cuando está en rango"""
+    if number <= SIEVE_LIMIT:
+        return SMALLEST_PRIME_FACTOR[number]
+    divisor = 2
+    while divisor * divisor <= number:
+        if number % divisor == 0:
+            return divisor
+        divisor += 1
+    return number
+
+
+def prime_factors(number):
+    """Factores primos con su exponente, en orden creciente: 360 -> {2: 3, 3: 2, 5: 1}"""
+    factors = {}
+    while number > 1:
+        p = smallest_prime_factor(number)
+        factors[p] = factors.get(p, 0) + 1
+        number //= p
+    return factors
+
+
+def division_steps(number):
+    """
+    Divisiones sucesivas por el menor factor primo: 12 -> [(12, 2, 6), (6, 2, 3)].
+    Cada primo se divide por completo y la cadena termina cuando lo que queda
+    es primo, igual que la división por tentativa que se muestra al estudiante.
+    """
+    steps = []
+    while number > 1:
+        p = smallest_prime_factor(number)
+        if p * p > number:
+            break
+        while number % p == 0:
+            steps.append((number, p, number // p))
+            number //= p
+    return steps
+
+
+def factorization_str(factors, separator):
+    """Une los factores primos con `separator`, escribiendo potencias con '^'"""
+    return separator.join(f"{p}^{e}" if e > 1 else str(p) for p, e in factors.items())
+
+
+def factorization_latex(factors):
+    """LaTeX de una factorización: 2^{3} \\times 3^{2} \\times 5"""
+    return " \\times ".join(f"{p}^{{{e}}}" if e > 1 else str(p) for p, e in factors.items())
@@ -0,0 +1,269 @@
+"""
+Polinomios en una variable con coeficientes enteros
+Los coeficientes van en orden creciente de grado: [c0, c1, c2] = c0 + c1 x + c2 x^2
+Formato LaTeX idéntico al de sympy.latex para no depender de SymPy al generar ejercicios
+"""
+
+from math import gcd
+
+
+def _monomial_body(coefficient, power, variable):
+    """Término sin signo: '3 x^{2}', 'x', '5'"""
+    if power == 0:
+        return str(coefficient)
+    literal = variable if power == 1 else f"{variable}^{{{power}}}"
+    if coefficient == 1:
+        return literal
+    return f"{coefficient} {literal}"
+
+
+def polynomial_latex(coefficients, variable='x'):
+    """
+    LaTeX de un polinomio dado por sus coeficientes en orden creciente de
+    grado: [-1, 3, -1] -> '- x^{2} + 3 x - 1'
+    """
+    terms = [(power, coefficient) for power, coefficient in enumerate(coefficients) if coefficient]
+    if not terms:
+        return '0'
+    if len(terms) == 1 and terms[0][0] == 0:
+        # Un entero solo se escribe sin espacio tras el signo: '-3'
+        return str(terms[0][1])
+    terms.reverse()
+
+    # SymPy escribe 'constante positiva - término' en ese orden: '9 - 4 x^{2}'
+    if len(terms) == 2 and terms[1][0] == 0 and terms[1][1] > 0 and terms[0][1] < 0:
+        terms.reverse()
+
+    parts = []
+    for power, coefficient in terms:
+        body = _monomial_body(abs(coefficient), power, variable)
+        if not parts:
+            parts.append(f"- {body}" if coefficient < 0 else body)
+        else:
+            parts.append(f"{'-' if coefficient < 0 else '+'} {body}")
+    return ' '.join(parts)
+
+
+def monomial_latex(coefficient, power, variable='x'):
+    """LaTeX de coefficient·x^power: '- 3 x^{2}'"""
+    return polynomial_latex([0] * power + [coefficient], variable)
+
+
+def rational_monomial_latex(fraction, power, variable='x'):
+    """LaTeX de (p/q)·x^power como lo escribe SymPy: '- \\frac{3 x^{2}}{2}'"""
+    numerator, denominator = fraction
+    if denominator == 1:
+        return monomial_latex(numerator, power, variable)
+    sign = '- ' if numerator < 0 else ''
+    body = _monomial_body(abs(numerator), power, variable)
+    return f"{sign}\\frac{{{body}}}{{{denominator}}}"
+
+
+def _divisors(number):
+    """Divisores positivos de |number| (number != 0)"""
+    number = abs(number)
+    small, large = [], []
+    divisor = 1
+    while divisor * divisor <= number:
+        if number % divisor == 0:
+            small.append(divisor)
+            if divisor * divisor != number:
+                large.append(number // divisor)
+        divisor += 1
+    return small + large[::-1]
+
+
+class Polynomial:
+    """
+    Polinomio denso en una variable con coeficientes enteros, inmutable.
+    `coefficients` es una tupla en orden creciente de grado sin ceros
+    sobrantes en los grados altos.
+    """
+
+    __slots__ = ('coefficients',)
+
+    def __init__(self, coefficients):
+        coefficients = tuple(coefficients)
+        end = len(coefficients)
+        while end > 1 and coefficients[end - 1] == 0:
+            end -= 1
+        self.coefficients = coefficients[:end] or (0,)
+
+    @property
+    def degree(self):
+        return len(self.coefficients) - 1
+
+    @property
+    def leading(self):
+        return self.coefficients[-1]
+
+    def __add__(self, other):
+        if isinstance(other, int):
+            other = Polynomial((other,))
+        first, second = self.coefficients, other.coefficients
+        if len(first) < len(second):
+            first, second = second, first
+        return Polynomial(a + b for a, b in zip(first, second + (0,) * (len(first) - len(second))))
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return Polynomial(-a for a in self.coefficients)
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        if isinstance(other, int):
+            return Polynomial(a * other for a in self.coefficients)
+        result = [0] * (len(self.coefficients) + len(other.coefficients) - 1)
+        for i, a in enumerate(self.coefficients):
+            if a:
+                for j, b in enumerate(other.coefficients):
+                    result[i + j] += a * b
+        return Polynomial(result)
+
+    __rmul__ = __mul__
+
+    def __pow__(self, exponent):
+        result = Polynomial((1,))
+        base = self
+        while exponent:
+            if exponent & 1:
+                result = result * base
+            base = base * base
+            exponent >>= 1
+        return result
+
+    def __eq__(self, other):
+        return isinstance(other, Polynomial) and self.coefficients == other.coefficients
+
+    def __hash__(self):
+        return hash(self.coefficients)
+
+    def __repr__(self):
+        return f"Polynomial({list(self.coefficients)})"
+
+    def latex(self, variable='x'):
+        """LaTeX del polinomio en el formato de sympy.latex"""
+        return polynomial_latex(self.coefficients, variable)
+
+    def content(self):
+        """MCD de los coeficientes, con el signo del coeficiente principal"""
+        result = 0
+        for coefficient in self.coefficients:
+            result = gcd(result, coefficient)
+        if result and self.leading < 0:
+            result = -result
+        return result or 1
+
+    def _divide_by_linear(self, numerator, denominator):
+        """Cociente exacto entre (denominator·x - numerator), o None si no divide"""
+        quotient = [0] * self.degree
+        carry = 0
+        # De mayor a menor grado: a_k = denominator·q_{k-1} - numerator·q_k
+        for k in range(self.degree, 0, -1):
+            value = self.coefficients[k] + numerator * carry
+            if value % denominator:
+                return None
+            carry = quotient[k - 1] = value // denominator
+        if self.coefficients[0] + numerator * carry != 0:
+            return None
+        return Polynomial(quotient)
+
+    def _rational_root(self):
+        """Primera raíz racional p/q como (p, q, cociente), o None"""
+        for denominator in _divisors(self.leading):
+            for numerator in _divisors(self.coefficients[0]):
+                for candidate in (numerator, -numerator):
+                    if gcd(candidate, denominator) != 1:
+                        continue
+                    quotient = self._divide_by_linear(candidate, denominator)
+                    if quotient is not None:
+                        return candidate, denominator, quotient
+        return None
+
+    def factor(self):
+        """
+        Factoriza sobre los enteros: contenido, potencia de x y factores
+        lineales de raíces racionales (trinomios, cuadrados perfectos,
+        diferencias de cuadrados). Lo que no tenga raíces racionales queda
+        como un único factor.
+        """
+        content = self.content()
+        remaining = Polynomial(a // content for a in self.coefficients)
+
+        # Factor x^k
+        power = 0
+        while remaining.degree > 0 and remaining.coefficients[0] == 0:
+            remaining = Polynomial(remaining.coefficients[1:])
+            power += 1
+
+        linear = []
+        while remaining.degree > 0:
+            root = remaining._rational_root()
+            if root is None:
+                break
+            numerator, denominator, remaining = root
+            linear.append(Polynomial((-numerator, denominator)))
+
+        if remaining.leading < 0:
+            # Queda -1 por normalizar los factores lineales con coeficiente positivo
+            content, remaining = -content, -remaining
+        if remaining.degree > 0:
+            linear.append(remaining)
+        elif remaining.coefficients[0] != 1:
+            content *= remaining.coefficients[0]
+
+        factors = {}
+        for factor_polynomial in linear:
+            factors[factor_polynomial] = factors.get(factor_polynomial, 0) + 1
+        return Factorization(content, power, sorted(factors.items(), key=_factor_order))
+
+
+def _factor_order(item):
+    # Orden de los factores como lo imprime SymPy: grado, coeficiente principal y término independiente
+    polynomial, _ = item
+    return polynomial.degree, polynomial.leading, polynomial.coefficients[0]
+
+
+class Factorization:
+    """Resultado de Polynomial.factor: contenido · x^power · Π factor^multiplicidad"""
+
+    __slots__ = ('content', 'power', 'factors')
+
+    def __init__(self, content, power, factors):
+        self.content = content
+        self.power = power
+        self.factors = factors
+
+    def expand(self):
+        """Vuelve a multiplicar los factores"""
+        result = Polynomial((self.content,)) * Polynomial((0,) * self.power + (1,))
+        for polynomial, multiplicity in self.factors:
+            result = result * polynomial ** multiplicity
+        return result
+
+    def latex(self, variable='x'):
+        """LaTeX de la factorización en el formato de sympy.latex(factor(...))"""
+        if not self.power and self.content in (1, -1) and len(self.factors) == 1 and self.factors[0][1] == 1:
+            # Un único factor sin coeficiente se escribe sin paréntesis: '3 - 2 x'
+            return (self.factors[0][0] * self.content).latex(variable)
+
+        parts = []
+        if self.power:
+            parts.append(monomial_latex(1, self.power, variable))
+        for polynomial, multiplicity in self.factors:
+            body = f"\\left({polynomial.latex(variable)}\\right)"
+            parts.append(f"{body}^{{{multiplicity}}}" if multiplicity > 1 else body)
+
+        if not parts:
+            return str(self.content)
+        if self.content == -1:
+            parts.insert(0, '-')
+        elif self.content != 1:
+            parts.insert(0, f"- {-self.content}" if self.content < 0 else str(self.content))
+        return ' '.join(parts)
@@ -0,0 +1,266 @@
+"""
+Pasos de solución bajo demanda
+Los generadores guardan en cada ejercicio una receta liviana ('kind' y los
+valores que hacen falta) en lugar de la lista de pasos ya formateada. Los
+textos y el LaTeX se arman solo cuando alguien abre la solución, y quedan en
+caché por receta.
+"""
+
+import json
+
+from .cache import LRUCache
+from .int_math import (
+    division_steps, factorization_str, fraction_latex, fraction_operation,
+    fraction_str, lcm, prime_factors, reduce_fraction
+)
+from .polynomial import monomial_latex, rational_monomial_latex
+
+# Soluciones ya armadas, por receta
+STEPS_CACHE_SIZE = 2048
+
+_steps_cache = LRUCache(maxsize=STEPS_CACHE_SIZE)
+
+
+def step_recipe(kind, *args):
+    """Receta de los pasos: tipo y argumentos, serializable como JSON"""
+    return {'kind': kind, 'args': list(args)}
+
+
+def _fraction_steps(frac1, frac2, operation):
+    """Pasos detallados para operaciones con fracciones"""
+    steps = []
+    (p1, q1), (p2, q2) = frac1, frac2
+
+    if operation in ['+', '-']:
+        # Para suma y resta, mostrar proceso de denominador común
+        if q1 != q2:  # Denominadores diferentes
+            common_den = lcm(q1, q2)
+            new_num1 = p1 * (common_den // q1)
+            new_num2 = p2 * (common_den // q2)
+
+            steps.append(f"Denominador común: MCM({q1}, {q2}) = {common_den}")
+            steps.append(f"Convertir fracciones: $\\frac{{{new_num1}}}{{{common_den}}}$ y $\\frac{{{new_num2}}}{{{common_den}}}$")
+
+            if operation == '+':
+                steps.append(f"Sumar numeradores: $\\frac{{{new_num1} + {new_num2}}}{{{common_den}}} = \\frac{{{new_num1 + new_num2}}}{{{common_den}}}$")
+            else:
+                steps.append(f"Restar numeradores: $\\frac{{{new_num1} - {new_num2}}}{{{common_den}}} = \\frac{{{new_num1 - new_num2}}}{{{common_den}}}$")
+
+    elif operation == '*':
+        steps.append(f"Multiplicar numeradores y denominadores")
+        steps.append(f"$\\frac{{{p1} \\times {p2}}}{{{q1} \\times {q2}}} = \\frac{{{p1 * p2}}}{{{q1 * q2}}}$")
+
+    else:  # division
+        steps.append(f"Multiplicar por el recíproco")
+        steps.append(f"$\\frac{{{p1}}}{{{q1}}} \\times \\frac{{{q2}}}{{{p2}}} = \\frac{{{p1 * q2}}}{{{q1 * p2}}}$")
+
+    return steps
+
+
+def _order_of_operations_steps():
+    """Pasos para operaciones combinadas"""
+    # Esta es una implementación simplificada
+    # En una versión completa, se analizaría la expresión paso a paso
+    return [
+        "Aplicar jerarquía de operaciones (PEMDAS)",
+        "Resolver paréntesis primero",
+        "Calcular exponentes",
+        "Realizar multiplicaciones y divisiones",
+        "Realizar sumas y restas"
+    ]
+
+
+def _mcm_mcd_steps(numbers):
+    """Pasos para calcular MCM y MCD"""
+    steps = []
+
+    # Factorización de cada número
+    for num in numbers:
+        steps.append(f"{num} = {factorization_str(prime_factors(num), ' × ')}")
+
+    steps.append("MCD: tomar factores comunes con menor exponente")
+    steps.append("MCM: tomar todos los factores con mayor exponente")
+
+    return steps
+
+
+def _prime_division_steps(number):
+    """Pasos para factorización prima"""
+    # Divisiones sucesivas leídas de la tabla de menores factores primos
+    return [f"{dividend} ÷ {divisor} = {quotient}" for dividend, divisor, quotient in division_steps(number)]
+
+
+def _farmer_steps(total_animals, num1, den1, num2, den2):
+    sold1, sold2 = total_animals * num1 // den1, total_animals * num2 // den2
+    total_sold = fraction_operation((num1, den1), (num2, den2), '+')
+    animals_sold = total_animals * total_sold[0] // total_sold[1]
+    return [
+        f"Total de vacas: {total_animals}",
+        f"Vendidas el lunes: $\\frac{{{num1}}}{{{den1}}} \\times {total_animals} = {sold1}$",
+        f"Vendidas el martes: $\\frac{{{num2}}}{{{den2}}} \\times {total_animals} = {sold2}$",
+        f"Total vendidas: {animals_sold}",
+        f"Vacas restantes: {total_animals} - {animals_sold} = {total_animals - animals_sold}"
+    ]
+
+
+def _recipe_steps(original_servings, new_servings, num, den):
+    ratio = reduce_fraction(new_servings, original_servings)
+    new_amount = fraction_operation((num, den), ratio, '*')
+    return [
+        f"Receta original: {original_servings} personas, $\\frac{{{num}}}{{{den}}}$ tazas",
+        f"Nueva receta: {new_servings} personas",
+        f"Proporción: $\\frac{{{new_servings}}}{{{original_servings}}} = {fraction_latex(ratio)}$",
+        f"Nueva cantidad: $\\frac{{{num}}}{{{den}}} \\times {fraction_latex(ratio)} = {fraction_latex(new_amount)}$"
+    ]
+
+
+def _money_steps(initial_money, spent1, earned, spent2):
+    final_money = initial_money - spent1 + earned - spent2
+    return [
+        f"Dinero inicial: $\\${initial_money}$",
+        f"Después del almuerzo: $\\${initial_money} - \\${spent1} = \\${initial_money - spent1}$",
+        f"Después del trabajo: $\\${initial_money - spent1} + \\${earned} = \\${initial_money - spent1 + earned}$",
+        f"Después del transporte: $\\${initial_money - spent1 + earned} - \\${spent2} = \\${final_money}$"
+    ]
+
+
+def _time_steps(total_hours, activity, num, den):
+    time_spent = reduce_fraction(num * total_hours, den)
+    return [
+        f"Total de horas: {total_hours}",
+        f"Fracción del tiempo {activity}: $\\frac{{{num}}}{{{den}}}$",
+        f"Horas {activity}: $\\frac{{{num}}}{{{den}}} \\times {total_hours} = {fraction_latex(time_spent)}$"
+    ]
+
+
+def _monomial_steps(operation, coef1, exp1, coef2, exp2, add):
+    """Pasos de monomios; en la división ya vienen ordenados por exponente"""
+    if operation == 'multiply':
+        return [
+            f"Multiplicar coeficientes: ${coef1} \\times {coef2} = {coef1 * coef2}$",
+            f"Sumar exponentes: $x^{{{exp1}}} \\times x^{{{exp2}}} = x^{{{exp1 + exp2}}}$",
+            f"Resultado: ${monomial_latex(coef1 * coef2, exp1 + exp2)}$"
+        ]
+
+    if operation == 'divide':
+        quotient = reduce_fraction(coef1, coef2)
+        return [
+            f"Dividir coeficientes: $\\frac{{{coef1}}}{{{coef2}}} = {fraction_str(quotient)}$",
+            f"Restar exponentes: $\\frac{{x^{{{exp1}}}}}{{x^{{{exp2}}}}} = x^{{{exp1 - exp2}}}$",
+            f"Resultado: ${rational_monomial_latex(quotient, exp1 - exp2)}$"
+        ]
+
+    total = coef1 + coef2 if add else coef1 - coef2
+    return [
+        f"Los monomios son semejantes (misma parte literal: $x^{{{exp1}}}$)",
+        f"{'Sumar' if add else 'Restar'} coeficientes: ${coef1} {'+' if add else '-'} {coef2} = {total}$",
+        f"Resultado: ${monomial_latex(total, exp1)}$"
+    ]
+
+
+def _polynomial_steps(operation, result_latex):
+    if operation == 'add':
+        steps = ["Agrupar términos semejantes"]
+    elif operation == 'subtract':
+        steps = ["Cambiar signos del segundo polinomio", "Agrupar términos semejantes"]
+    else:  # multiply
+        steps = [
+            "Aplicar propiedad distributiva",
+            "Multiplicar cada término del primer polinomio por cada término del segundo",
+            "Agrupar términos semejantes"
+        ]
+    return steps + [f"Resultado: ${result_latex}$"]
+
+
+NOTABLE_PRODUCT_FORMULAS = {
+    'square_sum': "(a + b)^2 = a^2 + 2ab + b^2",
+    'square_diff': "(a - b)^2 = a^2 - 2ab + b^2",
+    'diff_squares': "(a + b)(a - b) = a^2 - b^2",
+    'cube_sum': "(a + b)^3 = a^3 + 3a^2b + 3ab^2 + b^3",
+    'cube_diff': "(a - b)^3 = a^3 - 3a^2b + 3ab^2 - b^3"
+}
+
+
+def _notable_product_steps(product_type, a, b, result_latex):
+    return [
+        f"Aplicar la fórmula: ${NOTABLE_PRODUCT_FORMULAS[product_type]}$",
+        f"Sustituir valores: $a = {a}x$, $b = {b}$",
+        f"Resultado: ${result_latex}$"
+    ]
+
+
+def _polynomial_factorization_steps(fact_type, values, factored):
+    """`values`: factor común, (a, b) de los binomios o (b, c, p, q) del trinomio"""
+    if fact_type == 'common_factor':
+        common, = values
+        return [
+            f"Identificar factor común: ${common}x$",
+            f"Extraer factor común: ${factored}$"
+        ]
+
+    if fact_type == 'perfect_square':
+        a, b = values
+        return [
+            "Reconocer trinomio cuadrado perfecto: $a^2 + 2ab + b^2 = (a + b)^2$",
+            f"Identificar: $a = {a}x$, $b = {b}$",
+            f"Factorizar: ${factored}$"
+        ]
+
+    if fact_type == 'diff_squares':
+        a, b = values
+        return [
+            "Reconocer diferencia de cuadrados: $a^2 - b^2 = (a + b)(a - b)$",
+            f"Identificar: $a = {a}x$, $b = {b}$",
+            f"Factorizar: ${factored}$"
+        ]
+
+    # trinomial
+    b, c, p, q = values
+    return [
+        f"Buscar dos números que sumados den ${b}$ y multiplicados den ${c}$",
+        f"Los números son ${p}$ y ${q}$",
+        f"Factorizar: ${factored}$"
+    ]
+
+
+RECIPES = {
+    'fraction': _fraction_steps,
+    'order_of_operations': _order_of_operations_steps,
+    'mcm_mcd': _mcm_mcd_steps,
+    'prime_division': _prime_division_steps,
+    'farmer': _farmer_steps,
+    'recipe': _recipe_steps,
+    'money': _money_steps,
+    'time': _time_steps,
+    'monomial': _monomial_steps,
+    'polynomial': _polynomial_steps,
+    'notable_product': _notable_product_steps,
+    'polynomial_factorization': _polynomial_factorization_steps
+}
+
+
+def render_steps(recipe):
+    """Arma los pasos de una receta (una vez por receta distinta)"""
+    key = json.dumps(recipe, sort_keys=True, ensure_ascii=False)
+    steps = _steps_cache.get(key)
+    if steps is None:
+        steps = tuple(RECIPES[recipe['kind']](*recipe['args']))
+        _steps_cache.set(key, steps)
+    return list(steps)
+
+
+def solution_steps(exercise):
+    """
+    Pasos de solución del ejercicio. Los ejercicios escritos a mano (y los
+    guardados antes de las recetas) ya traen la lista en 'solution_steps'.
+    """
+    steps = exercise.get('solution_steps')
+    if steps is not None:
+        return list(steps)
+    recipe = exercise.get('solution_recipe')
+    return render_steps(recipe) if recipe else []
+
+
+def get_steps_cache_stats():
+    """Contadores de la caché de pasos armados"""
+    return _steps_cache.stats()
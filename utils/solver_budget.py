@@ -0,0 +1,232 @@
+"""
+Presupuestos de tiempo y memoria para el solver
+Ejecuta la resolución en un proceso aparte que puede cancelarse o terminarse
+"""
+
+import multiprocessing
+import os
+
+try:
+    import resource
+except ImportError:  # Windows: sin límites de memoria por proceso
+    resource = None
+
+
+class BudgetExceeded(Exception):
+    """Se lanza cuando un paso supera su presupuesto de tiempo o memoria"""
+
+    def __init__(self, reason='time'):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class SolverBudget:
+    """Límites por paso: tiempo de pared y memoria pico adicional"""
+
+    def __init__(self, step_seconds=2.0, memory_mb=256, grace_seconds=0.25):
+        self.step_seconds = step_seconds
+        self.memory_mb = memory_mb
+        # Margen para que el proceso atienda la cancelación antes de terminarlo
+        self.grace_seconds = grace_seconds
+
+
+BUDGET_MESSAGES = {
+    'time': 'Se excedió el tiempo límite para un paso de la solución',
+    'memory': 'Se excedió el límite de memoria para un paso de la solución',
+    'crashed': 'El proceso de resolución terminó inesperadamente'
+}
+
+
+def _current_address_space():
+    """Tamaño actual del espacio de direcciones del proceso en bytes (Linux)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[0])
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _limit_memory(memory_mb):
+    """Fija el límite blando de memoria en el uso actual más el presupuesto del paso"""
+    if resource is None or not memory_mb:
+        return
+    current = _current_address_space()
+    if current is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = current + memory_mb * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _release_memory_limit():
+    """Restaura el límite blando de memoria al máximo permitido"""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (hard, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def run_solution_events(conn, cleaned_expr, cancel_event, memory_mb):
+    """
+    Resuelve una expresión dentro del proceso trabajador y envía cada
+    evento por `conn` en cuanto está disponible
+    """
+    from .solver_engine import MathSolver
+
+    def checkpoint():
+        if cancel_event.is_set():
+            raise BudgetExceeded('time')
+        _limit_memory(memory_mb)
+
+    solver = MathSolver(use_cache=False)
+    try:
+        for event in solver._iter_solution(cleaned_expr, checkpoint):
+            conn.send(event)
+    except BudgetExceeded as exceeded:
+        conn.send(('budget', exceeded.reason))
+    except MemoryError:
+        conn.send(('budget', 'memory'))
+    finally:
+        _release_memory_limit()
+
+
+def run_grading(conn, user_answer, exercise, memory_mb):
+    """Corrige una respuesta dentro del proceso trabajador y envía el veredicto"""
+    from .equivalence import check_exercise_answer
+
+    _limit_memory(memory_mb)
+    try:
+        verdict = check_exercise_answer(user_answer, exercise)
+    except MemoryError:
+        conn.send(('budget', 'memory'))
+        return
+    except Exception:
+        verdict = {'equivalent': False, 'tier': 'error'}
+    finally:
+        _release_memory_limit()
+    conn.send(('done', verdict))
+
+
+def budget_worker_main(conn, cancel_event, memory_mb):
+    """
+    Bucle del proceso trabajador hasta recibir None: una cadena es una
+    expresión a resolver y ('grade', respuesta, ejercicio) una corrección
+    """
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        if isinstance(message, tuple):
+            _, user_answer, exercise = message
+            run_grading(conn, user_answer, exercise, memory_mb)
+        else:
+            run_solution_events(conn, message, cancel_event, memory_mb)
+
+
+def partial_result(original, steps, reason):
+    """Construye el resultado parcial cuando se agota el presupuesto"""
+    if original is None:
+        return {
+            'success': False,
+            'error': BUDGET_MESSAGES.get(reason, BUDGET_MESSAGES['time']),
+            'budget_exceeded': True,
+            'budget_reason': reason
+        }
+    return {
+        'success': True,
+        'original': original,
+        'steps': steps,
+        'result': steps[-1]['expression'] if steps else original,
+        'budget_exceeded': True,
+        'budget_reason': reason,
+        'warning': BUDGET_MESSAGES.get(reason, BUDGET_MESSAGES['time'])
+    }
+
+
+def collect_events(conn, process, cancel_event, budget, on_event=None):
+    """
+    Lee los eventos del trabajador aplicando el presupuesto de tiempo por
+    paso. Devuelve (resultado, terminado) donde `terminado` indica que el
+    proceso tuvo que ser eliminado y no puede reutilizarse.
+    `on_event` recibe cada evento 'original' y 'step' apenas llega.
+    """
+    original = None
+    steps = []
+    deadline_hit = False
+
+    while True:
+        timeout = budget.grace_seconds if deadline_hit else budget.step_seconds
+        try:
+            ready = conn.poll(timeout)
+        except (EOFError, OSError):
+            return partial_result(original, steps, 'crashed'), True
+
+        if not ready:
+            if deadline_hit:
+                # No atendió la cancelación cooperativa: se termina el proceso
+                process.kill()
+                process.join()
+                return partial_result(original, steps, 'time'), True
+            cancel_event.set()
+            deadline_hit = True
+            continue
+
+        try:
+            kind, payload = conn.recv()
+        except (EOFError, OSError):
+            return partial_result(original, steps, 'crashed'), True
+
+        if on_event is not None and kind in ('original', 'step'):
+            on_event((kind, payload))
+
+        if kind == 'original':
+            original = payload
+        elif kind == 'step':
+            steps.append(payload)
+        elif kind == 'done':
+            return payload, False
+        elif kind == 'budget':
+            return partial_result(original, steps, payload), False
+
+
+def solve_with_budget(cleaned_expr, budget, on_event=None):
+    """
+    Resuelve una expresión limpia en un proceso desechable sujeto a `budget`.
+    `on_event` recibe los pasos a medida que el proceso los calcula.
+    """
+    context = multiprocessing.get_context()
+    parent_conn, child_conn = context.Pipe()
+    cancel_event = context.Event()
+    process = context.Process(
+        target=budget_worker_main,
+        args=(child_conn, cancel_event, budget.memory_mb),
+        daemon=True
+    )
+    process.start()
+    child_conn.close()
+
+    try:
+        parent_conn.send(cleaned_expr)
+        parent_conn.send(None)
+        result, killed = collect_events(parent_conn, process, cancel_event, budget, on_event)
+    finally:
+        parent_conn.close()
+
+    if not killed:
+        process.join(budget.grace_seconds)
+        if process.is_alive():
+            process.kill()
+            process.join()
+    return result
@@ -4,17 +4,112 @@ Migrado y adaptado desde el proyecto Django original
 """
 
 import sympy as sp
-from sympy import latex, parse_expr, simplify, factor, solve, expand, collect
-from sympy.parsing.sympy_parser import parse_expr
+from sympy import latex, simplify, factor, solve, expand, collect
+from sympy import cancel, count_ops, nsimplify, together
+import asyncio
+import copy
+import queue
 import re
+import threading
+import time
+from concurrent.futures import Future
+
+from .cache import LRUCache
+from .expression_parser import ExpressionSyntaxError, normalize_expression, parse_equation, parse_expression
+from .solver_budget import BudgetExceeded, SolverBudget, solve_with_budget
+
+# Caché de resultados compartida por todas las instancias del proceso
+RESULT_CACHE_SIZE = 2048
+RESULT_CACHE_TTL = 60 * 60  # segundos
+
+_result_cache = LRUCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+
+# Configuración del solver compartido por Django y Streamlit
+SOLVER_CONFIG = {
+    'use_pool': True,       # False: cada resolución usa un proceso desechable
+    'workers': None,        # None: núcleos disponibles menos uno
+    'max_pending': 64,
+    'step_seconds': 2.0,
+    'memory_mb': 256
+}
+
+_shared_solver = None
+_shared_solver_lock = threading.Lock()
+
+# Cuántas veces cada nivel de simplificación resolvió una expresión
+SIMPLIFY_TIERS = ('constant', 'numeric', 'polynomial', 'rational', 'simplify')
+SIMPLIFY_RATIO = 1.7  # el mismo margen que usa sympy.simplify por defecto
+_simplify_tier_counts = dict.fromkeys(SIMPLIFY_TIERS, 0)
+_simplify_tier_lock = threading.Lock()
+
+
+def get_cache_stats():
+    """Devuelve los contadores (aciertos, fallos, desalojos) de la caché de resultados"""
+    return _result_cache.stats()
+
+
+def clear_cache():
+    """Vacía la caché de resultados del solver"""
+    _result_cache.clear()
+
+
+def get_simplify_stats():
+    """Devuelve cuántas resoluciones cerró cada nivel de simplificación"""
+    with _simplify_tier_lock:
+        return dict(_simplify_tier_counts)
+
+
+def _record_simplify_tier(tier):
+    with _simplify_tier_lock:
+        if tier in _simplify_tier_counts:
+            _simplify_tier_counts[tier] += 1
+
+
+def get_shared_solver():
+    """
+    Devuelve la instancia de MathSolver compartida por todo el proceso.
+    Se crea en el primer uso para no iniciar trabajadores al importar.
+    """
+    global _shared_solver
+    if _shared_solver is None:
+        with _shared_solver_lock:
+            if _shared_solver is None:
+                budget = SolverBudget(
+                    step_seconds=SOLVER_CONFIG['step_seconds'],
+                    memory_mb=SOLVER_CONFIG['memory_mb']
+                )
+                if SOLVER_CONFIG['use_pool']:
+                    from .solver_pool import SolverPool
+                    pool = SolverPool(
+                        workers=SOLVER_CONFIG['workers'],
+                        max_pending=SOLVER_CONFIG['max_pending'],
+                        budget=budget
+                    )
+                    _shared_solver = MathSolver(pool=pool)
+                else:
+                    _shared_solver = MathSolver(budget=budget)
+    return _shared_solver
+
+
+def _no_checkpoint():
+    """Punto de control vacío para la resolución sin presupuesto"""
+
 
 class MathSolver:
     """Clase principal para resolver expresiones matemáticas"""
     
-    def __init__(self):
+    # Evaluar directamente las expresiones sin variables
+    numeric_fast_path = True
+    
+    def __init__(self, use_cache=True, budget=None, pool=None):
         self.x = sp.Symbol('x')
         self.y = sp.Symbol('y')
         self.z = sp.Symbol('z')
+        self.use_cache = use_cache
+        # Con un SolverBudget la resolución corre en un proceso que puede terminarse
+        self.budget = budget
+        # Con un SolverPool la resolución se delega a trabajadores pre-iniciados
+        self.pool = pool
     
     def solve_expression(self, expression_str):
         """
@@ -27,76 +122,329 @@ class MathSolver:
             # Limpiar y preparar la expresión
             cleaned_expr = self._clean_expression(expression_str)
             
-            # Intentar parsear la expresión
+            # Consultar la caché con la forma canónica de la entrada
+            cache_key = self._cache_key(cleaned_expr)
+            cached = self._cached_result(cache_key)
+            if cached is not None:
+                return cached
+            
+            # Resolver en el pool, en un proceso aislado o en este mismo hilo
             try:
-                if '=' in cleaned_expr:
+                if self.pool is not None:
+                    # Resolver en el pool de trabajadores (espera turno si está lleno)
+                    result = self.pool.solve(cleaned_expr)
+                elif self.budget is not None:
+                    # Resolver en un proceso aparte con límites de tiempo y memoria
+                    result = solve_with_budget(cleaned_expr, self.budget)
+                elif '=' in cleaned_expr:
                     # Es una ecuación
-                    return self._solve_equation(cleaned_expr)
+                    result = self._solve_equation(cleaned_expr)
                 else:
                     # Es una expresión
-                    return self._solve_expression(cleaned_expr)
-            except Exception as parse_error:
-                return {'success': False, 'error': f'Expresión matemática inválida: {str(parse_error)}'}
+                    result = self._solve_expression(cleaned_expr)
+            except Exception as e:
+                # El solver informa los errores de la expresión en el resultado; una
+                # excepción aquí es un fallo del pool o del proceso aislado (trabajador
+                # caído, tubería cerrada) y no se guarda en caché
+                return {'success': False, 'error': f'Error procesando la expresión: {str(e)}'}
+            
+            self._store_result(cache_key, result)
+            return result
                 
         except Exception as e:
             return {'success': False, 'error': f'Error procesando la expresión: {str(e)}'}
     
-    def _clean_expression(self, expr_str):
-        """Limpia y normaliza la expresión de entrada"""
-        # Reemplazar símbolos comunes
-        expr_str = expr_str.replace('^', '**')
-        expr_str = expr_str.replace('÷', '/')
-        expr_str = expr_str.replace('×', '*')
+    def iter_solve(self, expression_str):
+        """
+        Versión en streaming de solve_expression: genera eventos (tipo, contenido)
+        en cuanto se calculan. 'original' trae el LaTeX de la entrada, cada
+        'step' un paso y el 'done' final el mismo resultado que devolvería
+        solve_expression. Los resultados en caché se reproducen de inmediato.
+        """
+        if not expression_str:
+            yield 'done', {'success': False, 'error': 'No se proporcionó expresión'}
+            return
+        
+        cleaned_expr = self._clean_expression(expression_str)
+        cache_key = self._cache_key(cleaned_expr)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            yield from self._replay_events(cached)
+            return
         
-        # Agregar multiplicación implícita
-        expr_str = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', expr_str)
-        expr_str = re.sub(r'([a-zA-Z])(\d)', r'\1*\2', expr_str)
-        expr_str = re.sub(r'\)(\d)', r')*\1', expr_str)
-        expr_str = re.sub(r'(\d)\(', r'\1*(', expr_str)
+        if self.pool is not None or self.budget is not None:
+            events = self._iter_isolated_events(cleaned_expr)
+        else:
+            events = self._iter_solution(cleaned_expr)
         
-        return expr_str
+        result = None
+        try:
+            for kind, payload in events:
+                if kind == 'done':
+                    result = payload
+                else:
+                    yield kind, payload
+        except Exception as e:
+            # Fallo del pool o del proceso aislado: se informa sin guardarlo en caché
+            yield 'done', {'success': False, 'error': f'Error procesando la expresión: {str(e)}'}
+            return
+        
+        if result is None:
+            result = {'success': False, 'error': 'El solver terminó sin producir un resultado'}
+        self._store_result(cache_key, result)
+        yield 'done', result
+    
+    def _replay_events(self, result):
+        """Eventos equivalentes a un resultado ya calculado"""
+        if 'original' in result:
+            yield 'original', result['original']
+        for step in result.get('steps', []):
+            yield 'step', step
+        yield 'done', result
+    
+    def _iter_isolated_events(self, cleaned_expr):
+        """
+        Eventos de la resolución en el pool o en un proceso con presupuesto,
+        reenviados desde el hilo que lee al trabajador a medida que llegan
+        """
+        events = queue.Queue()
+        if self.pool is not None:
+            future = self.pool.submit(cleaned_expr, block=True, on_event=events.put)
+        else:
+            future = Future()
+            
+            def run():
+                try:
+                    future.set_result(solve_with_budget(cleaned_expr, self.budget, on_event=events.put))
+                except Exception as e:
+                    future.set_exception(e)
+            
+            threading.Thread(target=run, name='solver-stream', daemon=True).start()
+        
+        # Marca de fin: todos los pasos se encolan antes de completar el Future
+        future.add_done_callback(lambda done: events.put(None))
+        try:
+            while True:
+                event = events.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            # Si el cliente se fue antes de empezar, el trabajo no llega a correr
+            future.cancel()
+        yield 'done', future.result()
+    
+    def submit(self, expression_str, block=False):
+        """
+        Encola la resolución y devuelve un concurrent.futures.Future.
+        Con pool lanza PoolSaturated si la cola está llena (salvo con
+        `block`, que espera turno); sin pool resuelve en el hilo actual y
+        devuelve un Future ya completado.
+        """
+        if self.pool is None or not expression_str:
+            future = Future()
+            future.set_result(self.solve_expression(expression_str))
+            return future
+        
+        cleaned_expr = self._clean_expression(expression_str)
+        cache_key = self._cache_key(cleaned_expr)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+        
+        future = self.pool.submit(cleaned_expr, block=block)
+        
+        def store(done):
+            if not done.cancelled() and done.exception() is None:
+                self._store_result(cache_key, done.result())
+        
+        future.add_done_callback(store)
+        return future
+    
+    def iter_solve_many(self, expressions):
+        """
+        Resuelve una lista de expresiones y genera los resultados en el
+        mismo orden de entrada. Las entradas idénticas (tras la limpieza)
+        se resuelven una sola vez y con pool las únicas se reparten entre
+        los trabajadores. Cada resultado incluye su tiempo en milisegundos.
+        """
+        # Deduplicar por la forma canónica de cada expresión
+        first_index = {}
+        keys = []
+        for index, expression in enumerate(expressions):
+            key = self._cache_key(self._clean_expression(expression)) if expression else ''
+            keys.append(key)
+            first_index.setdefault(key, index)
+        
+        # Con pool se encolan todas las únicas antes de esperar la primera
+        pending = {}
+        if self.pool is not None:
+            for key, index in first_index.items():
+                pending[key] = self._timed_submit(expressions[index])
+        
+        solved = {}
+        for index, expression in enumerate(expressions):
+            key = keys[index]
+            duplicate = first_index[key] != index
+            if key not in solved:
+                if key in pending:
+                    future, started = pending.pop(key)
+                    result = future.result()
+                    # El callback que marca el fin puede correr justo después de despertar
+                    elapsed = getattr(future, 'finished_at', time.perf_counter()) - started
+                else:
+                    started = time.perf_counter()
+                    result = self.solve_expression(expression)
+                    elapsed = time.perf_counter() - started
+                solved[key] = (result, elapsed)
+            
+            result, elapsed = solved[key]
+            item = copy.deepcopy(result) if duplicate else dict(result)
+            item.update({
+                'index': index,
+                'expression': expression,
+                'elapsed_ms': 0.0 if duplicate else round(elapsed * 1000, 3),
+                'duplicate_of': first_index[key] if duplicate else None
+            })
+            yield item
+    
+    def solve_many(self, expressions):
+        """Resuelve varias expresiones en una sola llamada (ver iter_solve_many)"""
+        return list(self.iter_solve_many(expressions))
+    
+    def _timed_submit(self, expression_str):
+        """Encola una expresión registrando cuándo se envió y cuándo terminó"""
+        started = time.perf_counter()
+        future = self.submit(expression_str, block=True)
+        
+        def mark_finished(done):
+            done.finished_at = time.perf_counter()
+        
+        # Los callbacks de un Future ya completado se ejecutan de inmediato
+        future.add_done_callback(mark_finished)
+        return future, started
+    
+    async def solve_expression_async(self, expression_str):
+        """
+        Resuelve sin bloquear el bucle de eventos. Con pool la expresión va a
+        los trabajadores; sin pool, al ejecutor acotado compartido. En ambos
+        casos lanza PoolSaturated si la cola está llena.
+        """
+        if self.pool is None:
+            from .compute_executor import get_shared_executor
+            return await get_shared_executor().run(self.solve_expression, expression_str)
+        return await asyncio.wrap_future(self.submit(expression_str))
+    
+    def _cached_result(self, cache_key):
+        """Copia del resultado en caché para la clave o None"""
+        if not self.use_cache:
+            return None
+        cached = _result_cache.get(cache_key)
+        return copy.deepcopy(cached) if cached is not None else None
+    
+    def _store_result(self, cache_key, result):
+        """Registra un resultado recién calculado y lo guarda en la caché compartida"""
+        # El nivel se cuenta aquí para incluir lo resuelto en procesos trabajadores
+        _record_simplify_tier(result.get('simplify_tier'))
+        
+        # Los resultados parciales no se guardan: otro intento podría completarse
+        if self.use_cache and not result.get('budget_exceeded'):
+            _result_cache.set(cache_key, copy.deepcopy(result))
+    
+    def cache_stats(self):
+        """Contadores de la caché de resultados compartida"""
+        return get_cache_stats()
+    
+    def _cache_key(self, cleaned_expr):
+        """Normaliza los espacios de la expresión limpia para usarla como clave de caché"""
+        # Los espacios junto a operadores no cambian el significado; entre
+        # operandos se conservan como un único espacio
+        key = re.sub(r'\s*([^\w\s])\s*', r'\1', cleaned_expr)
+        return re.sub(r'\s+', ' ', key).strip()
+    
+    def _clean_expression(self, expr_str):
+        """Limpia y normaliza la expresión de entrada"""
+        try:
+            # Una sola pasada del tokenizador: símbolos comunes, potencias y
+            # multiplicación implícita (también junto a funciones y constantes)
+            return normalize_expression(expr_str)
+        except ExpressionSyntaxError:
+            # La entrada no es válida; el parser informará el error concreto
+            return expr_str.strip()
     
     def _solve_equation(self, equation_str):
         """Resuelve ecuaciones"""
+        return self._collect_events(self._iter_equation(equation_str))
+    
+    def _solve_expression(self, expr_str):
+        """Resuelve y simplifica expresiones"""
+        return self._collect_events(self._iter_expression(expr_str))
+    
+    def _collect_events(self, events):
+        """Consume los eventos de un generador de pasos y devuelve el resultado final"""
+        for kind, payload in events:
+            if kind == 'done':
+                return payload
+        return {'success': False, 'error': 'El solver terminó sin producir un resultado'}
+    
+    def _iter_solution(self, cleaned_expr, checkpoint=None):
+        """
+        Genera la solución como una secuencia de eventos (tipo, contenido):
+        'original' con el LaTeX de la entrada, un 'step' por cada paso
+        calculado y un 'done' final con el resultado completo.
+        `checkpoint` se invoca antes de cada operación simbólica costosa y
+        puede lanzar BudgetExceeded para cancelar de forma cooperativa.
+        """
+        if '=' in cleaned_expr:
+            return self._iter_equation(cleaned_expr, checkpoint)
+        return self._iter_expression(cleaned_expr, checkpoint)
+    
+    def _iter_equation(self, equation_str, checkpoint=None):
+        """Resuelve ecuaciones emitiendo cada paso en cuanto se calcula"""
+        checkpoint = checkpoint or _no_checkpoint
         try:
-            left, right = equation_str.split('=')
-            left_expr = parse_expr(left.strip())
-            right_expr = parse_expr(right.strip())
+            left_expr, right_expr = parse_equation(equation_str)
             
             # Crear ecuación
             equation = sp.Eq(left_expr, right_expr)
+            original_latex = latex(equation)
+            yield 'original', original_latex
             
             # Encontrar variables
             variables = list(equation.free_symbols)
             
             if not variables:
                 # No hay variables, verificar si es verdadera
+                checkpoint()
                 is_true = left_expr.equals(right_expr)
-                return {
+                step = {
+                    'description': 'Verificar igualdad',
+                    'expression': f'{latex(left_expr)} = {latex(right_expr)}',
+                    'explanation': f'La ecuación es {"verdadera" if is_true else "falsa"}'
+                }
+                yield 'step', step
+                yield 'done', {
                     'success': True,
-                    'original': latex(equation),
-                    'steps': [
-                        {
-                            'description': 'Verificar igualdad',
-                            'expression': f'{latex(left_expr)} = {latex(right_expr)}',
-                            'explanation': f'La ecuación es {"verdadera" if is_true else "falsa"}'
-                        }
-                    ],
+                    'original': original_latex,
+                    'steps': [step],
                     'result': 'Verdadero' if is_true else 'Falso'
                 }
+                return
             
             # Resolver para la primera variable encontrada
             var = variables[0]
-            solutions = solve(equation, var)
             
             steps = []
             
             # Paso 1: Mostrar ecuación original
             steps.append({
                 'description': 'Ecuación original',
-                'expression': latex(equation),
+                'expression': original_latex,
                 'explanation': f'Resolver para {var}'
             })
+            yield 'step', steps[-1]
             
             # Paso 2: Reorganizar términos si es necesario
             if left_expr != var and right_expr != 0:
@@ -106,6 +454,10 @@ class MathSolver:
                     'expression': latex(rearranged),
                     'explanation': 'Mover todos los términos a un lado'
                 })
+                yield 'step', steps[-1]
+            
+            checkpoint()
+            solutions = solve(equation, var)
             
             # Paso 3: Mostrar solución
             if solutions:
@@ -120,7 +472,7 @@ class MathSolver:
                 else:
                     steps.append({
                         'description': 'Soluciones múltiples',
-                        'expression': f'{var} \\in \\{' + ', '.join([latex(sol) for sol in solutions]) + '\\}',
+                        'expression': f'{var} \\in \\{{' + ', '.join([latex(sol) for sol in solutions]) + '\\}',
                         'explanation': 'La ecuación tiene múltiples soluciones'
                     })
                     result = f'{var} ∈ {{{", ".join([latex(sol) for sol in solutions])}}}'
@@ -131,30 +483,43 @@ class MathSolver:
                     'explanation': 'La ecuación no tiene solución en los números reales'
                 })
                 result = 'Sin solución'
+            yield 'step', steps[-1]
             
-            return {
+            yield 'done', {
                 'success': True,
-                'original': latex(equation),
+                'original': original_latex,
                 'steps': steps,
                 'result': result
             }
             
+        except (BudgetExceeded, MemoryError):
+            raise
         except Exception as e:
-            return {'success': False, 'error': f'Error resolviendo ecuación: {str(e)}'}
+            yield 'done', {'success': False, 'error': f'Error resolviendo ecuación: {str(e)}'}
     
-    def _solve_expression(self, expr_str):
-        """Resuelve y simplifica expresiones"""
+    def _iter_expression(self, expr_str, checkpoint=None):
+        """Resuelve y simplifica expresiones emitiendo cada paso en cuanto se calcula"""
+        checkpoint = checkpoint or _no_checkpoint
         try:
-            expr = parse_expr(expr_str)
+            expr = parse_expression(expr_str)
             steps = []
             result = expr
             
             # Mostrar expresión original
             original_latex = latex(expr)
+            yield 'original', original_latex
+            
+            # Expresiones sin variables: evaluación exacta sin el pipeline simbólico
+            if self.numeric_fast_path and not expr.free_symbols:
+                yield from self._iter_constant(expr, original_latex, checkpoint)
+                return
             
             # Determinar el tipo de operación y generar pasos apropiados
-            if expr.is_polynomial():
+            # (is_polynomial recorre todo el árbol: se calcula una sola vez)
+            is_polynomial = expr.is_polynomial()
+            if is_polynomial:
                 # Para polinomios, mostrar factorización si es posible
+                checkpoint()
                 factored = factor(expr)
                 if factored != expr:
                     steps.append({
@@ -162,9 +527,11 @@ class MathSolver:
                         'expression': latex(factored),
                         'explanation': 'Aplicamos factorización para simplificar'
                     })
+                    yield 'step', steps[-1]
                     result = factored
                 
                 # También mostrar expansión si está factorizada
+                checkpoint()
                 expanded = expand(expr)
                 if expanded != expr and not steps:
                     steps.append({
@@ -172,22 +539,30 @@ class MathSolver:
                         'expression': latex(expanded),
                         'explanation': 'Aplicamos la propiedad distributiva'
                     })
+                    yield 'step', steps[-1]
                     result = expanded
             
-            # Simplificar la expresión
-            simplified = simplify(expr)
+            # Simplificar la expresión (primero con las formas canónicas baratas)
+            simplified, simplify_tier = self._tiered_simplify(
+                expr, checkpoint,
+                factored=factored if is_polynomial else None,
+                expanded=expanded if is_polynomial else None,
+                is_polynomial=is_polynomial
+            )
             if simplified != expr and simplified != result:
                 steps.append({
                     'description': 'Simplificar la expresión',
                     'expression': latex(simplified),
                     'explanation': 'Aplicamos reglas de simplificación algebraica'
                 })
+                yield 'step', steps[-1]
                 result = simplified
             
             # Coleccionar términos semejantes
             if expr.has(sp.Symbol):
                 variables = list(expr.free_symbols)
                 if variables:
+                    checkpoint()
                     collected = collect(expr, variables[0])
                     if collected != expr and collected != result:
                         steps.append({
@@ -195,6 +570,7 @@ class MathSolver:
                             'expression': latex(collected),
                             'explanation': f'Agrupar términos con {variables[0]}'
                         })
+                        yield 'step', steps[-1]
                         result = collected
             
             # Si no hay pasos específicos, mostrar evaluación numérica si es posible
@@ -202,6 +578,7 @@ class MathSolver:
                 try:
                     if not expr.has(sp.Symbol):
                         # Solo números, evaluar
+                        checkpoint()
                         evaluated = expr.evalf()
                         steps.append({
                             'description': 'Evaluar numéricamente',
@@ -217,18 +594,118 @@ class MathSolver:
                             'explanation': 'La expresión ya está en su forma más simple'
                         })
                         result = simplified
+                    yield 'step', steps[-1]
+                except (BudgetExceeded, MemoryError):
+                    raise
                 except:
                     result = expr
             
-            return {
+            yield 'done', {
                 'success': True,
                 'original': original_latex,
                 'steps': steps,
-                'result': latex(result)
+                'result': latex(result),
+                'simplify_tier': simplify_tier
             }
             
+        except (BudgetExceeded, MemoryError):
+            raise
         except Exception as e:
-            return {'success': False, 'error': f'Error procesando expresión: {str(e)}'}
+            yield 'done', {'success': False, 'error': f'Error procesando expresión: {str(e)}'}
+    
+    def _iter_constant(self, expr, original_latex, checkpoint):
+        """
+        Evalúa una expresión sin variables. Los enteros y fracciones se
+        resuelven con aritmética exacta (SymPy ya la aplicó al construir
+        la expresión); evalf solo se usa para valores irracionales.
+        """
+        value = expr
+        if value.has(sp.Float):
+            # Entradas decimales: recuperar la fracción exacta si existe
+            checkpoint()
+            exact = nsimplify(value)
+            if exact.is_Rational:
+                value = exact
+        
+        if value.is_Rational:
+            if value.is_Integer:
+                expression = latex(value)
+            else:
+                expression = f'{latex(value)} \\approx {latex(sp.Float(value, 15))}'
+            step = {
+                'description': 'Calcular el valor exacto',
+                'expression': expression,
+                'explanation': 'Operamos con enteros y fracciones sin redondear'
+            }
+            result = value
+        else:
+            checkpoint()
+            evaluated = value.evalf()
+            if evaluated == value:
+                expression = latex(evaluated)
+            else:
+                expression = f'{latex(value)} \\approx {latex(evaluated)}'
+            step = {
+                'description': 'Evaluar numéricamente',
+                'expression': expression,
+                'explanation': 'Calculamos el valor numérico de la expresión'
+            }
+            result = evaluated
+        
+        yield 'step', step
+        yield 'done', {
+            'success': True,
+            'original': original_latex,
+            'steps': [step],
+            'result': latex(result),
+            'simplify_tier': 'constant'
+        }
+    
+    def _tiered_simplify(self, expr, checkpoint, factored=None, expanded=None, is_polynomial=None):
+        """
+        Simplifica escalando por niveles y devuelve (expresión, nivel).
+        Solo se llega a simplify() cuando ninguna forma canónica barata
+        aplica: constantes sin funciones, polinomios y funciones racionales
+        ya quedan resueltos con factor/expand/cancel. `is_polynomial` evita
+        repetir la comprobación si el llamador ya la hizo.
+        """
+        # Constantes sin funciones: SymPy ya evaluó la aritmética exacta
+        if expr.is_number and not expr.has(sp.Function):
+            if expr.has(sp.Float):
+                checkpoint()
+                return nsimplify(expr), 'numeric'
+            return expr, 'numeric'
+        
+        # Polinomios: la forma más corta entre la factorizada y la expandida
+        if is_polynomial is None:
+            is_polynomial = expr.is_polynomial()
+        if is_polynomial:
+            checkpoint()
+            if factored is None:
+                factored = factor(expr)
+            if expanded is None:
+                expanded = expand(expr)
+            return self._shortest(expr, factored, expanded), 'polynomial'
+        
+        # Funciones racionales: cancelar factores comunes y factorizar
+        if expr.is_rational_function():
+            checkpoint()
+            cancelled = cancel(together(expr))
+            return self._shortest(expr, factor(cancelled), cancelled), 'rational'
+        
+        # Último recurso: simplificación completa
+        checkpoint()
+        return simplify(expr), 'simplify'
+    
+    def _shortest(self, original, *candidates):
+        """
+        Elige el candidato con menos operaciones; como simplify(), vuelve a
+        la expresión original solo si el candidato es mucho más largo
+        """
+        best = min(candidates, key=count_ops)
+        if count_ops(best) > SIMPLIFY_RATIO * count_ops(original):
+            return original
+        return best
     
     def _generate_step_by_step_solution(self, expr, operation_type):
         """Genera solución paso a paso según el tipo de operación"""
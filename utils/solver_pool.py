@@ -0,0 +1,202 @@
+"""
+Pool de procesos para el solver
+Trabajadores pre-iniciados con SymPy ya importado y sus cachés calientes
+"""
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+from .solver_budget import SolverBudget, budget_worker_main, collect_events
+
+# Expresiones típicas que se resuelven al arrancar cada trabajador para
+# llenar las cachés internas de SymPy antes de atender peticiones reales
+WARMUP_EXPRESSIONS = [
+    '2*x + 3 = 7',
+    'x**2 - 5*x + 6',
+    '(2/3) + (1/4)',
+    'sqrt(16) + 3**2',
+    '2*x**2 - 8'
+]
+
+
+class PoolSaturated(Exception):
+    """Se lanza cuando la cola del pool está llena y no admite más trabajos"""
+
+
+def pool_worker_main(conn, cancel_event, memory_mb):
+    """Punto de entrada del trabajador: calienta SymPy y atiende expresiones"""
+    from .solver_engine import MathSolver
+
+    warm_solver = MathSolver(use_cache=False)
+    for expression in WARMUP_EXPRESSIONS:
+        warm_solver._collect_events(warm_solver._iter_solution(expression))
+
+    # Avisar al proceso principal que el trabajador está listo
+    conn.send(('ready', os.getpid()))
+    budget_worker_main(conn, cancel_event, memory_mb)
+
+
+class _WorkerSlot:
+    """Un proceso trabajador y el hilo que le despacha trabajos desde la cola"""
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.cancel_event = None
+        self._start_process()
+        self.thread = threading.Thread(
+            target=self._dispatch_loop,
+            name=f'solver-pool-{index}',
+            daemon=True
+        )
+        self.thread.start()
+
+    def _start_process(self):
+        context = self.pool.context
+        parent_conn, child_conn = context.Pipe()
+        self.cancel_event = context.Event()
+        self.process = context.Process(
+            target=pool_worker_main,
+            args=(child_conn, self.cancel_event, self.pool.budget.memory_mb),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self._ready = False
+
+    def _wait_ready(self):
+        """Espera el aviso de arranque del trabajador (una sola vez por proceso)"""
+        if not self._ready:
+            self.conn.recv()
+            self._ready = True
+
+    def _restart(self):
+        """Reemplaza un trabajador terminado por uno nuevo"""
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self._start_process()
+        self.pool._count('restarts')
+
+    def _dispatch_loop(self):
+        while True:
+            task = self.pool._tasks.get()
+            if task is None:
+                break
+
+            message, future, budget, on_event = task
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                self._wait_ready()
+                self.cancel_event.clear()
+                self.conn.send(message)
+                result, killed = collect_events(
+                    self.conn, self.process, self.cancel_event, budget, on_event
+                )
+            except Exception as e:
+                # Conexión rota, mensaje que no se pudo enviar o error en on_event:
+                # el estado del trabajador es desconocido, se reemplaza
+                self._restart()
+                future.set_exception(e)
+                continue
+
+            if killed:
+                self._restart()
+            if result.get('budget_exceeded'):
+                self.pool._count('budget_exceeded')
+            self.pool._count('completed')
+            future.set_result(result)
+
+        self.conn.close()
+        self.process.join(self.pool.budget.grace_seconds)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+class SolverPool:
+    """
+    Pool de procesos trabajadores para resolver expresiones fuera del hilo
+    que atiende la petición. La cola es acotada: cuando está llena,
+    `submit` lanza PoolSaturated para que el llamador aplique contrapresión.
+    """
+
+    def __init__(self, workers=None, max_pending=64, budget=None):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_pending = max_pending
+        self.budget = budget or SolverBudget()
+        self.context = multiprocessing.get_context()
+        self._tasks = queue.Queue(maxsize=max_pending)
+        self._stats_lock = threading.Lock()
+        self._stats = {'submitted': 0, 'rejected': 0, 'completed': 0, 'budget_exceeded': 0, 'restarts': 0}
+        self._closed = False
+        self._slots = [_WorkerSlot(self, i) for i in range(self.workers)]
+        atexit.register(self.shutdown)
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def submit(self, cleaned_expr, block=False, timeout=None, budget=None, on_event=None):
+        """
+        Encola una expresión ya limpia y devuelve un Future con el resultado.
+        Sin `block`, lanza PoolSaturated inmediatamente si la cola está llena.
+        `budget` reemplaza el presupuesto del pool solo para este trabajo.
+        `on_event` recibe cada paso (desde el hilo del trabajador) en cuanto llega.
+        """
+        if self._closed:
+            raise RuntimeError('El pool del solver está cerrado')
+
+        future = Future()
+        try:
+            self._tasks.put((cleaned_expr, future, budget or self.budget, on_event), block=block, timeout=timeout)
+        except queue.Full:
+            self._count('rejected')
+            raise PoolSaturated('Demasiadas expresiones pendientes, intenta de nuevo en unos segundos')
+        self._count('submitted')
+        return future
+
+    def submit_grading(self, user_answer, exercise, budget=None, block=True):
+        """
+        Encola la corrección de una respuesta contra un ejercicio generado.
+        El Future entrega el veredicto de check_exercise_answer, o un
+        resultado con 'budget_exceeded' si se agotó el presupuesto.
+        """
+        return self.submit(('grade', user_answer, exercise), block=block, budget=budget)
+
+    def solve(self, cleaned_expr, timeout=None):
+        """Resuelve una expresión esperando turno en la cola si es necesario"""
+        return self.submit(cleaned_expr, block=True, timeout=timeout).result()
+
+    async def solve_async(self, cleaned_expr):
+        """Versión asíncrona de `solve` para usar desde un bucle de eventos"""
+        return await asyncio.wrap_future(self.submit(cleaned_expr))
+
+    def stats(self):
+        """Contadores del pool y tamaño actual de la cola"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['workers'] = self.workers
+        stats['pending'] = self._tasks.qsize()
+        stats['max_pending'] = self.max_pending
+        return stats
+
+    def shutdown(self):
+        """Detiene los trabajadores después de terminar los trabajos en curso"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._slots:
+            self._tasks.put(None)
+        for slot in self._slots:
+            slot.thread.join()